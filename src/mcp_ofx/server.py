@@ -4,13 +4,13 @@ MCP Server for OpenFX SDK.
 Provides tools for looking up OFX API definitions and generating code.
 """
 
-import json
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
 from .tools.lookup import (
     lookup_definition,
+    batch_lookup,
     search_definitions,
     list_category,
     get_categories,
@@ -20,10 +20,19 @@ from .tools.lookup import (
     get_param_type_info,
     get_context_requirements,
     get_host_info,
+    get_name_collisions,
+    suggest_definitions,
 )
+from .tools.cache import LRUCache
+from .tools.formatting import OUTPUT_FORMATS, format_response
+from .tools.profiler import profile_plugin
+from .tools.project import generate_bundle_project, generate_plugin_project
 from .tools.codegen import (
     generate_plugin_skeleton,
     generate_parameter_code,
+    generate_bench_host,
+    get_codegen_cache_stats,
+    clear_codegen_cache,
 )
 from .data import (
     STATUS_CODES,
@@ -40,6 +49,105 @@ from .data import (
 
 app = Server("mcp-ofx")
 
+# Serialized responses for tools backed only by the static definitions. Bounded
+# because the key includes the caller's field projection.
+_RESPONSES = LRUCache(max_entries=4096, max_bytes=16 * 1024 * 1024)
+
+# Output options accepted by every JSON-returning tool
+_OUTPUT_PROPERTIES = {
+    "format": {
+        "type": "string",
+        "enum": list(OUTPUT_FORMATS),
+        "description": "Output format: 'pretty' (default, indented), 'compact' (no whitespace) or 'minimal' (compact, only name/value/description)"
+    },
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Optional: only include these fields of each record (e.g., ['value', 'description'])"
+    },
+}
+
+
+# Plugin definition accepted by the code generation tools
+_PLUGIN_PROPERTIES = {
+    "plugin_name": {
+        "type": "string",
+        "description": "Human-readable plugin name"
+    },
+    "plugin_id": {
+        "type": "string",
+        "description": "Unique plugin identifier (e.g., 'com.company.myplugin')"
+    },
+    "context": {
+        "type": "string",
+        "description": "Plugin context (default: kOfxImageEffectContextFilter)"
+    },
+    "params": {
+        "type": "array",
+        "description": "List of parameter definitions [{name, type, label, default, min, max, identity, spatial}]. identity is the value (or per-dimension values) at which the effect is a no-op, e.g. 0 for an amount or false for an enable switch. spatial (true/'size' or 'position') marks a Double/Double2D param as canonical coordinates, scaled to pixels at render time",
+        "items": {
+            "type": "object"
+        }
+    },
+    "supports_gpu": {
+        "type": "boolean",
+        "description": "Include GPU rendering support"
+    },
+    "footprint": {
+        "description": "Spatial footprint for generated RoD/RoI handlers: 'pointwise', {type: 'radius', param} or {type: 'transform', translate, scale} naming params",
+        "type": ["string", "object"]
+    },
+    "scratch_bytes_per_thread": {
+        "type": "integer",
+        "description": "Bytes of reusable scratch memory per render thread, allocated at BeginSequenceRender (default: 0, disabled)"
+    },
+    "abort_check_rows": {
+        "type": "integer",
+        "description": "Rows each render thread processes between host abort checks (default: 64, 0 disables)"
+    },
+    "frame_cache_mb": {
+        "type": "integer",
+        "description": "Memory budget in MB of an in-plugin LRU cache of rendered tiles, cleared on PurgeCaches and InstanceChanged (default: 0, disabled)"
+    },
+    "temporal_radius": {
+        "type": "integer",
+        "description": "Source frames read on each side of the render time, e.g. 2 for a 5-tap temporal filter (default: 0, spatial only)"
+    },
+    "proxy_scale_threshold": {
+        "type": "number",
+        "description": "Render scale below which cheaper proxy row processors are used, e.g. 0.5 (default: 0, always full quality)"
+    }
+}
+
+
+def _dump(result, arguments: dict, **kwargs) -> str:
+    """Serialize a result using the caller's output options."""
+    return format_response(result, arguments.get("format", "pretty"), arguments.get("fields"), **kwargs)
+
+
+def _cached(key: tuple, build, arguments: dict, **kwargs) -> str:
+    """Serialize a static result once per set of output options."""
+    fields = arguments.get("fields")
+    key = key + (arguments.get("format", "pretty"), tuple(fields) if fields else None)
+    return _RESPONSES.get(key, lambda: _dump(build(), arguments, **kwargs))
+
+
+def _plugin_arguments(arguments: dict) -> dict:
+    """Collect generate_plugin_skeleton arguments from a tool call."""
+    return {
+        "plugin_name": arguments["plugin_name"],
+        "plugin_id": arguments["plugin_id"],
+        "context": arguments.get("context", "kOfxImageEffectContextFilter"),
+        "params": arguments.get("params"),
+        "supports_gpu": arguments.get("supports_gpu", False),
+        "footprint": arguments.get("footprint"),
+        "scratch_bytes_per_thread": arguments.get("scratch_bytes_per_thread", 0),
+        "abort_check_rows": arguments.get("abort_check_rows", 64),
+        "frame_cache_mb": arguments.get("frame_cache_mb", 0),
+        "temporal_radius": arguments.get("temporal_radius", 0),
+        "proxy_scale_threshold": arguments.get("proxy_scale_threshold", 0.0),
+    }
+
 
 @app.list_tools()
 async def list_tools():
@@ -47,21 +155,43 @@ async def list_tools():
     return [
         Tool(
             name="ofx_lookup",
-            description="Look up an OFX definition by exact name (e.g., 'kOfxStatOK', 'kOfxActionDescribe', 'kOfxParamTypeDouble')",
+            description="Look up an OFX definition by name (e.g., 'kOfxStatOK', 'kOfxActionDescribe', 'kOfxParamTypeDouble'). Case-insensitive aliases without the 'k'/'kOfx' prefix and raw string values are also accepted.",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "name": {
                         "type": "string",
                         "description": "The OFX constant name to look up"
-                    }
+                    },
+                    **_OUTPUT_PROPERTIES
                 },
                 "required": ["name"]
             }
         ),
+        Tool(
+            name="ofx_batch_lookup",
+            description="Look up many OFX definitions in one call. Returns found definitions and, for misses, suggested names.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "names": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "OFX constant names to look up"
+                    },
+                    "categories": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional: only accept matches from these categories"
+                    },
+                    **_OUTPUT_PROPERTIES
+                },
+                "required": ["names"]
+            }
+        ),
         Tool(
             name="ofx_search",
-            description="Search OFX definitions by keyword. Returns all matching definitions.",
+            description="Search OFX definitions by keyword. Returns matching definitions ranked by relevance.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -72,7 +202,18 @@ async def list_tools():
                     "category": {
                         "type": "string",
                         "description": "Optional: limit search to category (status_codes, core_actions, image_effect_actions, contexts, param_types, bit_depths, image_components, suites, etc.)"
-                    }
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Maximum number of results to return (default: 20)"
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "minimum": 0,
+                        "description": "Number of top-ranked results to skip, for paging (default: 0)"
+                    },
+                    **_OUTPUT_PROPERTIES
                 },
                 "required": ["query"]
             }
@@ -86,7 +227,8 @@ async def list_tools():
                     "category": {
                         "type": "string",
                         "description": "Category name: status_codes, core_actions, image_effect_actions, contexts, param_types, bit_depths, image_components, field_types, premult_states, thread_safety, change_reasons, suites, standard_clips, standard_params, gpu_properties, type_identifiers, data_structures, exported_functions"
-                    }
+                    },
+                    **_OUTPUT_PROPERTIES
                 },
                 "required": ["category"]
             }
@@ -96,7 +238,7 @@ async def list_tools():
             description="Get all OFX actions (both core and image effect actions) with their details",
             inputSchema={
                 "type": "object",
-                "properties": {}
+                "properties": {**_OUTPUT_PROPERTIES}
             }
         ),
         Tool(
@@ -108,7 +250,8 @@ async def list_tools():
                     "context": {
                         "type": "string",
                         "description": "Plugin context (filter, generator, transition, general, retimer, paint)"
-                    }
+                    },
+                    **_OUTPUT_PROPERTIES
                 }
             }
         ),
@@ -121,7 +264,8 @@ async def list_tools():
                     "suite_name": {
                         "type": "string",
                         "description": "Suite name (e.g., 'kOfxPropertySuite', 'kOfxImageEffectSuite', 'kOfxParameterSuite')"
-                    }
+                    },
+                    **_OUTPUT_PROPERTIES
                 },
                 "required": ["suite_name"]
             }
@@ -135,7 +279,8 @@ async def list_tools():
                     "context": {
                         "type": "string",
                         "description": "Context name (e.g., 'kOfxImageEffectContextFilter')"
-                    }
+                    },
+                    **_OUTPUT_PROPERTIES
                 },
                 "required": ["context"]
             }
@@ -149,7 +294,8 @@ async def list_tools():
                     "param_type": {
                         "type": "string",
                         "description": "Parameter type (e.g., 'kOfxParamTypeDouble', 'kOfxParamTypeChoice')"
-                    }
+                    },
+                    **_OUTPUT_PROPERTIES
                 },
                 "required": ["param_type"]
             }
@@ -163,7 +309,8 @@ async def list_tools():
                     "host": {
                         "type": "string",
                         "description": "Host name (e.g., 'DaVinci Resolve', 'Nuke', 'Fusion')"
-                    }
+                    },
+                    **_OUTPUT_PROPERTIES
                 },
                 "required": ["host"]
             }
@@ -174,31 +321,163 @@ async def list_tools():
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "plugin_name": {
+                    **_PLUGIN_PROPERTIES
+                },
+                "required": ["plugin_name", "plugin_id"]
+            }
+        ),
+        Tool(
+            name="ofx_generate_project",
+            description="Write a complete plugin project to disk: source, benchmark host, OpenFX include directory and a Makefile with release/LTO/native/PGO profiles building a Linux .ofx.bundle",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "output_dir": {
                         "type": "string",
-                        "description": "Human-readable plugin name"
+                        "description": "Project directory (created if missing)"
+                    },
+                    **_PLUGIN_PROPERTIES,
+                    "bench_width": {
+                        "type": "integer",
+                        "description": "Default frame width of the benchmark host (default: 1920)"
                     },
-                    "plugin_id": {
+                    "bench_height": {
+                        "type": "integer",
+                        "description": "Default frame height of the benchmark host (default: 1080)"
+                    },
+                    "bench_frames": {
+                        "type": "integer",
+                        "description": "Default number of frames rendered by the benchmark host and PGO training (default: 100)"
+                    }
+                },
+                "required": ["output_dir", "plugin_name", "plugin_id"]
+            }
+        ),
+        Tool(
+            name="ofx_generate_bundle",
+            description="Write a project building several plugins into one .ofx binary: one source file per plugin, a shared suite-fetch module and an OfxGetPlugin(nth) table, plus the benchmark host and Makefile of ofx_generate_project",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "output_dir": {
                         "type": "string",
-                        "description": "Unique plugin identifier (e.g., 'com.company.myplugin')"
+                        "description": "Project directory (created if missing)"
                     },
-                    "context": {
+                    "bundle_name": {
                         "type": "string",
-                        "description": "Plugin context (default: kOfxImageEffectContextFilter)"
+                        "description": "Name of the bundle and its binary (e.g., 'MyEffects')"
                     },
-                    "params": {
+                    "plugins": {
                         "type": "array",
-                        "description": "List of parameter definitions [{name, type, label, default, min, max}]",
+                        "description": "Plugins of the bundle, in OfxGetPlugin order",
                         "items": {
-                            "type": "object"
+                            "type": "object",
+                            "properties": _PLUGIN_PROPERTIES,
+                            "required": ["plugin_name", "plugin_id"]
                         }
                     },
-                    "supports_gpu": {
-                        "type": "boolean",
-                        "description": "Include GPU rendering support"
+                    "bench_context": {
+                        "type": "string",
+                        "description": "Context the benchmark host instantiates plugins in (default: the first plugin's context)"
+                    },
+                    "bench_width": {
+                        "type": "integer",
+                        "description": "Default frame width of the benchmark host (default: 1920)"
+                    },
+                    "bench_height": {
+                        "type": "integer",
+                        "description": "Default frame height of the benchmark host (default: 1080)"
+                    },
+                    "bench_frames": {
+                        "type": "integer",
+                        "description": "Default number of frames rendered by the benchmark host and PGO training (default: 100)"
                     }
                 },
-                "required": ["plugin_name", "plugin_id"]
+                "required": ["output_dir", "bundle_name", "plugins"]
+            }
+        ),
+        Tool(
+            name="ofx_generate_bench_host",
+            description="Generate a minimal C OFX host for Linux that loads a plugin binary, runs its action sequence and times Render over synthetic frames",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "context": {
+                        "type": "string",
+                        "description": "Context the plugin is instantiated in (default: kOfxImageEffectContextFilter)"
+                    },
+                    "width": {
+                        "type": "integer",
+                        "description": "Default frame width in pixels (default: 1920)"
+                    },
+                    "height": {
+                        "type": "integer",
+                        "description": "Default frame height in pixels (default: 1080)"
+                    },
+                    "bit_depth": {
+                        "type": "string",
+                        "description": "Default pixel depth constant (default: kOfxBitDepthFloat)"
+                    },
+                    "components": {
+                        "type": "string",
+                        "description": "Default pixel components constant (default: kOfxImageComponentRGBA)"
+                    },
+                    "frames": {
+                        "type": "integer",
+                        "description": "Default number of frames rendered (default: 100)"
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="ofx_profile_plugin",
+            description="Load a compiled plugin binary in a Python mock host, run its action sequence and report per-action wall time, suite-call counts and bytes touched",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "plugin_path": {
+                        "type": "string",
+                        "description": "Path to the compiled plugin binary (.ofx/.so)"
+                    },
+                    "context": {
+                        "type": "string",
+                        "description": "Context the plugin is instantiated in (default: kOfxImageEffectContextFilter)"
+                    },
+                    "plugin_index": {
+                        "type": "integer",
+                        "description": "Index of the plugin in the binary (default: 0)"
+                    },
+                    "width": {
+                        "type": "integer",
+                        "description": "Frame width in pixels (default: 640)"
+                    },
+                    "height": {
+                        "type": "integer",
+                        "description": "Frame height in pixels (default: 360)"
+                    },
+                    "bit_depth": {
+                        "type": "string",
+                        "description": "Pixel depth constant (default: kOfxBitDepthFloat)"
+                    },
+                    "components": {
+                        "type": "string",
+                        "description": "Pixel components constant (default: kOfxImageComponentRGBA)"
+                    },
+                    "frames": {
+                        "type": "integer",
+                        "description": "Number of frames rendered (default: 10)"
+                    },
+                    "threads": {
+                        "type": "integer",
+                        "description": "CPU count reported to the plugin (default: 1)"
+                    },
+                    "param_values": {
+                        "type": "object",
+                        "description": "Parameter values overriding the defaults, keyed by name (lists for multi-dimensional params)"
+                    },
+                    **_OUTPUT_PROPERTIES
+                },
+                "required": ["plugin_path"]
             }
         ),
         Tool(
@@ -241,126 +520,252 @@ async def list_tools():
             description="Get a summary of the OFX SDK structure and main components",
             inputSchema={
                 "type": "object",
-                "properties": {}
+                "properties": {**_OUTPUT_PROPERTIES}
+            }
+        ),
+        Tool(
+            name="ofx_cache_stats",
+            description="Get hit/miss counters for the server's response and code generation caches",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "clear": {
+                        "type": "boolean",
+                        "description": "Clear the code generation cache after reporting its stats"
+                    },
+                    **_OUTPUT_PROPERTIES
+                }
             }
         ),
     ]
 
 
+def _build_summary() -> dict:
+    """Build the ofx_summary response."""
+    return {
+        "name": "OpenFX (OFX) SDK",
+        "version": "1.5",
+        "source": "https://github.com/AcademySoftwareFoundation/openfx",
+        "documentation": "https://openfx.readthedocs.io/",
+        "overview": {
+            "total_status_codes": len(STATUS_CODES),
+            "total_core_actions": len(CORE_ACTIONS),
+            "total_image_effect_actions": len(IMAGE_EFFECT_ACTIONS),
+            "total_contexts": len(CONTEXTS),
+            "total_param_types": len(PARAM_TYPES),
+            "total_bit_depths": len(BIT_DEPTHS),
+            "total_image_components": len(IMAGE_COMPONENTS),
+            "total_suites": len(SUITES),
+        },
+        "contexts": list(CONTEXTS.keys()),
+        "param_types": list(PARAM_TYPES.keys()),
+        "suites": list(SUITES.keys()),
+        "supported_hosts": list(HOST_COMPATIBILITY.keys()),
+        "name_collisions": get_name_collisions(),
+        "key_concepts": [
+            "Property System - All configuration via typed key-value pairs",
+            "Suite Mechanism - Hosts provide function pointers via suites",
+            "Action System - Hosts communicate with plugins via action strings",
+            "Contexts - Plugins declare supported contexts (filter, generator, etc.)",
+            "Clips - Named inputs/outputs for image data",
+            "Parameters - User-controllable values with animation support",
+        ]
+    }
+
+
 @app.call_tool()
 async def call_tool(name: str, arguments: dict):
     """Handle tool calls."""
 
+    output_format = arguments.get("format", "pretty")
+    if output_format not in OUTPUT_FORMATS:
+        return [TextContent(type="text", text=f"Unknown format '{output_format}'. Available: {list(OUTPUT_FORMATS)}")]
+    fields = arguments.get("fields")
+    if fields is not None and (not isinstance(fields, list) or not all(isinstance(field, str) for field in fields)):
+        return [TextContent(type="text", text="'fields' must be a list of field names")]
+
     if name == "ofx_lookup":
         result = lookup_definition(arguments["name"])
         if result:
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            text = _cached((name, result["category"], result["name"]), lambda: dict(result), arguments)
+            return [TextContent(type="text", text=text)]
+        suggestions = suggest_definitions(arguments["name"])
+        if suggestions:
+            return [TextContent(type="text", text=f"Definition '{arguments['name']}' not found. Did you mean: {', '.join(suggestions)}?")]
         return [TextContent(type="text", text=f"Definition '{arguments['name']}' not found")]
 
+    elif name == "ofx_batch_lookup":
+        for key in ("names", "categories"):
+            values = arguments.get(key)
+            if values is not None and (not isinstance(values, list) or not all(isinstance(value, str) for value in values)):
+                return [TextContent(type="text", text=f"'{key}' must be a list of strings")]
+        result = batch_lookup(arguments["names"], arguments.get("categories"))
+        result["found"] = {key: dict(record) for key, record in result["found"].items()}
+        return [TextContent(type="text", text=_dump(result, arguments, records_key="found"))]
+
     elif name == "ofx_search":
-        results = search_definitions(
-            arguments["query"],
-            arguments.get("category")
-        )
+        paging = {"limit": arguments.get("limit", 20), "offset": arguments.get("offset", 0)}
+        for key, value in paging.items():
+            if not isinstance(value, int) or isinstance(value, bool):
+                return [TextContent(type="text", text=f"'{key}' must be an integer")]
+        try:
+            results = search_definitions(
+                arguments["query"],
+                arguments.get("category"),
+                **paging,
+            )
+        except ValueError as e:
+            return [TextContent(type="text", text=str(e))]
         if results:
-            return [TextContent(type="text", text=json.dumps(results, indent=2))]
+            return [TextContent(type="text", text=_dump([dict(r) for r in results], arguments))]
         return [TextContent(type="text", text=f"No results found for '{arguments['query']}'")]
 
     elif name == "ofx_list_category":
-        items = list_category(arguments["category"])
+        category = arguments["category"]
+        items = list_category(category)
         if items:
-            return [TextContent(type="text", text=json.dumps(items, indent=2))]
+            text = _cached((name, category), lambda: items, arguments)
+            return [TextContent(type="text", text=text)]
         categories = get_categories()
         return [TextContent(type="text", text=f"Category not found. Available: {categories}")]
 
     elif name == "ofx_get_actions":
-        actions = get_actions()
-        return [TextContent(type="text", text=json.dumps(actions, indent=2))]
+        text = _cached((name,), get_actions, arguments)
+        return [TextContent(type="text", text=text)]
 
     elif name == "ofx_action_sequence":
         context = arguments.get("context", "filter")
         sequence = get_action_sequence(context)
-        return [TextContent(type="text", text=json.dumps(sequence, indent=2))]
+        return [TextContent(type="text", text=_dump(sequence, arguments))]
 
     elif name == "ofx_get_suite":
         suite_name = arguments["suite_name"]
         if suite_name in SUITES:
-            return [TextContent(type="text", text=json.dumps(SUITES[suite_name], indent=2))]
+            text = _cached((name, suite_name), lambda: SUITES[suite_name], arguments)
+            return [TextContent(type="text", text=text)]
         return [TextContent(type="text", text=f"Suite '{suite_name}' not found. Available: {list(SUITES.keys())}")]
 
     elif name == "ofx_get_context":
         context = arguments["context"]
         info = get_context_requirements(context)
         if info:
-            return [TextContent(type="text", text=json.dumps(info, indent=2))]
+            text = _cached((name, context), lambda: info, arguments)
+            return [TextContent(type="text", text=text)]
         return [TextContent(type="text", text=f"Context not found. Available: {list(CONTEXTS.keys())}")]
 
     elif name == "ofx_get_param_type":
         param_type = arguments["param_type"]
         info = get_param_type_info(param_type)
         if info:
-            return [TextContent(type="text", text=json.dumps(info, indent=2))]
+            text = _cached((name, param_type), lambda: info, arguments)
+            return [TextContent(type="text", text=text)]
         return [TextContent(type="text", text=f"Param type not found. Available: {list(PARAM_TYPES.keys())}")]
 
     elif name == "ofx_host_compatibility":
         host = arguments["host"]
         info = get_host_info(host)
         if info:
-            return [TextContent(type="text", text=json.dumps(info, indent=2))]
+            text = _cached((name, host), lambda: info, arguments)
+            return [TextContent(type="text", text=text)]
         return [TextContent(type="text", text=f"Host not found. Available: {list(HOST_COMPATIBILITY.keys())}")]
 
     elif name == "ofx_generate_plugin":
-        code = generate_plugin_skeleton(
-            plugin_name=arguments["plugin_name"],
-            plugin_id=arguments["plugin_id"],
-            context=arguments.get("context", "kOfxImageEffectContextFilter"),
-            params=arguments.get("params"),
-            supports_gpu=arguments.get("supports_gpu", False),
-        )
+        try:
+            code = generate_plugin_skeleton(**_plugin_arguments(arguments))
+        except ValueError as e:
+            return [TextContent(type="text", text=str(e))]
         return [TextContent(type="text", text=code)]
 
+    elif name == "ofx_generate_project":
+        try:
+            result = generate_plugin_project(
+                arguments["output_dir"],
+                bench_width=arguments.get("bench_width", 1920),
+                bench_height=arguments.get("bench_height", 1080),
+                bench_frames=arguments.get("bench_frames", 100),
+                **_plugin_arguments(arguments),
+            )
+        except (ValueError, OSError) as e:
+            return [TextContent(type="text", text=str(e))]
+        return [TextContent(type="text", text=_dump(result, arguments, minimal_fields=()))]
+
+    elif name == "ofx_generate_bundle":
+        try:
+            plugins = [_plugin_arguments(plugin) for plugin in arguments["plugins"]]
+        except KeyError:
+            return [TextContent(type="text", text="Every bundle plugin needs a plugin_name and a plugin_id")]
+        try:
+            result = generate_bundle_project(
+                arguments["output_dir"],
+                arguments["bundle_name"],
+                plugins,
+                bench_context=arguments.get("bench_context"),
+                bench_width=arguments.get("bench_width", 1920),
+                bench_height=arguments.get("bench_height", 1080),
+                bench_frames=arguments.get("bench_frames", 100),
+            )
+        except (ValueError, OSError) as e:
+            return [TextContent(type="text", text=str(e))]
+        return [TextContent(type="text", text=_dump(result, arguments, minimal_fields=()))]
+
+    elif name == "ofx_generate_bench_host":
+        try:
+            code = generate_bench_host(
+                context=arguments.get("context", "kOfxImageEffectContextFilter"),
+                width=arguments.get("width", 1920),
+                height=arguments.get("height", 1080),
+                bit_depth=arguments.get("bit_depth", "kOfxBitDepthFloat"),
+                components=arguments.get("components", "kOfxImageComponentRGBA"),
+                frames=arguments.get("frames", 100),
+            )
+        except ValueError as e:
+            return [TextContent(type="text", text=str(e))]
+        return [TextContent(type="text", text=code)]
+
+    elif name == "ofx_profile_plugin":
+        try:
+            report = profile_plugin(
+                plugin_path=arguments["plugin_path"],
+                context=arguments.get("context", "kOfxImageEffectContextFilter"),
+                plugin_index=arguments.get("plugin_index", 0),
+                width=arguments.get("width", 640),
+                height=arguments.get("height", 360),
+                bit_depth=arguments.get("bit_depth", "kOfxBitDepthFloat"),
+                components=arguments.get("components", "kOfxImageComponentRGBA"),
+                frames=arguments.get("frames", 10),
+                threads=arguments.get("threads", 1),
+                param_values=arguments.get("param_values"),
+            )
+        except ValueError as e:
+            return [TextContent(type="text", text=str(e))]
+        text = _dump(report, arguments, records_key="actions",
+                     minimal_fields=("action", "status", "wall_ms", "suite_call_total"))
+        return [TextContent(type="text", text=text)]
+
     elif name == "ofx_generate_param":
-        code = generate_parameter_code(
-            param_name=arguments["param_name"],
-            param_type=arguments["param_type"],
-            label=arguments.get("label"),
-            default=arguments.get("default"),
-            min_val=arguments.get("min"),
-            max_val=arguments.get("max"),
-            hint=arguments.get("hint"),
-        )
+        try:
+            code = generate_parameter_code(
+                param_name=arguments["param_name"],
+                param_type=arguments["param_type"],
+                label=arguments.get("label"),
+                default=arguments.get("default"),
+                min_val=arguments.get("min"),
+                max_val=arguments.get("max"),
+                hint=arguments.get("hint"),
+            )
+        except ValueError as e:
+            return [TextContent(type="text", text=str(e))]
         return [TextContent(type="text", text=code)]
 
     elif name == "ofx_summary":
-        summary = {
-            "name": "OpenFX (OFX) SDK",
-            "version": "1.5",
-            "source": "https://github.com/AcademySoftwareFoundation/openfx",
-            "documentation": "https://openfx.readthedocs.io/",
-            "overview": {
-                "total_status_codes": len(STATUS_CODES),
-                "total_core_actions": len(CORE_ACTIONS),
-                "total_image_effect_actions": len(IMAGE_EFFECT_ACTIONS),
-                "total_contexts": len(CONTEXTS),
-                "total_param_types": len(PARAM_TYPES),
-                "total_bit_depths": len(BIT_DEPTHS),
-                "total_image_components": len(IMAGE_COMPONENTS),
-                "total_suites": len(SUITES),
-            },
-            "contexts": list(CONTEXTS.keys()),
-            "param_types": list(PARAM_TYPES.keys()),
-            "suites": list(SUITES.keys()),
-            "supported_hosts": list(HOST_COMPATIBILITY.keys()),
-            "key_concepts": [
-                "Property System - All configuration via typed key-value pairs",
-                "Suite Mechanism - Hosts provide function pointers via suites",
-                "Action System - Hosts communicate with plugins via action strings",
-                "Contexts - Plugins declare supported contexts (filter, generator, etc.)",
-                "Clips - Named inputs/outputs for image data",
-                "Parameters - User-controllable values with animation support",
-            ]
-        }
-        return [TextContent(type="text", text=json.dumps(summary, indent=2))]
+        text = _cached((name,), _build_summary, arguments, minimal_fields=())
+        return [TextContent(type="text", text=text)]
+
+    elif name == "ofx_cache_stats":
+        stats = {"responses": _RESPONSES.stats(), "codegen": get_codegen_cache_stats()}
+        if arguments.get("clear"):
+            clear_codegen_cache()
+        return [TextContent(type="text", text=_dump(stats, arguments, minimal_fields=()))]
 
     return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
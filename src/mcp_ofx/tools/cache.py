@@ -0,0 +1,83 @@
+"""
+Caches for serialized tool responses and generated code.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache of rendered strings.
+
+    Entries are evicted oldest-first once either the entry count or the total
+    size of the cached text exceeds its limit.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 16 * 1024 * 1024):
+        self._entries: OrderedDict[Hashable, str] = OrderedDict()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, render: Callable[[], str]) -> str:
+        """
+        Return the cached text for key, rendering and storing it on a miss.
+
+        Args:
+            key: Hashable cache key
+            render: Callable producing the text
+
+        Returns:
+            The cached or freshly rendered text.
+        """
+        text = self._entries.get(key)
+        if text is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return text
+        self.misses += 1
+        text = render()
+        if len(text) <= self.max_bytes:
+            self._entries[key] = text
+            self.size += len(text)
+            self._evict()
+        return text
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until within limits."""
+        while self._entries and (len(self._entries) > self.max_entries or self.size > self.max_bytes):
+            _, text = self._entries.popitem(last=False)
+            self.size -= len(text)
+            self.evictions += 1
+
+    def resize(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """Change the limits, evicting entries if needed."""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Get hit/miss/eviction counters and current usage against the limits."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
@@ -2,8 +2,74 @@
 OFX code generation tools for creating plugin skeletons and common patterns.
 """
 
-from typing import Optional
-from ..data import CONTEXTS, PARAM_TYPES, BIT_DEPTHS, IMAGE_COMPONENTS
+import json
+import re
+from typing import Any, Optional
+from ..data import (
+    CONTEXTS,
+    PARAM_TYPES,
+    BIT_DEPTHS,
+    IMAGE_COMPONENTS,
+    CORE_ACTIONS,
+    IMAGE_EFFECT_ACTIONS,
+    SUITES,
+)
+from .cache import LRUCache
+from .lookup import get_action_sequence
+from .templates import get_template, get_template_revision
+
+_C_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# Generated code keyed by canonicalized arguments
+_CODEGEN_CACHE = LRUCache(max_entries=128, max_bytes=16 * 1024 * 1024)
+
+
+# Parameter types whose values can be canonical coordinates
+_SPATIAL_PARAM_TYPES = ("kOfxParamTypeDouble", "kOfxParamTypeDouble2D")
+
+
+def _canonical_param(param: dict) -> dict:
+    """Normalize a parameter definition so equivalent specs compare equal."""
+    canonical = {key: value for key, value in param.items() if value is not None}
+    canonical.setdefault("name", "param")
+    canonical.setdefault("type", "kOfxParamTypeDouble")
+    spatial = canonical.pop("spatial", False)
+    if spatial:
+        if canonical["type"] not in _SPATIAL_PARAM_TYPES:
+            raise ValueError(
+                f"Parameter '{canonical['name']}' is {canonical['type']}; only "
+                f"{' and '.join(_SPATIAL_PARAM_TYPES)} parameters can be spatial"
+            )
+        if spatial not in (True, "size", "position"):
+            raise ValueError(f"Parameter '{canonical['name']}' has spatial={spatial!r}; use true, 'size' or 'position'")
+        canonical["spatial"] = "position" if spatial == "position" else "size"
+    return canonical
+
+
+def _cache_key(kind: str, **arguments: Any) -> str:
+    """Build a cache key that ignores dict ordering."""
+    return kind + json.dumps(arguments, sort_keys=True, default=repr)
+
+
+def get_codegen_cache_stats() -> dict[str, int]:
+    """Get hit/miss/eviction counters and usage of the code generation cache."""
+    return _CODEGEN_CACHE.stats()
+
+
+def clear_codegen_cache() -> None:
+    """Drop all cached generated code."""
+    _CODEGEN_CACHE.clear()
+
+
+def configure_codegen_cache(max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+    """
+    Change the limits of the code generation cache.
+
+    Args:
+        max_entries: Maximum number of cached outputs
+        max_bytes: Maximum total size of cached outputs
+    """
+    _CODEGEN_CACHE.resize(max_entries, max_bytes)
 
 
 def generate_plugin_skeleton(
@@ -12,321 +78,209 @@ def generate_plugin_skeleton(
     context: str = "kOfxImageEffectContextFilter",
     params: Optional[list[dict]] = None,
     supports_gpu: bool = False,
+    footprint: Optional[Any] = None,
+    scratch_bytes_per_thread: int = 0,
+    abort_check_rows: int = 64,
+    frame_cache_mb: int = 0,
+    temporal_radius: int = 0,
+    proxy_scale_threshold: float = 0.0,
+    bundle_symbol: Optional[str] = None,
 ) -> str:
     """
     Generate a basic OFX plugin skeleton.
 
+    The generated render() splits the render window into row bands and runs
+    them through the host MultiThread suite, clipping against the source and
+    output image bounds. Pixel loops are specialized per bit depth and
+    component count and selected once per render. Parameter values are
+    snapshotted per instance and time, and invalidated on InstanceChanged and
+    BeginSequenceRender. Render threads get a slice of a scratch arena that
+    lives from BeginSequenceRender until PurgeCaches, and poll the host's
+    abort flag every abort_check_rows rows. With frame_cache_mb set, rendered
+    tiles are cached per instance until PurgeCaches or InstanceChanged.
+    Temporal plugins reuse source frames across sequential renders. Spatial
+    parameters are converted to pixels at the render scale, and renders below
+    proxy_scale_threshold use cheaper PROXY row processors. Only
+    premultiplied sources are unpremultiplied, and field renders of
+    interlaced frames process only the requested field's rows.
+    pluginMain dispatches every core and image effect action, checking the
+    most frequent ones first.
+
+    Results are memoized; parameter key order, unknown or missing contexts
+    and None-valued fields do not produce distinct cache entries.
+
     Args:
         plugin_name: Human-readable plugin name
         plugin_id: Unique plugin identifier (e.g., 'com.company.myplugin')
         context: Plugin context
-        params: List of parameter definitions
+        params: List of parameter definitions. A parameter's "identity"
+            value (scalar or per-dimension list) marks the value at which the
+            effect is a no-op; isIdentity passes the source through then.
+            "spatial" (true or "size", or "position") marks a Double or
+            Double2D parameter as a canonical-coordinate distance or position.
         supports_gpu: Whether to include GPU rendering support
+        footprint: Optional spatial footprint used to generate RoD/RoI
+            handlers: "pointwise", {"type": "radius", "param": name} or
+            {"type": "transform", "translate": name, "scale": name}; the
+            radius and translate parameters are made spatial
+        scratch_bytes_per_thread: Size of each render thread's slice of the
+            scratch arena allocated at BeginSequenceRender (0 disables it)
+        abort_check_rows: Rows each render thread processes between host
+            abort checks (0 disables abort polling)
+        frame_cache_mb: Memory budget in MB of the in-plugin LRU cache of
+            rendered tiles (0 disables the cache)
+        temporal_radius: Source frames read on each side of the render time;
+            above 0 the plugin requests temporal clip access, answers
+            GetFramesNeeded and keeps fetched frames in a ring buffer
+        proxy_scale_threshold: Render scale below which the cheaper PROXY
+            row processors are used (0 always renders at full quality)
+        bundle_symbol: C name of the plugin's OfxPlugin struct when it is one
+            translation unit of a multi-plugin bundle; the suites then come
+            from the bundle's shared host module and OfxGetPlugin is left to
+            the bundle table (None generates a standalone plugin)
 
     Returns:
         C++ plugin code skeleton.
+
+    Raises:
+        ValueError: If a spatial parameter is not a Double or Double2D, the
+            footprint is invalid for the params or context,
+            bundle_symbol is not a C identifier, or an override template
+            uses a slot the generator does not provide.
+    """
+    context = _context_string(context)
+    params = [_canonical_param(param) for param in params or []]
+    supports_gpu = bool(supports_gpu)
+    footprint = _canonical_footprint(footprint, context, params)
+    params = _mark_footprint_params_spatial(params, footprint)
+    scratch_bytes_per_thread = max(0, int(scratch_bytes_per_thread or 0))
+    abort_check_rows = max(0, int(abort_check_rows or 0))
+    frame_cache_mb = max(0, int(frame_cache_mb or 0))
+    temporal_radius = max(0, int(temporal_radius or 0))
+    proxy_scale_threshold = max(0.0, float(proxy_scale_threshold or 0.0))
+    bundle_symbol = bundle_symbol or None
+    if bundle_symbol is not None and not _C_IDENTIFIER_RE.fullmatch(bundle_symbol):
+        raise ValueError(f"Bundle symbol '{bundle_symbol}' is not a C identifier")
+
+    key = _cache_key(
+        "plugin",
+        templates=get_template_revision(("plugin_skeleton", "footprint")),
+        plugin_name=plugin_name,
+        plugin_id=plugin_id,
+        context=context,
+        params=params,
+        supports_gpu=supports_gpu,
+        footprint=footprint,
+        scratch_bytes_per_thread=scratch_bytes_per_thread,
+        abort_check_rows=abort_check_rows,
+        frame_cache_mb=frame_cache_mb,
+        temporal_radius=temporal_radius,
+        proxy_scale_threshold=proxy_scale_threshold,
+        bundle_symbol=bundle_symbol,
+    )
+    return _CODEGEN_CACHE.get(
+        key,
+        lambda: _render_plugin_skeleton(
+            plugin_name, plugin_id, context, params, supports_gpu, footprint,
+            scratch_bytes_per_thread, abort_check_rows, frame_cache_mb, temporal_radius,
+            proxy_scale_threshold, bundle_symbol,
+        ),
+    )
+
+
+def _render_plugin_skeleton(
+    plugin_name: str,
+    plugin_id: str,
+    context: str,
+    params: list[dict],
+    supports_gpu: bool,
+    footprint: Optional[dict],
+    scratch_bytes_per_thread: int,
+    abort_check_rows: int,
+    frame_cache_mb: int,
+    temporal_radius: int,
+    proxy_scale_threshold: float,
+    bundle_symbol: Optional[str],
+) -> str:
+    """Render the plugin skeleton for canonicalized arguments."""
+    return get_template("plugin_skeleton").render({
+        "plugin_name": plugin_name,
+        "plugin_id": plugin_id,
+        "bundle_define": _generate_bundle_define(bundle_symbol),
+        "context": context,
+        "scratch_bytes_per_thread": str(scratch_bytes_per_thread),
+        "abort_check_rows": str(abort_check_rows),
+        "frame_cache_mb": str(frame_cache_mb),
+        "temporal_radius": str(temporal_radius),
+        "proxy_scale_threshold": repr(proxy_scale_threshold),
+        "frames_needed": _generate_frames_needed(context, temporal_radius),
+        **_generate_source_clips(context),
+        "param_handles": _generate_param_handles(params),
+        "gpu_describe": _generate_gpu_describe(supports_gpu),
+        "param_defines": _generate_param_defines(params),
+        "param_fetch": _generate_param_fetch(params),
+        "param_value_fields": _generate_param_value_fields(params),
+        "param_get_values": _generate_param_get_values(params),
+        "identity_checks": _generate_identity_checks(context, params),
+        "footprint_handlers": _generate_footprint_handlers(context, params, footprint),
+        "source_window": _generate_source_window(footprint),
+        "param_to_pixels": _generate_param_to_pixels(params),
+        "row_processors": _generate_row_processors(proxy_scale_threshold > 0),
+        **_generate_action_dispatch(context, _action_handlers(footprint is not None, temporal_radius > 0)),
+    })
+
+
+def _source_clip_names(context: str) -> list[str]:
+    """Return the input clip name constants of a context, primary source first."""
+    if context == "kOfxImageEffectContextTransition":
+        return ["kOfxImageEffectTransitionSourceFromClipName", "kOfxImageEffectTransitionSourceToClipName"]
+    return ["kOfxImageEffectSimpleSourceClipName"]
+
+
+def _generate_source_clips(context: str) -> dict[str, list[str]]:
+    """
+    Generate the source clip definitions and handle fetches of a context.
+
+    Transitions define SourceFrom and SourceTo plus the mandated Transition
+    parameter; render() reads SourceFrom through the instance's sourceClip.
     """
-    params = params or []
-
-    code = f'''// OFX Plugin: {plugin_name}
-// ID: {plugin_id}
-// Generated by MCP OFX
-
-#include "ofxImageEffect.h"
-#include "ofxMemory.h"
-#include "ofxMultiThread.h"
-
-// Plugin identifier
-#define PLUGIN_ID "{plugin_id}"
-#define PLUGIN_NAME "{plugin_name}"
-#define PLUGIN_VERSION_MAJOR 1
-#define PLUGIN_VERSION_MINOR 0
-
-// Global host pointers
-static OfxHost *gHost = NULL;
-static OfxPropertySuiteV1 *gPropSuite = NULL;
-static OfxImageEffectSuiteV1 *gEffectSuite = NULL;
-static OfxParameterSuiteV1 *gParamSuite = NULL;
-static OfxMemorySuiteV1 *gMemorySuite = NULL;
-static OfxMultiThreadSuiteV1 *gThreadSuite = NULL;
-
-// Instance data structure
-typedef struct {{
-    OfxImageEffectHandle effect;
-    OfxImageClipHandle sourceClip;
-    OfxImageClipHandle outputClip;
-{_generate_param_handles(params)}
-}} PluginInstance;
-
-//------------------------------------------------------------------------------
-// Suite fetching
-//------------------------------------------------------------------------------
-static OfxStatus fetchSuites(void)
-{{
-    gPropSuite = (OfxPropertySuiteV1*)gHost->fetchSuite(
-        gHost->host, kOfxPropertySuite, 1);
-    gEffectSuite = (OfxImageEffectSuiteV1*)gHost->fetchSuite(
-        gHost->host, kOfxImageEffectSuite, 1);
-    gParamSuite = (OfxParameterSuiteV1*)gHost->fetchSuite(
-        gHost->host, kOfxParameterSuite, 1);
-    gMemorySuite = (OfxMemorySuiteV1*)gHost->fetchSuite(
-        gHost->host, kOfxMemorySuite, 1);
-    gThreadSuite = (OfxMultiThreadSuiteV1*)gHost->fetchSuite(
-        gHost->host, kOfxMultiThreadSuite, 1);
-
-    if (!gPropSuite || !gEffectSuite || !gParamSuite) {{
-        return kOfxStatErrMissingHostFeature;
-    }}
-    return kOfxStatOK;
-}}
-
-//------------------------------------------------------------------------------
-// Load Action
-//------------------------------------------------------------------------------
-static OfxStatus onLoad(void)
-{{
-    return fetchSuites();
-}}
-
-//------------------------------------------------------------------------------
-// Describe Action
-//------------------------------------------------------------------------------
-static OfxStatus describe(OfxImageEffectHandle effect)
-{{
-    OfxPropertySetHandle props;
-    gEffectSuite->getPropertySet(effect, &props);
-
-    // Set plugin properties
-    gPropSuite->propSetString(props, kOfxPropLabel, 0, PLUGIN_NAME);
-    gPropSuite->propSetString(props, kOfxImageEffectPluginPropGrouping, 0, "MCP OFX");
-
-    // Supported contexts
-    gPropSuite->propSetString(props, kOfxImageEffectPropSupportedContexts, 0,
-                              {_context_string(context)});
-
-    // Supported pixel depths
-    gPropSuite->propSetString(props, kOfxImageEffectPropSupportedPixelDepths, 0, kOfxBitDepthFloat);
-    gPropSuite->propSetString(props, kOfxImageEffectPropSupportedPixelDepths, 1, kOfxBitDepthShort);
-    gPropSuite->propSetString(props, kOfxImageEffectPropSupportedPixelDepths, 2, kOfxBitDepthByte);
-
-    // Capabilities
-    gPropSuite->propSetInt(props, kOfxImageEffectPropSupportsMultiResolution, 0, 1);
-    gPropSuite->propSetInt(props, kOfxImageEffectPropSupportsTiles, 0, 1);
-    gPropSuite->propSetInt(props, kOfxImageEffectPropTemporalClipAccess, 0, 0);
-    gPropSuite->propSetString(props, kOfxImageEffectPluginRenderThreadSafety, 0,
-                              kOfxImageEffectRenderFullySafe);
-{_generate_gpu_describe(supports_gpu)}
-    return kOfxStatOK;
-}}
-
-//------------------------------------------------------------------------------
-// Describe in Context Action
-//------------------------------------------------------------------------------
-static OfxStatus describeInContext(OfxImageEffectHandle effect, OfxPropertySetHandle inArgs)
-{{
-    OfxPropertySetHandle props;
-
-    // Define source clip
-    gEffectSuite->clipDefine(effect, "Source", &props);
-    gPropSuite->propSetString(props, kOfxImageEffectPropSupportedComponents, 0, kOfxImageComponentRGBA);
-    gPropSuite->propSetString(props, kOfxImageEffectPropSupportedComponents, 1, kOfxImageComponentRGB);
-    gPropSuite->propSetString(props, kOfxImageEffectPropSupportedComponents, 2, kOfxImageComponentAlpha);
-
-    // Define output clip
-    gEffectSuite->clipDefine(effect, "Output", &props);
-    gPropSuite->propSetString(props, kOfxImageEffectPropSupportedComponents, 0, kOfxImageComponentRGBA);
-    gPropSuite->propSetString(props, kOfxImageEffectPropSupportedComponents, 1, kOfxImageComponentRGB);
-    gPropSuite->propSetString(props, kOfxImageEffectPropSupportedComponents, 2, kOfxImageComponentAlpha);
-
-    // Define parameters
-    OfxParamSetHandle paramSet;
-    gEffectSuite->getParamSet(effect, &paramSet);
-{_generate_param_defines(params)}
-    return kOfxStatOK;
-}}
-
-//------------------------------------------------------------------------------
-// Create Instance Action
-//------------------------------------------------------------------------------
-static OfxStatus createInstance(OfxImageEffectHandle effect)
-{{
-    PluginInstance *instance = NULL;
-    gMemorySuite->memoryAlloc(NULL, sizeof(PluginInstance), (void**)&instance);
-    if (!instance) return kOfxStatErrMemory;
-
-    instance->effect = effect;
-    gEffectSuite->clipGetHandle(effect, "Source", &instance->sourceClip, NULL);
-    gEffectSuite->clipGetHandle(effect, "Output", &instance->outputClip, NULL);
-{_generate_param_fetch(params)}
-    OfxPropertySetHandle props;
-    gEffectSuite->getPropertySet(effect, &props);
-    gPropSuite->propSetPointer(props, kOfxPropInstanceData, 0, instance);
-
-    return kOfxStatOK;
-}}
-
-//------------------------------------------------------------------------------
-// Destroy Instance Action
-//------------------------------------------------------------------------------
-static OfxStatus destroyInstance(OfxImageEffectHandle effect)
-{{
-    OfxPropertySetHandle props;
-    gEffectSuite->getPropertySet(effect, &props);
-
-    PluginInstance *instance = NULL;
-    gPropSuite->propGetPointer(props, kOfxPropInstanceData, 0, (void**)&instance);
-
-    if (instance) {{
-        gMemorySuite->memoryFree(instance);
-    }}
-    return kOfxStatOK;
-}}
-
-//------------------------------------------------------------------------------
-// Is Identity Action
-//------------------------------------------------------------------------------
-static OfxStatus isIdentity(OfxImageEffectHandle effect,
-                            OfxPropertySetHandle inArgs,
-                            OfxPropertySetHandle outArgs)
-{{
-    // Return kOfxStatOK if this effect is an identity (pass-through)
-    // Set kOfxPropName to clip name and kOfxPropTime to time to use
-    return kOfxStatReplyDefault;
-}}
-
-//------------------------------------------------------------------------------
-// Render Action
-//------------------------------------------------------------------------------
-static OfxStatus render(OfxImageEffectHandle effect, OfxPropertySetHandle inArgs)
-{{
-    OfxPropertySetHandle props;
-    gEffectSuite->getPropertySet(effect, &props);
-
-    PluginInstance *instance = NULL;
-    gPropSuite->propGetPointer(props, kOfxPropInstanceData, 0, (void**)&instance);
-    if (!instance) return kOfxStatErrBadHandle;
-
-    // Get render arguments
-    OfxTime time;
-    gPropSuite->propGetDouble(inArgs, kOfxPropTime, 0, &time);
-
-    OfxRectI renderWindow;
-    gPropSuite->propGetIntN(inArgs, kOfxImageEffectPropRenderWindow, 4, &renderWindow.x1);
-
-    double renderScale[2];
-    gPropSuite->propGetDoubleN(inArgs, kOfxImageEffectPropRenderScale, 2, renderScale);
-
-    // Fetch images
-    OfxPropertySetHandle sourceImg = NULL, outputImg = NULL;
-    gEffectSuite->clipGetImage(instance->sourceClip, time, NULL, &sourceImg);
-    gEffectSuite->clipGetImage(instance->outputClip, time, NULL, &outputImg);
-
-    if (!sourceImg || !outputImg) {{
-        if (sourceImg) gEffectSuite->clipReleaseImage(sourceImg);
-        if (outputImg) gEffectSuite->clipReleaseImage(outputImg);
-        return kOfxStatFailed;
-    }}
-
-    // Get image properties
-    void *srcData = NULL, *dstData = NULL;
-    gPropSuite->propGetPointer(sourceImg, kOfxImagePropData, 0, &srcData);
-    gPropSuite->propGetPointer(outputImg, kOfxImagePropData, 0, &dstData);
-
-    int srcRowBytes, dstRowBytes;
-    gPropSuite->propGetInt(sourceImg, kOfxImagePropRowBytes, 0, &srcRowBytes);
-    gPropSuite->propGetInt(outputImg, kOfxImagePropRowBytes, 0, &dstRowBytes);
-
-    OfxRectI srcBounds, dstBounds;
-    gPropSuite->propGetIntN(sourceImg, kOfxImagePropBounds, 4, &srcBounds.x1);
-    gPropSuite->propGetIntN(outputImg, kOfxImagePropBounds, 4, &dstBounds.x1);
-
-    char *pixelDepth = NULL;
-    gPropSuite->propGetString(outputImg, kOfxImageEffectPropPixelDepth, 0, &pixelDepth);
-
-    char *components = NULL;
-    gPropSuite->propGetString(outputImg, kOfxImageEffectPropComponents, 0, &components);
-
-    // Get parameter values at render time
-{_generate_param_get_values(params)}
-    // TODO: Implement your pixel processing here
-    // Process renderWindow region using srcData -> dstData
-
-    // Release images
-    gEffectSuite->clipReleaseImage(sourceImg);
-    gEffectSuite->clipReleaseImage(outputImg);
-
-    return kOfxStatOK;
-}}
-
-//------------------------------------------------------------------------------
-// Main Entry Point
-//------------------------------------------------------------------------------
-static OfxStatus pluginMain(const char *action,
-                            const void *handle,
-                            OfxPropertySetHandle inArgs,
-                            OfxPropertySetHandle outArgs)
-{{
-    if (strcmp(action, kOfxActionLoad) == 0) {{
-        return onLoad();
-    }}
-    if (strcmp(action, kOfxActionDescribe) == 0) {{
-        return describe((OfxImageEffectHandle)handle);
-    }}
-    if (strcmp(action, kOfxImageEffectActionDescribeInContext) == 0) {{
-        return describeInContext((OfxImageEffectHandle)handle, inArgs);
-    }}
-    if (strcmp(action, kOfxActionCreateInstance) == 0) {{
-        return createInstance((OfxImageEffectHandle)handle);
-    }}
-    if (strcmp(action, kOfxActionDestroyInstance) == 0) {{
-        return destroyInstance((OfxImageEffectHandle)handle);
-    }}
-    if (strcmp(action, kOfxImageEffectActionIsIdentity) == 0) {{
-        return isIdentity((OfxImageEffectHandle)handle, inArgs, outArgs);
-    }}
-    if (strcmp(action, kOfxImageEffectActionRender) == 0) {{
-        return render((OfxImageEffectHandle)handle, inArgs);
-    }}
-    // Handle other actions...
-    return kOfxStatReplyDefault;
-}}
-
-//------------------------------------------------------------------------------
-// setHost callback
-//------------------------------------------------------------------------------
-static void setHost(OfxHost *host)
-{{
-    gHost = host;
-}}
-
-//------------------------------------------------------------------------------
-// Plugin definition
-//------------------------------------------------------------------------------
-static OfxPlugin plugin = {{
-    kOfxImageEffectPluginApi,
-    kOfxImageEffectPluginApiVersion,
-    PLUGIN_ID,
-    PLUGIN_VERSION_MAJOR,
-    PLUGIN_VERSION_MINOR,
-    setHost,
-    pluginMain
-}};
-
-//------------------------------------------------------------------------------
-// Exported functions
-//------------------------------------------------------------------------------
-OfxExport int OfxGetNumberOfPlugins(void)
-{{
-    return 1;
-}}
-
-OfxExport OfxPlugin* OfxGetPlugin(int nth)
-{{
-    if (nth == 0) return &plugin;
-    return NULL;
-}}
-'''
-    return code
+    clips = _source_clip_names(context)
+    defines = [f"    defineSourceClip(effect, {clip});" for clip in clips]
+    fetch = [f"    gEffectSuite->clipGetHandle(effect, {clips[0]}, &instance->sourceClip, NULL);"]
+    param_defines = []
+    if len(clips) > 1:
+        fetch.append(f"    gEffectSuite->clipGetHandle(effect, {clips[1]}, &instance->sourceToClip, NULL);")
+        param_defines = [
+            "",
+            "    // Mandated transition parameter, animated by the host from 0 (SourceFrom) to 1 (SourceTo)",
+            "    gParamSuite->paramDefine(paramSet, kOfxParamTypeDouble, kOfxImageEffectTransitionParamName, &props);",
+            '    gPropSuite->propSetString(props, kOfxPropLabel, 0, "Transition");',
+            "    gPropSuite->propSetDouble(props, kOfxParamPropDefault, 0, 0.0);",
+            "    gPropSuite->propSetDouble(props, kOfxParamPropMin, 0, 0.0);",
+            "    gPropSuite->propSetDouble(props, kOfxParamPropMax, 0, 1.0);",
+        ]
+    return {
+        "source_clip_defines": defines,
+        "source_clip_fetch": fetch,
+        "context_param_defines": param_defines,
+    }
+
+
+def _generate_bundle_define(bundle_symbol: Optional[str]) -> list[str]:
+    """Generate the define that switches the skeleton to a bundle translation unit."""
+    if bundle_symbol is None:
+        return []
+    return [
+        "",
+        "// Translation unit of a multi-plugin bundle",
+        f"#define OFX_BUNDLE_PLUGIN {bundle_symbol}",
+        "",
+    ]
+
+
+def _context_key(context: str) -> str:
+    """Convert a context constant to its default_behavior key (e.g. 'filter')."""
+    return context.replace("kOfxImageEffectContext", "").lower()
 
 
 def _context_string(context: str) -> str:
@@ -342,29 +296,29 @@ def _context_string(context: str) -> str:
     return context_map.get(context, "kOfxImageEffectContextFilter")
 
 
-def _generate_param_handles(params: list[dict]) -> str:
+def _generate_param_handles(params: list[dict]) -> list[str]:
     """Generate parameter handle declarations."""
     if not params:
-        return "    // Add parameter handles here"
+        return ["    // Add parameter handles here"]
 
     lines = []
     for param in params:
         name = param.get("name", "param")
         lines.append(f"    OfxParamHandle {name}Param;")
-    return "\n".join(lines)
+    return lines
 
 
-def _generate_param_defines(params: list[dict]) -> str:
+def _generate_param_defines(params: list[dict]) -> list[str]:
     """Generate parameter definition code."""
     if not params:
-        return """
+        return ["""
     // Example: Define a double parameter
     // gParamSuite->paramDefine(paramSet, kOfxParamTypeDouble, "amount", &props);
     // gPropSuite->propSetString(props, kOfxPropLabel, 0, "Amount");
     // gPropSuite->propSetDouble(props, kOfxParamPropDefault, 0, 1.0);
     // gPropSuite->propSetDouble(props, kOfxParamPropMin, 0, 0.0);
     // gPropSuite->propSetDouble(props, kOfxParamPropMax, 0, 10.0);
-"""
+"""]
     lines = ["\n"]
     for param in params:
         name = param.get("name", "param")
@@ -387,66 +341,611 @@ def _generate_param_defines(params: list[dict]) -> str:
         elif ptype == "kOfxParamTypeBoolean":
             lines.append(f"    gPropSuite->propSetInt(props, kOfxParamPropDefault, 0, {1 if default else 0});")
 
+        double_type = _spatial_double_type(param)
+        if double_type:
+            lines.append(f"    gPropSuite->propSetString(props, kOfxParamPropDoubleType, 0, {double_type});")
+
         lines.append("")
 
-    return "\n".join(lines)
+    return lines
 
 
-def _generate_param_fetch(params: list[dict]) -> str:
+def _generate_param_fetch(params: list[dict]) -> list[str]:
     """Generate parameter fetch code for create instance."""
     if not params:
-        return "    // Fetch parameter handles here"
+        return ["    // Fetch parameter handles here"]
 
     lines = ["\n    OfxParamSetHandle paramSet;", "    gEffectSuite->getParamSet(effect, &paramSet);"]
     for param in params:
         name = param.get("name", "param")
         lines.append(f'    gParamSuite->paramGetHandle(paramSet, "{name}", &instance->{name}Param, NULL);')
-    return "\n".join(lines)
+    return lines
+
+
+def _param_value_layout(param: dict) -> Optional[tuple[str, int]]:
+    """Return the C value type and dimension count of a parameter, or None."""
+    ptype = param.get("type", "kOfxParamTypeDouble")
+    dims = 3 if "3D" in ptype else 2 if "2D" in ptype else 1
+    if "Double" in ptype:
+        return "double", dims
+    if "Integer" in ptype:
+        return "int", dims
+    if ptype in ("kOfxParamTypeBoolean", "kOfxParamTypeChoice"):
+        return "int", 1
+    if ptype == "kOfxParamTypeRGB":
+        return "double", 3
+    if ptype == "kOfxParamTypeRGBA":
+        return "double", 4
+    return None
+
+
+# Double type of spatial parameters, per (dimensions, kind)
+_SPATIAL_DOUBLE_TYPES = {
+    (1, "size"): "kOfxParamDoubleTypeX",
+    (1, "position"): "kOfxParamDoubleTypeXAbsolute",
+    (2, "size"): "kOfxParamDoubleTypeXY",
+    (2, "position"): "kOfxParamDoubleTypeXYAbsolute",
+}
+
+
+def _spatial_kind(param: dict) -> Optional[str]:
+    """Return 'size' or 'position' for a spatial Double parameter, else None."""
+    return param.get("spatial")
+
+
+def _spatial_double_type(param: dict) -> Optional[str]:
+    """Return the kOfxParamPropDoubleType of a spatial parameter, or None."""
+    kind = _spatial_kind(param)
+    if kind is None:
+        return None
+    return _SPATIAL_DOUBLE_TYPES[(_param_value_layout(param)[1], kind)]
+
+
+def _generate_param_to_pixels(params: list[dict]) -> list[str]:
+    """Generate the conversion of spatial parameters from canonical coordinates to pixels."""
+    lines = []
+    for param in params:
+        if _spatial_kind(param) is None:
+            continue
+        name = param.get("name", "param")
+        if _param_value_layout(param)[1] == 1:
+            lines.append(f"    args.params.{name}Value *= pixelScale[0];")
+        else:
+            lines.append(f"    args.params.{name}Value[0] *= pixelScale[0];")
+            lines.append(f"    args.params.{name}Value[1] *= pixelScale[1];")
+    if not lines:
+        return []
+    return [
+        "",
+        "    // Spatial parameters are in canonical coordinates; the pixel loops work in",
+        "    // pixels at the render scale. The snapshot and RoD/RoI stay canonical.",
+        "    double pixelAspect = 1.0;",
+        "    gPropSuite->propGetDouble(sourceImg, kOfxImagePropPixelAspectRatio, 0, &pixelAspect);",
+        "    const double pixelScale[2] = {",
+        "        renderScale[0] / (pixelAspect > 0.0 ? pixelAspect : 1.0),",
+        "        renderScale[1],",
+        "    };",
+        *lines,
+        "",
+    ]
 
 
-def _generate_param_get_values(params: list[dict]) -> str:
-    """Generate code to get parameter values at render time."""
-    if not params:
-        return "    // Get parameter values here"
+def _generate_param_value_fields(params: list[dict]) -> list[str]:
+    """Generate the ParamValues struct members."""
+    lines = []
+    for param in params:
+        layout = _param_value_layout(param)
+        if layout is None:
+            continue
+        name = param.get("name", "param")
+        ctype, dims = layout
+        if dims == 1:
+            lines.append(f"    {ctype} {name}Value;")
+        else:
+            lines.append(f"    {ctype} {name}Value[{dims}];")
+    return lines or ["    int unused;"]
+
 
+def _generate_param_get_values(params: list[dict]) -> list[str]:
+    """Generate code to get parameter values at render time."""
     lines = []
     for param in params:
+        layout = _param_value_layout(param)
+        if layout is None:
+            continue
         name = param.get("name", "param")
-        ptype = param.get("type", "kOfxParamTypeDouble")
+        _, dims = layout
+        if dims == 1:
+            varargs = f"&values->{name}Value"
+        else:
+            varargs = ", ".join([f"&values->{name}Value[{i}]" for i in range(dims)])
+        lines.append(f"    gParamSuite->paramGetValueAtTime(instance->{name}Param, time, {varargs});")
 
-        if "Double" in ptype:
-            dims = 1
-            if "2D" in ptype:
-                dims = 2
-            elif "3D" in ptype:
-                dims = 3
-            if dims == 1:
-                lines.append(f"    double {name}Value;")
-                lines.append(f"    gParamSuite->paramGetValueAtTime(instance->{name}Param, time, &{name}Value);")
-            else:
-                lines.append(f"    double {name}Value[{dims}];")
-                varargs = ", ".join([f"&{name}Value[{i}]" for i in range(dims)])
-                lines.append(f"    gParamSuite->paramGetValueAtTime(instance->{name}Param, time, {varargs});")
-        elif "Integer" in ptype:
-            lines.append(f"    int {name}Value;")
-            lines.append(f"    gParamSuite->paramGetValueAtTime(instance->{name}Param, time, &{name}Value);")
-        elif ptype == "kOfxParamTypeBoolean":
-            lines.append(f"    int {name}Value;")
-            lines.append(f"    gParamSuite->paramGetValueAtTime(instance->{name}Param, time, &{name}Value);")
+    return lines or ["    // Get parameter values here", "    (void)instance;", "    (void)time;", "    (void)values;"]
+
+
+def _c_literal(value: Any, ctype: str) -> str:
+    """Format an identity value as a C literal of the given type."""
+    if ctype == "int":
+        return str(int(value))
+    return repr(float(value))
+
+
+def _identity_condition(param: dict) -> Optional[str]:
+    """
+    Build the C condition under which a parameter makes the effect a no-op.
+
+    The condition is declared with the parameter's "identity" value: a scalar
+    (e.g. 0 for an amount, false for an enable switch) or one value per
+    dimension for multi-dimensional parameters.
+    """
+    if "identity" not in param:
+        return None
+    layout = _param_value_layout(param)
+    if layout is None:
+        return None
+    ctype, dims = layout
+    name = param.get("name", "param")
+    identity = param["identity"]
+
+    if dims == 1:
+        if isinstance(identity, (list, tuple)):
+            return None
+        return f"values.{name}Value == {_c_literal(identity, ctype)}"
+
+    if not isinstance(identity, (list, tuple)):
+        identity = [identity] * dims
+    if len(identity) != dims:
+        return None
+    return "(" + " && ".join(
+        f"values.{name}Value[{i}] == {_c_literal(value, ctype)}" for i, value in enumerate(identity)
+    ) + ")"
+
+
+def _generate_identity_checks(context: str, params: list[dict]) -> list[str]:
+    """
+    Generate the body of the isIdentity action.
+
+    Filter-style contexts pass the source clip through when any parameter's
+    identity condition holds. Transitions pass SourceFrom through at 0 and
+    SourceTo at 1.
+    """
+    conditions = []
+    if context != "kOfxImageEffectContextGenerator":
+        conditions = [c for c in map(_identity_condition, params) if c is not None]
+    transition = context == "kOfxImageEffectContextTransition"
+
+    if not conditions and not transition:
+        return [
+            "    // Return kOfxStatOK if this effect is an identity (pass-through)",
+            "    // Set kOfxPropName to clip name and kOfxPropTime to time to use",
+            "    return kOfxStatReplyDefault;",
+        ]
+
+    lines = [
+        "    OfxTime time = 0;",
+        "    gPropSuite->propGetDouble(inArgs, kOfxPropTime, 0, &time);",
+        "    const char *clipName = NULL;",
+        "",
+    ]
+    if transition:
+        lines += [
+            "    // The host-defined transition parameter runs from 0 (SourceFrom) to 1 (SourceTo)",
+            "    OfxParamSetHandle paramSet;",
+            "    OfxParamHandle transitionParam = NULL;",
+            "    double transition = 0.5;",
+            "    gEffectSuite->getParamSet(effect, &paramSet);",
+            "    gParamSuite->paramGetHandle(paramSet, kOfxImageEffectTransitionParamName, &transitionParam, NULL);",
+            "    if (transitionParam) gParamSuite->paramGetValueAtTime(transitionParam, time, &transition);",
+            "    if (transition <= 0.0) clipName = kOfxImageEffectTransitionSourceFromClipName;",
+            "    else if (transition >= 1.0) clipName = kOfxImageEffectTransitionSourceToClipName;",
+            "",
+        ]
+    if conditions:
+        # Transitions blend two sources, so a no-op passes SourceFrom through
+        source = "kOfxImageEffectTransitionSourceFromClipName" if transition else "kOfxImageEffectSimpleSourceClipName"
+        lines += [
+            "    // Pass the source through when any identity condition holds",
+            "    PluginInstance *instance = getInstance(effect);",
+            "    if (!clipName && instance) {",
+            "        ParamValues values;",
+            "        getParamValues(instance, time, &values);",
+            "        if (" + " ||\n            ".join(conditions) + ") {",
+            f"            clipName = {source};",
+            "        }",
+            "    }",
+            "",
+        ]
+    lines += [
+        "    if (!clipName) return kOfxStatReplyDefault;",
+        "    gPropSuite->propSetString(outArgs, kOfxPropName, 0, clipName);",
+        "    gPropSuite->propSetDouble(outArgs, kOfxPropTime, 0, time);",
+        "    return kOfxStatOK;",
+    ]
+    return lines
+
+
+_FOOTPRINT_TYPES = ("pointwise", "radius", "transform")
+
+
+def _numeric_param_dims(params: list[dict], name: Any) -> Optional[int]:
+    """Return the dimension count of a Double/Integer parameter, or None."""
+    for param in params:
+        if param.get("name") != name:
+            continue
+        if "Double" not in param["type"] and "Integer" not in param["type"]:
+            return None
+        layout = _param_value_layout(param)
+        return layout[1] if layout else None
+    return None
+
+
+def _canonical_footprint(footprint: Any, context: str, params: list[dict]) -> Optional[dict]:
+    """
+    Validate and normalize a footprint description.
+
+    Args:
+        footprint: None, a footprint type name or a dict with a "type" key
+        context: Canonical context constant
+        params: Canonical parameter definitions
+
+    Returns:
+        The footprint as a dict, or None when no footprint is given.
+    """
+    if footprint is None:
+        return None
+    if isinstance(footprint, str):
+        footprint = {"type": footprint}
+    footprint = {key: value for key, value in footprint.items() if value is not None}
+
+    kind = footprint.get("type")
+    if kind not in _FOOTPRINT_TYPES:
+        raise ValueError(f"Unknown footprint type '{kind}'. Available: {list(_FOOTPRINT_TYPES)}")
+    if context == "kOfxImageEffectContextGenerator":
+        raise ValueError("Generators have no input clips, so a footprint does not apply")
+
+    # Radius and translate are distances in canonical coordinates, converted
+    # to pixels like any spatial parameter, so they must be Doubles
+    if kind == "radius":
+        if not _is_spatial_type(params, footprint.get("param")):
+            raise ValueError("A radius footprint needs 'param' naming a 1D or 2D Double parameter")
+        return {"type": kind, "param": footprint["param"]}
+
+    if kind == "transform":
+        translate = footprint.get("translate")
+        scale = footprint.get("scale")
+        if translate is None and scale is None:
+            raise ValueError("A transform footprint needs a 'translate' and/or 'scale' parameter")
+        if translate is not None and (_numeric_param_dims(params, translate) != 2
+                                      or not _is_spatial_type(params, translate)):
+            raise ValueError("A transform footprint's 'translate' must name a 2D Double parameter")
+        if scale is not None and _numeric_param_dims(params, scale) != 1:
+            raise ValueError("A transform footprint's 'scale' must name a 1D Double/Integer parameter")
+        return {"type": kind, "translate": translate, "scale": scale}
+
+    return {"type": kind}
+
+
+def _is_spatial_type(params: list[dict], name: Any) -> bool:
+    """Check that a parameter exists and is a Double or Double2D."""
+    return any(param.get("name") == name and param["type"] in _SPATIAL_PARAM_TYPES for param in params)
+
+
+def _mark_footprint_params_spatial(params: list[dict], footprint: Optional[dict]) -> list[dict]:
+    """
+    Mark the radius and translate parameters of a footprint as spatial.
+
+    The RoD/RoI handlers read them in canonical coordinates, so render() must
+    convert the same values to pixels at the render scale; otherwise a proxy
+    render would read more or fewer pixels than the host fetched.
+    """
+    if footprint is None:
+        return params
+    names = {footprint.get("param"), footprint.get("translate")} - {None}
+    return [
+        {**param, "spatial": param.get("spatial", "size")} if param["name"] in names else param
+        for param in params
+    ]
+
+
+def _generate_footprint_values(params: list[dict], footprint: dict) -> list[str]:
+    """Generate the getFootprint assignments from parameter values."""
+    lines = []
+    if footprint["type"] == "radius":
+        name = footprint["param"]
+        if _numeric_param_dims(params, name) == 1:
+            lines.append(f"    footprint->radius[0] = (double)values.{name}Value;")
+            lines.append(f"    footprint->radius[1] = (double)values.{name}Value;")
+        else:
+            lines.append(f"    footprint->radius[0] = (double)values.{name}Value[0];")
+            lines.append(f"    footprint->radius[1] = (double)values.{name}Value[1];")
+    elif footprint["type"] == "transform":
+        if footprint["translate"] is not None:
+            name = footprint["translate"]
+            lines.append(f"    footprint->translate[0] = (double)values.{name}Value[0];")
+            lines.append(f"    footprint->translate[1] = (double)values.{name}Value[1];")
+        if footprint["scale"] is not None:
+            lines.append(f"    footprint->scale = (double)values.{footprint['scale']}Value;")
+    else:
+        lines.append("    // Pointwise: each output pixel depends only on the input pixel below it")
+    return lines
+
+
+def _generate_footprint_handlers(context: str, params: list[dict], footprint: Optional[dict]) -> Any:
+    """Generate the footprint and RoD/RoI handlers, or nothing without a footprint."""
+    if footprint is None:
+        return ""
+
+    clips = _source_clip_names(context)
+    default = IMAGE_EFFECT_ACTIONS["kOfxImageEffectActionGetRegionOfDefinition"].get("default_behavior")
+    if isinstance(default, dict):
+        default = default.get(_context_key(context))
+
+    return get_template("footprint").render({
+        "footprint_input_clips": [f'    {{ {clip}, "OfxImageClipPropRoI_" {clip} }},' for clip in clips],
+        "footprint_values": _generate_footprint_values(params, footprint),
+        "rod_default": default or "union of the input clip RoDs",
+    })
+
+
+def _generate_source_window(footprint: Optional[dict]) -> list[str]:
+    """
+    Generate the render code growing sourceWindow to the footprint's RoI.
+
+    Without a footprint the host's default RoI, the render window, is kept.
+    """
+    if footprint is None:
+        return []
+    bounds = []
+    for axis, (x1, x2) in enumerate((("x1", "x2"), ("y1", "y2"))):
+        for edge, rounding, sign in ((x1, "floorToInt", "-"), (x2, "ceilToInt", "+")):
+            bounds.append(
+                f"            sourceWindow.{edge} = {rounding}((renderWindow.{edge} / renderScale[{axis}] {sign} "
+                f"footprint.radius[{axis}] - footprint.translate[{axis}]) / footprint.scale * renderScale[{axis}]);"
+            )
+    return [
+        "    {",
+        "        // The canonical RoI of getRegionsOfInterest, in pixels",
+        "        Footprint footprint;",
+        "        getFootprint(instance, time, &footprint);",
+        "        if (footprint.scale > 0.0) {",
+        *bounds,
+        "        } else {",
+        "            // The host's default RoI covers the whole source",
+        "            sourceWindow.x1 = sourceWindow.y1 = INT_MIN;",
+        "            sourceWindow.x2 = sourceWindow.y2 = INT_MAX;",
+        "        }",
+        "    }",
+        "",
+    ]
+
+
+def _generate_frames_needed(context: str, temporal_radius: int) -> list[str]:
+    """Generate the GetFramesNeeded action for temporal plugins."""
+    if temporal_radius <= 0:
+        return []
+    ranges = [
+        f"    gPropSuite->propSetDoubleN(outArgs, \"OfxImageClipPropFrameRange_\" {clip}, 2, range);"
+        for clip in _source_clip_names(context)
+    ]
+    return [
+        "//------------------------------------------------------------------------------",
+        "// Get Frames Needed Action",
+        "//------------------------------------------------------------------------------",
+        "static OfxStatus getFramesNeeded(OfxPropertySetHandle inArgs, OfxPropertySetHandle outArgs)",
+        "{",
+        "    OfxTime time = 0;",
+        "    gPropSuite->propGetDouble(inArgs, kOfxPropTime, 0, &time);",
+        "",
+        "    double range[2] = { time - TEMPORAL_RADIUS, time + TEMPORAL_RADIUS };",
+        *ranges,
+        "    return kOfxStatOK;",
+        "}",
+        "",
+        "",
+    ]
+
+
+# C sample type and white value per bit depth. Half samples are raw fp16 bits.
+_PIXEL_SAMPLE_TYPES = {
+    "kOfxBitDepthByte": ("unsigned char", "255"),
+    "kOfxBitDepthShort": ("unsigned short", "65535"),
+    "kOfxBitDepthHalf": ("unsigned short", "0x3C00"),
+    "kOfxBitDepthFloat": ("float", "1.0f"),
+}
+
+
+def _generate_row_processors(proxy: bool) -> list[str]:
+    """
+    Generate the row processor variants of every (bit depth x components)
+    format and the lookup table.
+
+    Premultiplied RGBA sources get a PREMULT variant that unpremultiplies
+    around the colour processing. With proxy set, PROXY variants are generated
+    for renders below the proxy scale threshold.
+    """
+    formats = []
+    for depth in BIT_DEPTHS:
+        if depth not in _PIXEL_SAMPLE_TYPES:
+            continue
+        for components, info in IMAGE_COMPONENTS.items():
+            if info.get("num_components", 0) > 0:
+                formats.append((depth, components, info["num_components"]))
+
+    lines = []
+    table = []
+    for depth, components, ncomp in formats:
+        ctype, white = _PIXEL_SAMPLE_TYPES[depth]
+        suffix = f"{depth[len('kOfxBitDepth'):]}{components[len('kOfxImageComponent'):]}"
+        # Half samples are raw bits, so they cannot be unpremultiplied in place
+        premult = components == "kOfxImageComponentRGBA" and depth != "kOfxBitDepthHalf"
+
+        variants = {}
+        for is_proxy in (False, True):
+            for is_premult in (False, True):
+                if (is_proxy and not proxy) or (is_premult and not premult):
+                    continue
+                name = "processRows" + ("Proxy" if is_proxy else "") + ("Premult" if is_premult else "") + suffix
+                lines.append(f"DEFINE_ROW_PROCESSOR({name}, {ctype}, {ncomp}, {white}, {int(is_proxy)}, {int(is_premult)})")
+                variants[is_proxy, is_premult] = name
+
+        # Missing variants fall back to the full-quality or straight ones
+        rows = []
+        for is_proxy in (False, True):
+            names = []
+            for is_premult in (False, True):
+                key = (is_proxy and proxy, is_premult and premult)
+                names.append(variants[key])
+            rows.append("{ " + ", ".join(names) + " }")
+        table.append(f"    {{ {depth}, {components}, {{ {', '.join(rows)} }}, (int)sizeof({ctype}) * {ncomp} }},")
+
+    lines.append("")
+    lines.append("static const struct {")
+    lines.append("    const char *pixelDepth;")
+    lines.append("    const char *components;")
+    lines.append("    RowProcessor process[2][2]; /* [proxy][premultiplied] */")
+    lines.append("    int pixelBytes;")
+    lines.append("} gRowProcessors[] = {")
+    lines.extend(table)
+    lines.append("};")
+    return lines
+
+
+# Actions in the order hosts call them most often; the dispatcher checks them first
+_ACTION_FREQUENCY_ORDER = [
+    "kOfxImageEffectActionRender",
+    "kOfxImageEffectActionIsIdentity",
+    "kOfxImageEffectActionGetRegionsOfInterest",
+    "kOfxImageEffectActionGetRegionOfDefinition",
+    "kOfxImageEffectActionGetFramesNeeded",
+    "kOfxImageEffectActionBeginSequenceRender",
+    "kOfxImageEffectActionEndSequenceRender",
+    "kOfxImageEffectActionGetClipPreferences",
+    "kOfxActionInstanceChanged",
+    "kOfxActionBeginInstanceChanged",
+    "kOfxActionEndInstanceChanged",
+    "kOfxImageEffectActionGetTimeDomain",
+]
+
+# The order of the original strcmp if-chain, used by the dispatch benchmark
+_STRCMP_CHAIN_ORDER = [
+    "kOfxActionLoad",
+    "kOfxActionDescribe",
+    "kOfxImageEffectActionDescribeInContext",
+    "kOfxActionCreateInstance",
+    "kOfxActionDestroyInstance",
+    "kOfxImageEffectActionIsIdentity",
+    "kOfxImageEffectActionRender",
+]
+
+
+_CAMEL_PARTS_RE = re.compile(r"[A-Z][a-z0-9]*")
+
+
+def _action_handlers(footprint: bool, temporal: bool) -> dict[str, str]:
+    """Map each implemented action to the statement pluginMain dispatches to."""
+    handlers = {
+        "kOfxActionLoad": "return onLoad();",
+        "kOfxActionUnload": "return onUnload();",
+        "kOfxActionDescribe": "return describe(effect);",
+        "kOfxImageEffectActionDescribeInContext": "return describeInContext(effect, inArgs);",
+        "kOfxActionCreateInstance": "return createInstance(effect);",
+        "kOfxActionDestroyInstance": "return destroyInstance(effect);",
+        "kOfxImageEffectActionIsIdentity": "return isIdentity(effect, inArgs, outArgs);",
+        "kOfxImageEffectActionRender": "return render(effect, inArgs);",
+        "kOfxActionInstanceChanged": "return instanceChanged(effect);",
+        "kOfxImageEffectActionBeginSequenceRender": "return beginSequenceRender(effect);",
+        "kOfxImageEffectActionEndSequenceRender": "return endSequenceRender(effect);",
+        "kOfxActionPurgeCaches": "return purgeCaches(effect);",
+    }
+    if footprint:
+        handlers["kOfxImageEffectActionGetRegionOfDefinition"] = "return getRegionOfDefinition(effect, inArgs, outArgs);"
+        handlers["kOfxImageEffectActionGetRegionsOfInterest"] = "return getRegionsOfInterest(effect, inArgs, outArgs);"
+    if temporal:
+        handlers["kOfxImageEffectActionGetFramesNeeded"] = "return getFramesNeeded(inArgs, outArgs);"
+    return handlers
 
-    return "\n".join(lines)
 
+def _action_enum_name(action: str) -> str:
+    """Convert an action constant to its ActionId enumerator name."""
+    for prefix in ("kOfxImageEffectAction", "kOfxAction"):
+        if action.startswith(prefix):
+            action = action[len(prefix):]
+            break
+    return "ACTION_" + "_".join(part.upper() for part in _CAMEL_PARTS_RE.findall(action))
 
-def _generate_gpu_describe(supports_gpu: bool) -> str:
+
+def _fnv1a(text: str) -> int:
+    """32-bit FNV-1a hash, matching hashAction() in the generated code."""
+    value = 2166136261
+    for byte in text.encode():
+        value = ((value ^ byte) * 16777619) & 0xFFFFFFFF
+    return value
+
+
+def _generate_action_dispatch(context: str, handlers: dict[str, str]) -> dict[str, list[str]]:
+    """
+    Generate the ActionId enum, name table, hash lookup and dispatch cases.
+
+    Args:
+        context: Context constant, used to pick per-context default behaviour notes
+        handlers: Statement to emit for each implemented action
+
+    Returns:
+        Template slot values for the dispatch code.
+    """
+    context_key = _context_key(context)
+    actions = {**CORE_ACTIONS, **IMAGE_EFFECT_ACTIONS}
+    ordered = [a for a in _ACTION_FREQUENCY_ORDER if a in actions]
+    ordered += [a for a in actions if a not in ordered]
+
+    enum_lines = [f"    {_action_enum_name(action)}," for action in ordered]
+    name_lines = [f"    {action}," for action in ordered]
+
+    by_hash: dict[int, list[str]] = {}
+    for action in ordered:
+        by_hash.setdefault(_fnv1a(actions[action]["value"]), []).append(action)
+    hash_lines = []
+    for value, colliding in by_hash.items():
+        hash_lines.append(f"    case 0x{value:08X}u:")
+        for action in colliding:
+            hash_lines.append(f"        if (strcmp(action, {action}) == 0) id = {_action_enum_name(action)};")
+        hash_lines.append("        break;")
+
+    case_lines = []
+    for action in ordered:
+        case_lines.append(f"    case {_action_enum_name(action)}:")
+        if action in handlers:
+            case_lines.append(f"        {handlers[action]}")
+            continue
+        default = actions[action].get("default_behavior")
+        if isinstance(default, dict):
+            default = default.get(context_key)
+        if default:
+            case_lines.append(f"        // Host default behaviour: {default}")
+        case_lines.append("        return kOfxStatReplyDefault;")
+
+    chain = [a for a in _STRCMP_CHAIN_ORDER if a in actions]
+    chain += [a for a in ordered if a not in chain]
+    return {
+        "action_enum": enum_lines,
+        "action_names": name_lines,
+        "action_hash_cases": hash_lines,
+        "action_dispatch_cases": case_lines,
+        "strcmp_chain_order": [f"    {action}," for action in chain],
+    }
+
+
+def _generate_gpu_describe(supports_gpu: bool) -> list[str]:
     """Generate GPU support properties."""
     if not supports_gpu:
-        return ""
-    return '''
+        return []
+    return ['''
     // GPU Rendering support
     gPropSuite->propSetString(props, kOfxImageEffectPropCudaRenderSupported, 0, "true");
     gPropSuite->propSetString(props, kOfxImageEffectPropMetalRenderSupported, 0, "true");
     gPropSuite->propSetString(props, kOfxImageEffectPropOpenCLRenderSupported, 0, "true");
-'''
+''']
 
 
 def generate_parameter_code(
@@ -472,13 +971,41 @@ def generate_parameter_code(
 
     Returns:
         C code for parameter definition.
+
+    Raises:
+        ValueError: If an override template uses a slot the generator does
+            not provide.
     """
     label = label or param_name
-    lines = [
-        f'// Define {param_name} parameter',
-        f'gParamSuite->paramDefine(paramSet, {param_type}, "{param_name}", &props);',
-        f'gPropSuite->propSetString(props, kOfxPropLabel, 0, "{label}");',
-    ]
+    key = _cache_key(
+        "param",
+        templates=get_template_revision(("parameter",)),
+        param_name=param_name,
+        param_type=param_type,
+        label=label,
+        default=default,
+        min_val=min_val,
+        max_val=max_val,
+        hint=hint,
+    )
+    return _CODEGEN_CACHE.get(
+        key,
+        lambda: _render_parameter_code(param_name, param_type, label, default, min_val, max_val, hint),
+    )
+
+
+def _render_parameter_code(
+    param_name: str,
+    param_type: str,
+    label: str,
+    default: Any,
+    min_val: Any,
+    max_val: Any,
+    hint: Optional[str],
+) -> str:
+    """Render the parameter definition code for canonicalized arguments."""
+    # Leading empty entry so the property lines start on a new line
+    lines = [""]
 
     if hint:
         lines.append(f'gPropSuite->propSetString(props, kOfxParamPropHint, 0, "{hint}");')
@@ -525,4 +1052,107 @@ def generate_parameter_code(
             for i, val in enumerate(default):
                 lines.append(f"gPropSuite->propSetDouble(props, kOfxParamPropDefault, {i}, {val});")
 
-    return "\n".join(lines)
+    return get_template("parameter").render({
+        "param_name": param_name,
+        "param_type": param_type,
+        "label": label,
+        "properties": lines if len(lines) > 1 else [],
+    })
+
+
+# Suites implemented by the benchmark host and the C variable serving each
+_BENCH_HOST_SUITES = {
+    "kOfxPropertySuite": "gPropertySuite",
+    "kOfxImageEffectSuite": "gImageEffectSuite",
+    "kOfxParameterSuite": "gParameterSuite",
+    "kOfxMemorySuite": "gMemorySuite",
+    "kOfxMultiThreadSuite": "gMultiThreadSuite",
+}
+
+
+def generate_bench_host(
+    context: str = "kOfxImageEffectContextFilter",
+    width: int = 1920,
+    height: int = 1080,
+    bit_depth: str = "kOfxBitDepthFloat",
+    components: str = "kOfxImageComponentRGBA",
+    frames: int = 100,
+) -> str:
+    """
+    Generate a minimal C OFX host that benchmarks a plugin binary on Linux.
+
+    The host dlopens the plugin, serves the property, image effect,
+    parameter, memory and multithread suites, runs the context's action
+    sequence and times Render over synthetic frames. The arguments are
+    defaults that can be overridden on the host's command line.
+
+    Args:
+        context: Context the plugin is instantiated in
+        width: Frame width in pixels
+        height: Frame height in pixels
+        bit_depth: Pixel depth constant of the synthetic images
+        components: Pixel components constant of the synthetic images
+        frames: Number of frames rendered
+
+    Returns:
+        C source of the benchmark host.
+
+    Raises:
+        ValueError: If the size, frame count, bit depth or components are
+            invalid, or an override template uses a slot the generator does
+            not provide.
+    """
+    context = _context_string(context)
+    width = int(width)
+    height = int(height)
+    frames = int(frames)
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Frame size must be positive, got {width}x{height}")
+    if frames < 0:
+        raise ValueError(f"Frame count must not be negative, got {frames}")
+    if bit_depth not in _PIXEL_SAMPLE_TYPES:
+        raise ValueError(f"Unsupported bit depth '{bit_depth}'. Available: {list(_PIXEL_SAMPLE_TYPES)}")
+    if not IMAGE_COMPONENTS.get(components, {}).get("num_components"):
+        supported = [name for name, info in IMAGE_COMPONENTS.items() if info.get("num_components")]
+        raise ValueError(f"Unsupported components '{components}'. Available: {supported}")
+
+    key = _cache_key(
+        "bench_host",
+        templates=get_template_revision(("bench_host",)),
+        context=context,
+        width=width,
+        height=height,
+        bit_depth=bit_depth,
+        components=components,
+        frames=frames,
+    )
+    return _CODEGEN_CACHE.get(
+        key,
+        lambda: _render_bench_host(context, width, height, bit_depth, components, frames),
+    )
+
+
+def _render_bench_host(
+    context: str,
+    width: int,
+    height: int,
+    bit_depth: str,
+    components: str,
+    frames: int,
+) -> str:
+    """Render the benchmark host for canonicalized arguments."""
+    suites = [
+        f"    {{ {name}, {SUITES[name]['version']}, &{variable} }},"
+        for name, variable in _BENCH_HOST_SUITES.items()
+    ]
+    actions = [f"    {action}," for action in get_action_sequence(_context_key(context))]
+    return get_template("bench_host").render({
+        "context": context,
+        "width": str(width),
+        "height": str(height),
+        "bit_depth": bit_depth,
+        "components": components,
+        "frames": str(frames),
+        "suite_table": suites,
+        "action_sequence": actions,
+    })
@@ -0,0 +1,97 @@
+"""
+Serialization of tool results with output modes and field projection.
+"""
+
+import json
+from typing import Any, Optional
+
+OUTPUT_FORMATS = ("pretty", "compact", "minimal")
+
+# Fields kept by the minimal format when the caller does not ask for any
+MINIMAL_FIELDS = ("name", "value", "description")
+
+
+def _project_record(record: dict, fields: tuple[str, ...], drop_empty: bool, keep_unmatched: bool) -> dict:
+    """Keep only the requested fields of a single record."""
+    projected = {key: record[key] for key in fields if key in record}
+    if not projected:
+        if keep_unmatched:
+            projected = dict(record)
+        elif "name" in record:
+            projected = {"name": record["name"]}
+    if drop_empty:
+        projected = {key: value for key, value in projected.items() if value not in (None, "", [], {})}
+    return projected
+
+
+def project(result: Any, fields: tuple[str, ...], drop_empty: bool = False, keep_unmatched: bool = False) -> Any:
+    """
+    Project a tool result onto a set of fields.
+
+    The projection applies to the records of the result: each dict in a list,
+    each value of a name-keyed dict of records, or the dict itself. Records
+    containing none of the fields are reduced to their name (or to nothing,
+    when they have none), so unknown field names never return more data.
+
+    Args:
+        result: Tool result (record, list of records or name-keyed records)
+        fields: Field names to keep
+        drop_empty: Also drop fields whose value is None or empty
+        keep_unmatched: Leave records containing none of the fields whole
+            (used for the minimal format's default fields)
+
+    Returns:
+        The projected result.
+    """
+    if isinstance(result, list):
+        return [
+            _project_record(item, fields, drop_empty, keep_unmatched) if isinstance(item, dict) else item
+            for item in result
+        ]
+    if isinstance(result, dict):
+        if result and all(isinstance(value, dict) for value in result.values()):
+            return {
+                key: _project_record(value, fields, drop_empty, keep_unmatched)
+                for key, value in result.items()
+            }
+        return _project_record(result, fields, drop_empty, keep_unmatched)
+    return result
+
+
+def format_response(
+    result: Any,
+    output_format: str = "pretty",
+    fields: Optional[list[str]] = None,
+    minimal_fields: tuple[str, ...] = MINIMAL_FIELDS,
+    records_key: Optional[str] = None,
+) -> str:
+    """
+    Serialize a tool result.
+
+    Args:
+        result: JSON-serializable tool result
+        output_format: 'pretty' (indented), 'compact' (no whitespace) or
+            'minimal' (compact, default fields only, empty fields dropped)
+        fields: Optional list of record fields to keep
+        minimal_fields: Fields the minimal format keeps when no fields are given
+        records_key: Apply the projection to result[records_key] only
+
+    Returns:
+        JSON text.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown format '{output_format}'. Available: {list(OUTPUT_FORMATS)}")
+
+    minimal = output_format == "minimal"
+    keep = tuple(fields) if fields else (minimal_fields if minimal else None)
+    if keep is not None:
+        options = {"drop_empty": minimal, "keep_unmatched": not fields}
+        if records_key is None:
+            result = project(result, keep, **options)
+        else:
+            result = dict(result)
+            result[records_key] = project(result[records_key], keep, **options)
+
+    if output_format == "pretty":
+        return json.dumps(result, indent=2)
+    return json.dumps(result, separators=(",", ":"))
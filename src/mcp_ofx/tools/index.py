@@ -0,0 +1,524 @@
+"""
+Precomputed indexes over the OFX SDK definitions.
+
+The indexes are built once at import time so that lookups never have to walk
+the category dictionaries.
+"""
+
+import math
+import re
+from bisect import bisect_left
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+from ..data import (
+    STATUS_CODES,
+    CORE_ACTIONS,
+    IMAGE_EFFECT_ACTIONS,
+    CONTEXTS,
+    PARAM_TYPES,
+    BIT_DEPTHS,
+    IMAGE_COMPONENTS,
+    FIELD_TYPES,
+    PREMULT_STATES,
+    THREAD_SAFETY,
+    CHANGE_REASONS,
+    SUITES,
+    STANDARD_CLIPS,
+    STANDARD_PARAMS,
+    GPU_PROPERTIES,
+    TYPE_IDENTIFIERS,
+    DATA_STRUCTURES,
+    EXPORTED_FUNCTIONS,
+)
+
+# Combined lookup dictionary for searching
+ALL_DEFINITIONS = {
+    "status_codes": STATUS_CODES,
+    "core_actions": CORE_ACTIONS,
+    "image_effect_actions": IMAGE_EFFECT_ACTIONS,
+    "contexts": CONTEXTS,
+    "param_types": PARAM_TYPES,
+    "bit_depths": BIT_DEPTHS,
+    "image_components": IMAGE_COMPONENTS,
+    "field_types": FIELD_TYPES,
+    "premult_states": PREMULT_STATES,
+    "thread_safety": THREAD_SAFETY,
+    "change_reasons": CHANGE_REASONS,
+    "suites": SUITES,
+    "standard_clips": STANDARD_CLIPS,
+    "standard_params": STANDARD_PARAMS,
+    "gpu_properties": GPU_PROPERTIES,
+    "type_identifiers": TYPE_IDENTIFIERS,
+    "data_structures": DATA_STRUCTURES,
+    "exported_functions": EXPORTED_FUNCTIONS,
+}
+
+
+def _name_aliases(name: str, definition: dict) -> list[str]:
+    """Return the normalized alias keys a definition can be looked up by."""
+    aliases = [name.lower()]
+    if name.startswith("kOfx"):
+        aliases.append(name[1:].lower())
+        aliases.append(name[4:].lower())
+    elif name.startswith("k"):
+        aliases.append(name[1:].lower())
+    value = definition.get("value")
+    if isinstance(value, str):
+        aliases.append(value.lower())
+    return aliases
+
+
+def _build_name_index() -> tuple[
+    list[Mapping[str, Any]],
+    dict[str, Mapping[str, Any]],
+    dict[str, Mapping[str, Any]],
+    dict[str, list[str]],
+]:
+    """
+    Build the exact-name and alias indexes.
+
+    Returns:
+        Tuple of (records, exact index, alias index, collisions). Records hold
+        every definition in category order. Collisions map an exact name or
+        alias to every canonical name that claimed it.
+    """
+    records: list[Mapping[str, Any]] = []
+    exact: dict[str, Mapping[str, Any]] = {}
+    aliases: dict[str, Mapping[str, Any]] = {}
+    claims: dict[str, list[str]] = {}
+
+    for category, definitions in ALL_DEFINITIONS.items():
+        for name, definition in definitions.items():
+            record = dict(definition)
+            record["category"] = category
+            record["name"] = name
+            view = MappingProxyType(record)
+            records.append(view)
+
+            qualified = f"{category}:{name}"
+            if name in exact:
+                claims.setdefault(name, [f"{exact[name]['category']}:{name}"]).append(qualified)
+            else:
+                exact[name] = view
+
+            for alias in dict.fromkeys(_name_aliases(name, definition)):
+                if alias in aliases:
+                    previous = aliases[alias]
+                    if previous is not view and previous["name"] != name:
+                        claims.setdefault(
+                            alias, [f"{previous['category']}:{previous['name']}"]
+                        ).append(qualified)
+                    continue
+                aliases[alias] = view
+
+    return records, exact, aliases, claims
+
+
+_RECORDS, _EXACT_INDEX, _ALIAS_INDEX, _COLLISIONS = _build_name_index()
+
+
+def find_definition(name: str) -> Optional[Mapping[str, Any]]:
+    """
+    Resolve a name against the precomputed index.
+
+    Exact names win; otherwise the case-insensitive, prefix-stripped aliases
+    ('StatOK', 'OfxStatOK') and raw string values are tried.
+
+    Args:
+        name: OFX constant name, alias or raw string value
+
+    Returns:
+        Read-only mapping with the definition plus 'category' and 'name',
+        or None if not found.
+    """
+    record = _EXACT_INDEX.get(name)
+    if record is None:
+        record = _ALIAS_INDEX.get(name.strip().lower())
+    return record
+
+
+def get_name_collisions() -> dict[str, list[str]]:
+    """Get names or aliases claimed by more than one definition."""
+    return {key: list(owners) for key, owners in _COLLISIONS.items()}
+
+
+# =============================================================================
+# Inverted token index with BM25 ranking
+# =============================================================================
+
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has if in into is it its not of ofx on "
+    "or that the this to was when which will with".split()
+)
+
+# Term weights per field; a hit in the name counts more than one in prose.
+# The last word of a name is what the definition is (the Render action in
+# kOfxImageEffectActionRender) and counts extra.
+_NAME_WEIGHT = 3
+_NAME_TAIL_WEIGHT = 3
+_VALUE_WEIGHT = 2
+_DESCRIPTION_WEIGHT = 1
+
+# Score multiplier of indexed terms a query term is only a prefix of
+# ('pixel' matching 'pixels')
+_PREFIX_WEIGHT = 0.5
+
+# Query words of at most this length are not indexed as terms (single
+# characters, '2d') and are matched as substrings of the fields instead
+_SUBSTRING_MAX_LENGTH = 2
+_SUBSTRING_SCORE = 0.1
+
+# Words in nearly every name, so not indexed; a query of nothing else
+# matches them as substrings rather than returning no results
+_SUBSTRING_FALLBACK_WORDS = frozenset({"ofx"})
+
+# BM25 parameters
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase search tokens.
+
+    Identifiers are split on camel-case boundaries, so
+    'kOfxImageEffectPropRenderWindow' yields 'ofx', 'image', 'effect',
+    'prop', 'render' and 'window'. Single characters and stopwords are dropped.
+    """
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        parts = _CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            tokens.append(word.lower())
+        for part in parts:
+            part = part.lower()
+            if len(part) > 1 and part not in _STOPWORDS:
+                tokens.append(part)
+    return tokens
+
+
+def _build_search_index() -> tuple[
+    list[Mapping[str, Any]],
+    dict[str, list[tuple[int, int]]],
+    list[int],
+    list[str],
+    list[tuple[tuple[str, int], ...]],
+]:
+    """
+    Build the inverted index used by ranked search.
+
+    Returns:
+        Tuple of (documents, postings, document lengths, sorted vocabulary,
+        lowercase field texts). Postings map a term to a list of (document
+        id, weighted term frequency).
+    """
+    postings: dict[str, list[tuple[int, int]]] = {}
+    lengths: list[int] = []
+    texts: list[tuple[tuple[str, int], ...]] = []
+
+    for doc_id, record in enumerate(_RECORDS):
+        frequencies: dict[str, int] = {}
+        fields = [
+            (record["name"], _NAME_WEIGHT),
+            (str(record.get("value") or ""), _VALUE_WEIGHT),
+            (record.get("description", ""), _DESCRIPTION_WEIGHT),
+        ]
+        for text, weight in fields:
+            for token in tokenize(text):
+                frequencies[token] = frequencies.get(token, 0) + weight
+        name_tokens = tokenize(record["name"])
+        if len(name_tokens) > 1:
+            frequencies[name_tokens[-1]] += _NAME_TAIL_WEIGHT
+
+        for term, frequency in frequencies.items():
+            postings.setdefault(term, []).append((doc_id, frequency))
+        lengths.append(sum(frequencies.values()))
+        texts.append(tuple((text.lower(), weight) for text, weight in fields))
+
+    return _RECORDS, postings, lengths, sorted(postings), texts
+
+
+_DOCUMENTS, _POSTINGS, _DOC_LENGTHS, _VOCABULARY, _DOC_TEXTS = _build_search_index()
+_DOC_IDS = {(record["category"], record["name"]): doc_id for doc_id, record in enumerate(_DOCUMENTS)}
+_AVG_DOC_LENGTH = sum(_DOC_LENGTHS) / max(len(_DOC_LENGTHS), 1)
+
+
+def _expand_term(term: str) -> list[tuple[str, float]]:
+    """
+    Return the indexed terms a query term matches, with their weights.
+
+    The term itself matches at full weight and every longer term it is a
+    prefix of at _PREFIX_WEIGHT, so plural and inflected forms are found too.
+    """
+    matches = [(term, 1.0)] if term in _POSTINGS else []
+    position = bisect_left(_VOCABULARY, term)
+    while position < len(_VOCABULARY) and _VOCABULARY[position].startswith(term):
+        if _VOCABULARY[position] != term:
+            matches.append((_VOCABULARY[position], _PREFIX_WEIGHT))
+        position += 1
+    return matches
+
+
+def search_index(
+    query: str,
+    category: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> list[tuple[float, Mapping[str, Any]]]:
+    """
+    Rank definitions against a query using BM25 over the inverted index.
+
+    A query that resolves to a definition through find_definition ranks
+    that definition first.
+
+    Args:
+        query: Free-text query or identifier
+        category: Optional category to limit results
+        limit: Maximum number of results (None for all)
+        offset: Number of top results to skip
+
+    Returns:
+        List of (score, read-only record) pairs, best first.
+
+    Raises:
+        ValueError: If limit is not positive or offset is negative.
+    """
+    if limit is not None and limit < 1:
+        raise ValueError(f"limit must be a positive number of results, got {limit}")
+    if offset < 0:
+        raise ValueError(f"offset must not be negative, got {offset}")
+
+    scores: dict[int, float] = {}
+    total = len(_DOCUMENTS)
+
+    terms = dict.fromkeys(token for token in tokenize(query) if len(token) > _SUBSTRING_MAX_LENGTH)
+    short_words = dict.fromkeys(
+        word for word in (word.lower() for word in _WORD_RE.findall(query))
+        if len(word) <= _SUBSTRING_MAX_LENGTH and word not in _STOPWORDS
+    )
+    if not terms and not short_words:
+        short_words = dict.fromkeys(
+            word for word in (word.lower() for word in _WORD_RE.findall(query))
+            if word in _SUBSTRING_FALLBACK_WORDS
+        )
+    named = find_definition(query)
+    if not terms and not short_words and named is None:
+        return []
+
+    # A query word scores each document by its best matching term, so a
+    # document is not boosted for every inflection it happens to contain
+    for token in terms:
+        best: dict[int, float] = {}
+        for term, weight in _expand_term(token):
+            entries = _POSTINGS[term]
+            idf = math.log(1 + (total - len(entries) + 0.5) / (len(entries) + 0.5))
+            for doc_id, frequency in entries:
+                norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * _DOC_LENGTHS[doc_id] / _AVG_DOC_LENGTH)
+                score = weight * idf * frequency * (_BM25_K1 + 1) / (frequency + norm)
+                if score > best.get(doc_id, 0.0):
+                    best[doc_id] = score
+        for doc_id, score in best.items():
+            scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+    # Words too short to be indexed: substring match, the best field counting
+    for word in short_words:
+        for doc_id, fields in enumerate(_DOC_TEXTS):
+            weight = max((weight for text, weight in fields if word in text), default=0)
+            if weight:
+                scores[doc_id] = scores.get(doc_id, 0.0) + _SUBSTRING_SCORE * weight
+
+    # The definition the query names (an exact name, alias or value) ranks first
+    if named is not None:
+        doc_id = _DOC_IDS[(named["category"], named["name"])]
+        scores[doc_id] = max(scores.values(), default=0.0) + 1.0
+
+    ranked = [
+        (score, _DOCUMENTS[doc_id])
+        for doc_id, score in scores.items()
+        if category is None or _DOCUMENTS[doc_id]["category"] == category
+    ]
+    ranked.sort(key=lambda item: (-item[0], item[1]["name"]))
+
+    end = None if limit is None else offset + limit
+    return ranked[offset:end]
+
+
+# =============================================================================
+# Trigram index for typo-tolerant suggestions
+# =============================================================================
+
+# Candidates re-ranked by edit distance after the trigram pre-filter
+_TRIGRAM_CANDIDATES = 8
+
+# Prefixes shared by nearly every name, stripped before indexing
+_COMMON_PREFIXES = ("kofx", "ofx")
+
+# Trigrams found in more than this fraction of the keys ("ima", "ect", ...)
+# are not walked when a query has enough rarer trigrams to find its candidates
+_COMMON_TRIGRAM_FRACTION = 1 / 16
+
+
+def _strip_prefix(key: str) -> str:
+    """Strip the 'kofx'/'ofx' prefix from a lowercase name or alias."""
+    for prefix in _COMMON_PREFIXES:
+        if key.startswith(prefix) and len(key) > len(prefix):
+            return key[len(prefix):]
+    return key
+
+
+def _trigrams(text: str) -> set[str]:
+    """Return the padded character trigrams of a lowercase string."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _build_trigram_index() -> tuple[list[str], list[str], list[frozenset[str]], dict[str, list[int]], frozenset[str]]:
+    """
+    Build the trigram index over every name alias, without the common prefix.
+
+    Returns:
+        Tuple of (keys, canonical names, key trigrams, postings, common
+        trigrams). Postings map a trigram to the ids of the keys containing
+        it; common trigrams are those posted to too many keys to be selective.
+    """
+    keys: list[str] = []
+    names: list[str] = []
+    grams: list[frozenset[str]] = []
+    postings: dict[str, list[int]] = {}
+    seen: set[str] = set()
+
+    for alias, record in _ALIAS_INDEX.items():
+        key = _strip_prefix(alias)
+        if key in seen:
+            continue
+        seen.add(key)
+        key_id = len(keys)
+        keys.append(key)
+        names.append(record["name"])
+        grams.append(frozenset(_trigrams(key)))
+        for gram in grams[-1]:
+            postings.setdefault(gram, []).append(key_id)
+
+    cutoff = max(1, int(len(keys) * _COMMON_TRIGRAM_FRACTION))
+    common = frozenset(gram for gram, ids in postings.items() if len(ids) > cutoff)
+    return keys, names, grams, postings, common
+
+
+_TRIGRAM_KEYS, _TRIGRAM_NAMES, _TRIGRAM_GRAMS, _TRIGRAM_POSTINGS, _COMMON_TRIGRAMS = _build_trigram_index()
+
+
+def bounded_edit_distance(a: str, b: str, bound: int) -> int:
+    """
+    Damerau-Levenshtein (optimal string alignment) distance with a cutoff.
+
+    Only the diagonal band of width 2 * bound + 1 is evaluated, so the cost is
+    O(len(a) * bound) rather than O(len(a) * len(b)).
+
+    Args:
+        a: First string
+        b: Second string
+        bound: Largest distance of interest
+
+    Returns:
+        The distance, or bound + 1 as soon as it is known to exceed bound.
+    """
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+
+    over = bound + 1
+    width = len(b) + 1
+    previous2: list[int] = []
+    previous = [j if j <= bound else over for j in range(width)]
+    for i in range(1, len(a) + 1):
+        current = [over] * width
+        if i <= bound:
+            current[0] = i
+        low = max(1, i - bound)
+        high = min(len(b), i + bound)
+        row_min = current[0] if low == 1 else over
+        for j in range(low, high + 1):
+            value = previous[j - 1] + (a[i - 1] != b[j - 1])
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]
+                    and previous2[j - 2] + 1 < value):
+                value = previous2[j - 2] + 1
+            current[j] = value if value < over else over
+            if value < row_min:
+                row_min = value
+        if row_min > bound:
+            return over
+        previous2, previous = previous, current
+    return min(previous[-1], over)
+
+
+def suggest_names(name: str, limit: int = 5, max_distance: Optional[int] = None) -> list[str]:
+    """
+    Suggest definition names close to a misspelled one.
+
+    Candidates sharing the most trigrams with the query are re-ranked by
+    bounded Damerau-Levenshtein distance against every alias. Names are
+    compared without their 'kOfx' prefix, and candidates are gathered from
+    the query's selective trigrams only, so a miss touches a few postings
+    rather than every alias.
+
+    Args:
+        name: The name that failed to resolve
+        limit: Maximum number of suggestions
+        max_distance: Largest edit distance to accept (default 1-3 by length)
+
+    Returns:
+        Canonical definition names, closest first.
+    """
+    query = name.strip().lower()
+    if not query:
+        return []
+    if max_distance is None:
+        max_distance = max(1, min(3, len(query) // 5))
+    query = _strip_prefix(query)
+
+    # Each edit changes at most three trigrams on either side, so a key within
+    # max_distance shares at least len(query_grams) - slack of them. When the
+    # query's common trigrams are fewer than that, every such key also shares
+    # a selective one, and walking the selective postings finds them all.
+    query_grams = _trigrams(query)
+    slack = 3 * max_distance
+    selective = query_grams - _COMMON_TRIGRAMS
+    if len(query_grams) - len(selective) >= len(query_grams) - slack:
+        selective = query_grams
+    found: set[int] = set()
+    for gram in selective:
+        found.update(_TRIGRAM_POSTINGS.get(gram, ()))
+
+    # Dice on the survivors orders the shortlist, keeping only the closest
+    # alias of each definition
+    shared = {key_id: len(query_grams & _TRIGRAM_GRAMS[key_id]) for key_id in found}
+    ranked = sorted(
+        (key_id for key_id, count in shared.items()
+         if count >= max(len(query_grams), len(_TRIGRAM_GRAMS[key_id])) - slack
+         and abs(len(_TRIGRAM_KEYS[key_id]) - len(query)) <= max_distance),
+        key=lambda key_id: -2 * shared[key_id] / (len(query_grams) + len(_TRIGRAM_GRAMS[key_id])),
+    )
+    candidates: dict[str, int] = {}
+    for key_id in ranked:
+        candidates.setdefault(_TRIGRAM_NAMES[key_id], key_id)
+        if len(candidates) == _TRIGRAM_CANDIDATES:
+            break
+
+    best: dict[str, int] = {}
+    bound = max_distance
+    for canonical, key_id in candidates.items():
+        distance = bounded_edit_distance(query, _TRIGRAM_KEYS[key_id], bound)
+        if distance > bound:
+            continue
+        best[canonical] = distance
+        if len(best) >= limit:
+            # Only suggestions at least as close as the current worst can still place
+            bound = sorted(best.values())[limit - 1]
+
+    return sorted(best, key=lambda canonical: (best[canonical], canonical))[:limit]
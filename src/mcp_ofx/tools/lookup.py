@@ -2,117 +2,112 @@
 OFX SDK lookup tools for searching and retrieving API definitions.
 """
 
-from typing import Any, Optional
+from typing import Any, Mapping, Optional
 from ..data import (
-    STATUS_CODES,
     CORE_ACTIONS,
     IMAGE_EFFECT_ACTIONS,
     CONTEXTS,
     PARAM_TYPES,
-    BIT_DEPTHS,
-    IMAGE_COMPONENTS,
-    FIELD_TYPES,
-    PREMULT_STATES,
-    THREAD_SAFETY,
-    CHANGE_REASONS,
     SUITES,
-    STANDARD_CLIPS,
-    STANDARD_PARAMS,
-    GPU_PROPERTIES,
-    TYPE_IDENTIFIERS,
-    DATA_STRUCTURES,
-    EXPORTED_FUNCTIONS,
     HOST_COMPATIBILITY,
 )
+from .index import (
+    ALL_DEFINITIONS,
+    find_definition,
+    get_name_collisions,
+    search_index,
+    suggest_names,
+)
+
 
-# Combined lookup dictionary for searching
-ALL_DEFINITIONS = {
-    "status_codes": STATUS_CODES,
-    "core_actions": CORE_ACTIONS,
-    "image_effect_actions": IMAGE_EFFECT_ACTIONS,
-    "contexts": CONTEXTS,
-    "param_types": PARAM_TYPES,
-    "bit_depths": BIT_DEPTHS,
-    "image_components": IMAGE_COMPONENTS,
-    "field_types": FIELD_TYPES,
-    "premult_states": PREMULT_STATES,
-    "thread_safety": THREAD_SAFETY,
-    "change_reasons": CHANGE_REASONS,
-    "suites": SUITES,
-    "standard_clips": STANDARD_CLIPS,
-    "standard_params": STANDARD_PARAMS,
-    "gpu_properties": GPU_PROPERTIES,
-    "type_identifiers": TYPE_IDENTIFIERS,
-    "data_structures": DATA_STRUCTURES,
-    "exported_functions": EXPORTED_FUNCTIONS,
-}
-
-
-def lookup_definition(name: str) -> Optional[dict[str, Any]]:
+def lookup_definition(name: str) -> Optional[Mapping[str, Any]]:
     """
     Look up an OFX definition by name.
 
     Args:
-        name: The OFX constant name (e.g., 'kOfxStatOK', 'kOfxActionDescribe')
+        name: The OFX constant name (e.g., 'kOfxStatOK', 'kOfxActionDescribe'),
+            a prefix-stripped alias ('StatOK') or a raw string value
+            ('OfxImageEffectActionRender'). Aliases are case-insensitive.
 
     Returns:
-        Dictionary containing the definition details, or None if not found.
-    """
-    for category, definitions in ALL_DEFINITIONS.items():
-        if name in definitions:
-            result = definitions[name].copy()
-            result["category"] = category
-            result["name"] = name
-            return result
-    return None
+        Read-only mapping containing the definition details, or None if not found.
+    """
+    return find_definition(name)
 
 
-def search_definitions(query: str, category: Optional[str] = None) -> list[dict[str, Any]]:
+def suggest_definitions(name: str, limit: int = 5) -> list[str]:
     """
-    Search for OFX definitions matching a query string.
+    Suggest definition names for a lookup that missed.
 
     Args:
-        query: Search string (case-insensitive)
-        category: Optional category to limit search
+        name: The name that was not found
+        limit: Maximum number of suggestions
 
     Returns:
-        List of matching definitions.
+        Closest definition names ("did you mean"), best first.
     """
-    results = []
-    query_lower = query.lower()
+    return suggest_names(name, limit)
 
-    categories = [category] if category else ALL_DEFINITIONS.keys()
 
-    for cat in categories:
-        if cat not in ALL_DEFINITIONS:
+def batch_lookup(
+    names: list[str],
+    categories: Optional[list[str]] = None,
+) -> dict[str, dict]:
+    """
+    Look up many OFX definitions in one pass.
+
+    Args:
+        names: Names to resolve (same forms as lookup_definition accepts)
+        categories: Optional categories a match must belong to
+
+    Returns:
+        Dictionary with a 'found' map of name to definition and a 'missing'
+        map of name to suggested names.
+    """
+    allowed = set(categories) if categories else None
+    found: dict[str, Mapping[str, Any]] = {}
+    missing: dict[str, list[str]] = {}
+
+    for name in dict.fromkeys(names):
+        record = find_definition(name)
+        if record is not None and (allowed is None or record["category"] in allowed):
+            found[name] = record
             continue
-        for name, definition in ALL_DEFINITIONS[cat].items():
-            # Search in name
-            if query_lower in name.lower():
-                result = definition.copy()
-                result["category"] = cat
-                result["name"] = name
-                results.append(result)
-                continue
-
-            # Search in description
-            if "description" in definition:
-                if query_lower in definition["description"].lower():
-                    result = definition.copy()
-                    result["category"] = cat
-                    result["name"] = name
-                    results.append(result)
-                    continue
-
-            # Search in value
-            if "value" in definition:
-                if query_lower in str(definition["value"]).lower():
-                    result = definition.copy()
-                    result["category"] = cat
-                    result["name"] = name
-                    results.append(result)
-
-    return results
+        suggestions = suggest_names(name)
+        if allowed is not None:
+            suggestions = [s for s in suggestions if find_definition(s)["category"] in allowed]
+        missing[name] = suggestions
+
+    return {"found": found, "missing": missing}
+
+
+def search_definitions(
+    query: str,
+    category: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> list[Mapping[str, Any]]:
+    """
+    Search for OFX definitions matching a query string.
+
+    Names are split on camel-case boundaries and indexed together with value
+    and description words; results are ranked with BM25. Words also match the
+    indexed words they are a prefix of, and words of one or two characters
+    are matched as substrings.
+
+    Args:
+        query: Search string (case-insensitive)
+        category: Optional category to limit search
+        limit: Maximum number of results to return (None for all)
+        offset: Number of top-ranked results to skip
+
+    Returns:
+        List of matching definitions, best match first.
+
+    Raises:
+        ValueError: If limit is not positive or offset is negative.
+    """
+    return [record for _, record in search_index(query, category, limit, offset)]
 
 
 def list_category(category: str) -> list[str]:
@@ -0,0 +1,1008 @@
+"""
+Mock OFX host that loads a compiled plugin through ctypes and profiles it.
+
+The host implements the property, image effect, parameter, memory and
+multithread suites in Python. Images and memory blocks are Python buffers
+(NumPy arrays when NumPy is installed, bytearrays otherwise). The plugin is
+driven through the action sequence of its context while every suite call is
+counted, so over-chatty generated code shows up directly in the report.
+
+Timings include the cost of the Python suite implementations; they compare
+plugins and code changes with each other, while absolute render speed is best
+measured with the generated C benchmark host.
+
+Plugins are profiled in a spawned worker process by default, so a crashing
+plugin cannot take the server down and a rebuilt binary is always reloaded.
+"""
+
+import ctypes
+import struct
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Callable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+from ..data import (
+    BIT_DEPTHS,
+    CHANGE_REASONS,
+    CONTEXTS,
+    CORE_ACTIONS,
+    FIELD_TYPES,
+    IMAGE_COMPONENTS,
+    IMAGE_EFFECT_ACTIONS,
+    PARAM_TYPES,
+    PREMULT_STATES,
+    STANDARD_CLIPS,
+    STATUS_CODES,
+    SUITES,
+    TYPE_IDENTIFIERS,
+)
+from .lookup import get_action_sequence
+
+_STATUS = {name: info["value"] for name, info in STATUS_CODES.items()}
+_STATUS_NAMES = {value: name for name, value in _STATUS.items()}
+_ACTIONS = {name: info["value"] for name, info in {**CORE_ACTIONS, **IMAGE_EFFECT_ACTIONS}.items()}
+
+# Property names the host reads or sets itself (values as in the OFX headers)
+_PROPS = {
+    "kOfxPropType": "OfxPropType",
+    "kOfxPropName": "OfxPropName",
+    "kOfxPropLabel": "OfxPropLabel",
+    "kOfxPropTime": "OfxPropTime",
+    "kOfxPropIsInteractive": "OfxPropIsInteractive",
+    "kOfxPropChangeReason": "OfxPropChangeReason",
+    "kOfxImagePropData": "OfxImagePropData",
+    "kOfxImagePropBounds": "OfxImagePropBounds",
+    "kOfxImagePropRegionOfDefinition": "OfxImagePropRegionOfDefinition",
+    "kOfxImagePropRowBytes": "OfxImagePropRowBytes",
+    "kOfxImagePropField": "OfxImagePropField",
+    "kOfxImagePropUniqueIdentifier": "OfxImagePropUniqueIdentifier",
+    "kOfxImagePropPixelAspectRatio": "OfxImagePropPixelAspectRatio",
+    "kOfxImageClipPropConnected": "OfxImageClipPropConnected",
+    "kOfxImageClipPropFieldOrder": "OfxImageClipPropFieldOrder",
+    "kOfxImageEffectPropContext": "OfxImageEffectPropContext",
+    "kOfxImageEffectPropPixelDepth": "OfxImageEffectPropPixelDepth",
+    "kOfxImageEffectPropComponents": "OfxImageEffectPropComponents",
+    "kOfxImageEffectPropPreMultiplication": "OfxImageEffectPropPreMultiplication",
+    "kOfxImageEffectPropRenderScale": "OfxImageEffectPropRenderScale",
+    "kOfxImageEffectPropRenderWindow": "OfxImageEffectPropRenderWindow",
+    "kOfxImageEffectPropFieldToRender": "OfxImageEffectPropFieldToRender",
+    "kOfxImageEffectPropFrameRange": "OfxImageEffectPropFrameRange",
+    "kOfxImageEffectPropFrameStep": "OfxImageEffectPropFrameStep",
+    "kOfxImageEffectPropFrameRate": "OfxImageEffectPropFrameRate",
+    "kOfxImageEffectPropProjectSize": "OfxImageEffectPropProjectSize",
+    "kOfxImageEffectPropRegionOfInterest": "OfxImageEffectPropRegionOfInterest",
+    "kOfxImageEffectPropSequentialRenderStatus": "OfxImageEffectPropSequentialRenderStatus",
+    "kOfxImageEffectPropInteractiveRenderStatus": "OfxImageEffectPropInteractiveRenderStatus",
+    "kOfxImageEffectPropSupportedContexts": "OfxImageEffectPropSupportedContexts",
+    "kOfxImageEffectPropSupportedPixelDepths": "OfxImageEffectPropSupportedPixelDepths",
+    "kOfxImageEffectPropSupportedComponents": "OfxImageEffectPropSupportedComponents",
+    "kOfxImageEffectPropSupportsTiles": "OfxImageEffectPropSupportsTiles",
+    "kOfxImageEffectPropSupportsMultiResolution": "OfxImageEffectPropSupportsMultiResolution",
+    "kOfxImageEffectPropTemporalClipAccess": "OfxImageEffectPropTemporalClipAccess",
+    "kOfxImageEffectHostPropIsBackground": "OfxImageEffectHostPropIsBackground",
+    "kOfxParamPropType": "OfxParamPropType",
+    "kOfxParamPropDefault": "OfxParamPropDefault",
+}
+
+# Sample value written to every component of the synthetic source images
+_SOURCE_SAMPLES = {
+    "kOfxBitDepthByte": struct.pack("<B", 128),
+    "kOfxBitDepthShort": struct.pack("<H", 32768),
+    "kOfxBitDepthHalf": struct.pack("<H", 0x3800),
+    "kOfxBitDepthFloat": struct.pack("<f", 0.5),
+}
+
+# Byte the output image is filled with before each render, to count bytes written
+_OUTPUT_SENTINEL = 0xA5
+
+_Status = ctypes.c_int
+_Function = ctypes.CFUNCTYPE
+_p = ctypes.c_void_p
+_s = ctypes.c_char_p
+_i = ctypes.c_int
+_d = ctypes.c_double
+
+
+class OfxRectD(ctypes.Structure):
+    _fields_ = [("x1", _d), ("y1", _d), ("x2", _d), ("y2", _d)]
+
+
+class OfxHost(ctypes.Structure):
+    _fields_ = [("host", _p), ("fetchSuite", _Function(_p, _p, _s, _i))]
+
+
+_PluginEntryPoint = _Function(_Status, _s, _p, _p, _p)
+
+
+class OfxPlugin(ctypes.Structure):
+    _fields_ = [
+        ("pluginApi", _s),
+        ("apiVersion", _i),
+        ("pluginIdentifier", _s),
+        ("pluginVersionMajor", ctypes.c_uint),
+        ("pluginVersionMinor", ctypes.c_uint),
+        ("setHost", _Function(None, ctypes.POINTER(OfxHost))),
+        ("mainEntry", _PluginEntryPoint),
+    ]
+
+
+_ThreadFunction = _Function(None, ctypes.c_uint, ctypes.c_uint, _p)
+
+# Suite function prototypes in struct order. The parameter suite's variadic
+# value functions are declared with four pointer-sized and four double
+# arguments: on the x86-64 and AArch64 Linux calling conventions the variadic
+# int/pointer and double arguments land in exactly those registers.
+_SUITE_LAYOUTS = {
+    "kOfxPropertySuite": (
+        ("propSetPointer", _Function(_Status, _p, _s, _i, _p)),
+        ("propSetString", _Function(_Status, _p, _s, _i, _s)),
+        ("propSetDouble", _Function(_Status, _p, _s, _i, _d)),
+        ("propSetInt", _Function(_Status, _p, _s, _i, _i)),
+        ("propSetPointerN", _Function(_Status, _p, _s, _i, _p)),
+        ("propSetStringN", _Function(_Status, _p, _s, _i, _p)),
+        ("propSetDoubleN", _Function(_Status, _p, _s, _i, _p)),
+        ("propSetIntN", _Function(_Status, _p, _s, _i, _p)),
+        ("propGetPointer", _Function(_Status, _p, _s, _i, _p)),
+        ("propGetString", _Function(_Status, _p, _s, _i, _p)),
+        ("propGetDouble", _Function(_Status, _p, _s, _i, _p)),
+        ("propGetInt", _Function(_Status, _p, _s, _i, _p)),
+        ("propGetPointerN", _Function(_Status, _p, _s, _i, _p)),
+        ("propGetStringN", _Function(_Status, _p, _s, _i, _p)),
+        ("propGetDoubleN", _Function(_Status, _p, _s, _i, _p)),
+        ("propGetIntN", _Function(_Status, _p, _s, _i, _p)),
+        ("propReset", _Function(_Status, _p, _s)),
+        ("propGetDimension", _Function(_Status, _p, _s, _p)),
+    ),
+    "kOfxImageEffectSuite": (
+        ("getPropertySet", _Function(_Status, _p, _p)),
+        ("getParamSet", _Function(_Status, _p, _p)),
+        ("clipDefine", _Function(_Status, _p, _s, _p)),
+        ("clipGetHandle", _Function(_Status, _p, _s, _p, _p)),
+        ("clipGetPropertySet", _Function(_Status, _p, _p)),
+        ("clipGetImage", _Function(_Status, _p, _d, _p, _p)),
+        ("clipReleaseImage", _Function(_Status, _p)),
+        ("clipGetRegionOfDefinition", _Function(_Status, _p, _d, _p)),
+        ("abort", _Function(_i, _p)),
+        ("imageMemoryAlloc", _Function(_Status, _p, ctypes.c_size_t, _p)),
+        ("imageMemoryFree", _Function(_Status, _p)),
+        ("imageMemoryLock", _Function(_Status, _p, _p)),
+        ("imageMemoryUnlock", _Function(_Status, _p)),
+    ),
+    "kOfxParameterSuite": (
+        ("paramDefine", _Function(_Status, _p, _s, _s, _p)),
+        ("paramGetHandle", _Function(_Status, _p, _s, _p, _p)),
+        ("paramSetGetPropertySet", _Function(_Status, _p, _p)),
+        ("paramGetPropertySet", _Function(_Status, _p, _p)),
+        ("paramGetValue", _Function(_Status, _p, _p, _p, _p, _p)),
+        ("paramGetValueAtTime", _Function(_Status, _p, _d, _p, _p, _p, _p)),
+        ("paramGetDerivative", _Function(_Status, _p, _d, _p, _p, _p, _p)),
+        ("paramGetIntegral", _Function(_Status, _p, _d, _d, _p, _p, _p, _p)),
+        ("paramSetValue", _Function(_Status, _p, _p, _p, _p, _p, _d, _d, _d, _d)),
+        ("paramSetValueAtTime", _Function(_Status, _p, _d, _p, _p, _p, _p, _d, _d, _d, _d)),
+        ("paramGetNumKeys", _Function(_Status, _p, _p)),
+        ("paramGetKeyTime", _Function(_Status, _p, ctypes.c_uint, _p)),
+        ("paramGetKeyIndex", _Function(_Status, _p, _d, _i, _p)),
+        ("paramDeleteKey", _Function(_Status, _p, _d)),
+        ("paramDeleteAllKeys", _Function(_Status, _p)),
+        ("paramCopy", _Function(_Status, _p, _p, _d, _p)),
+        ("paramEditBegin", _Function(_Status, _p, _s)),
+        ("paramEditEnd", _Function(_Status, _p)),
+    ),
+    "kOfxMemorySuite": (
+        ("memoryAlloc", _Function(_Status, _p, ctypes.c_size_t, _p)),
+        ("memoryFree", _Function(_Status, _p)),
+    ),
+    "kOfxMultiThreadSuite": (
+        ("multiThread", _Function(_Status, _p, ctypes.c_uint, _p)),
+        ("multiThreadNumCPUs", _Function(_Status, _p)),
+        ("multiThreadIndex", _Function(_Status, _p)),
+        ("multiThreadIsSpawnedThread", _Function(_i)),
+        ("mutexCreate", _Function(_Status, _p, _i)),
+        ("mutexDestroy", _Function(_Status, _p)),
+        ("mutexLock", _Function(_Status, _p)),
+        ("mutexUnLock", _Function(_Status, _p)),
+        ("mutexTryLock", _Function(_Status, _p)),
+    ),
+}
+
+
+class _StatusError(Exception):
+    """Raised inside a suite function to return an OFX status."""
+
+    def __init__(self, status: str):
+        super().__init__(status)
+        self.status = _STATUS[status]
+
+
+def _store(address: Optional[int], ctype: Any, value: Any, index: int = 0) -> None:
+    """Write value through a plugin-supplied pointer."""
+    if not address:
+        raise _StatusError("kOfxStatErrValue")
+    ctypes.cast(address, ctypes.POINTER(ctype))[index] = value
+
+
+def _load(address: Optional[int], ctype: Any, index: int = 0) -> Any:
+    """Read a value through a plugin-supplied pointer."""
+    if not address:
+        raise _StatusError("kOfxStatErrValue")
+    return ctypes.cast(address, ctypes.POINTER(ctype))[index]
+
+
+def _decode(value: Optional[bytes]) -> str:
+    return value.decode("utf-8") if value is not None else ""
+
+
+class _Buffer:
+    """Fixed-size byte buffer with a stable address."""
+
+    def __init__(self, size: int, fill: bytes = b"\0"):
+        self.size = size
+        if np is not None:
+            self.data = np.empty(size, dtype=np.uint8)
+            self.address = self.data.ctypes.data
+        else:
+            self.data = bytearray(size)
+            self.address = ctypes.addressof((ctypes.c_char * max(size, 1)).from_buffer(self.data))
+        self.fill(fill)
+
+    def fill(self, pattern: bytes) -> None:
+        """Fill the buffer with a repeated byte pattern."""
+        repeats, remainder = divmod(self.size, len(pattern))
+        if np is not None:
+            self.data[:] = np.frombuffer(pattern * repeats + pattern[:remainder], dtype=np.uint8)
+        else:
+            self.data[:] = pattern * repeats + pattern[:remainder]
+
+    def count_not_equal(self, value: int) -> int:
+        """Count the bytes that differ from value."""
+        if np is not None:
+            return int(np.count_nonzero(self.data != value))
+        return self.size - self.data.count(value)
+
+
+class _PropertySet:
+    """Named, typed property values; strings are kept as C buffers."""
+
+    def __init__(self):
+        self.props: dict[str, tuple[str, list]] = {}
+
+    def set(self, name: str, kind: str, index: int, value: Any) -> None:
+        current = self.props.get(name)
+        if current is None or current[0] != kind:
+            current = (kind, [])
+            self.props[name] = current
+        values = current[1]
+        if kind == "string":
+            value = ctypes.create_string_buffer(value)
+        if index < 0:
+            raise _StatusError("kOfxStatErrBadIndex")
+        values.extend([None] * (index + 1 - len(values)))
+        values[index] = value
+
+    def set_values(self, name: str, kind: str, values: list) -> None:
+        for index in reversed(range(len(values))):
+            self.set(name, kind, index, values[index])
+
+    def get(self, name: str, kind: str, index: int) -> Any:
+        current = self.props.get(name)
+        if current is None:
+            raise _StatusError("kOfxStatErrUnknown")
+        if index < 0 or index >= len(current[1]):
+            raise _StatusError("kOfxStatErrBadIndex")
+        value = current[1][index]
+        if kind in ("int", "double") and current[0] in ("int", "double"):
+            return int(value or 0) if kind == "int" else float(value or 0)
+        if current[0] != kind:
+            raise _StatusError("kOfxStatErrValue")
+        return value
+
+
+class _Clip:
+    def __init__(self, name: str):
+        self.name = name
+        self.props = _PropertySet()
+        self.props.set(_PROPS["kOfxPropType"], "string", 0, TYPE_IDENTIFIERS["kOfxTypeClip"]["value"].encode())
+        self.props.set(_PROPS["kOfxPropName"], "string", 0, name.encode())
+        self.buffer: Optional[_Buffer] = None
+        self.row_bytes = 0
+
+
+class _Param:
+    def __init__(self, param_type: str, name: str):
+        self.type = param_type
+        self.name = name
+        self.props = _PropertySet()
+        self.props.set(_PROPS["kOfxPropType"], "string", 0, TYPE_IDENTIFIERS["kOfxTypeParameter"]["value"].encode())
+        self.props.set(_PROPS["kOfxPropName"], "string", 0, name.encode())
+        self.props.set(_PROPS["kOfxParamPropType"], "string", 0, param_type.encode())
+        self.is_string = param_type in (PARAM_TYPES["kOfxParamTypeString"]["value"],
+                                        PARAM_TYPES["kOfxParamTypeStrChoice"]["value"])
+        self.is_integer = param_type.startswith(PARAM_TYPES["kOfxParamTypeInteger"]["value"]) or param_type in (
+            PARAM_TYPES["kOfxParamTypeBoolean"]["value"], PARAM_TYPES["kOfxParamTypeChoice"]["value"])
+        if param_type.endswith("2D"):
+            self.dimension = 2
+        elif param_type.endswith("3D") or param_type == PARAM_TYPES["kOfxParamTypeRGB"]["value"]:
+            self.dimension = 3
+        elif param_type == PARAM_TYPES["kOfxParamTypeRGBA"]["value"]:
+            self.dimension = 4
+        else:
+            self.dimension = 1
+        self.values = [0.0] * self.dimension
+        self.string = ctypes.create_string_buffer(b"")
+
+
+class _Mutex:
+    def __init__(self, lock_count: int):
+        self.lock = threading.RLock()
+        for _ in range(lock_count):
+            self.lock.acquire()
+
+
+class _Effect:
+    def __init__(self):
+        self.props = _PropertySet()
+        self.props.set(_PROPS["kOfxPropType"], "string", 0, TYPE_IDENTIFIERS["kOfxTypeImageEffect"]["value"].encode())
+        self.param_props = _PropertySet()
+        self.clips: dict[str, _Clip] = {}
+        self.params: dict[str, _Param] = {}
+
+
+class MockHost:
+    """
+    In-process OFX host backed by Python buffers.
+
+    Every suite function is a ctypes callback that counts its calls in the
+    counter of the action being profiled.
+    """
+
+    def __init__(
+        self,
+        context: str = "kOfxImageEffectContextFilter",
+        width: int = 640,
+        height: int = 360,
+        bit_depth: str = "kOfxBitDepthFloat",
+        components: str = "kOfxImageComponentRGBA",
+        threads: int = 1,
+        param_values: Optional[dict[str, Any]] = None,
+    ):
+        self.context = context
+        self.width = width
+        self.height = height
+        self.bit_depth = bit_depth
+        self.components = components
+        self.num_components = IMAGE_COMPONENTS[components]["num_components"]
+        self.pixel_bytes = BIT_DEPTHS[bit_depth]["bytes_per_component"] * self.num_components
+        self.threads = max(1, int(threads))
+        self.param_values = dict(param_values or {})
+
+        self.suite_calls: Counter = Counter()
+        self.bytes = Counter()
+        self.errors: list[str] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._handles: dict[int, Any] = {}
+        self._next_handle = 0x1000
+
+        self.host_props = _PropertySet()
+        self._describe_host()
+        self.descriptor = _Effect()
+        self.instance: Optional[_Effect] = None
+
+        self._suites = {}
+        self._callbacks = []
+        for suite, layout in _SUITE_LAYOUTS.items():
+            fields = [(name, prototype) for name, prototype in layout]
+            struct_type = type(SUITES[suite]["struct"], (ctypes.Structure,), {"_fields_": fields})
+            functions = [self._wrap(name, prototype, getattr(self, "_" + name)) for name, prototype in layout]
+            self._callbacks.extend(functions)
+            self._suites[(SUITES[suite]["value"], SUITES[suite]["version"])] = struct_type(*functions)
+
+        self._fetch_suite = OfxHost._fields_[1][1](self._fetchSuite)
+        self.host = OfxHost(self.handle(self.host_props), self._fetch_suite)
+
+    # Handles -------------------------------------------------------------
+
+    def handle(self, obj: Any) -> int:
+        """Get the opaque handle the plugin sees for a host object."""
+        key = getattr(obj, "_handle", None)
+        if key is None:
+            key = self._next_handle
+            self._next_handle += 16
+            self._handles[key] = obj
+            obj._handle = key
+        return key
+
+    def _object(self, handle: Optional[int], kind: type) -> Any:
+        obj = self._handles.get(handle or 0)
+        if not isinstance(obj, kind):
+            raise _StatusError("kOfxStatErrBadHandle")
+        return obj
+
+    def _release(self, obj: Any) -> None:
+        self._handles.pop(getattr(obj, "_handle", None), None)
+
+    def _wrap(self, name: str, prototype: Any, function: Callable) -> Any:
+        """Make a counting ctypes callback that maps exceptions to statuses."""
+        def call(*args):
+            with self._lock:
+                self.suite_calls[name] += 1
+            try:
+                result = function(*args)
+            except _StatusError as e:
+                return e.status
+            except Exception as e:
+                self.errors.append(f"{name}: {e!r}")
+                return _STATUS["kOfxStatErrUnknown"]
+            return _STATUS["kOfxStatOK"] if result is None else result
+        return prototype(call)
+
+    def _describe_host(self) -> None:
+        props = self.host_props
+        props.set(_PROPS["kOfxPropName"], "string", 0, b"mcp_ofx.mock_host")
+        props.set(_PROPS["kOfxPropLabel"], "string", 0, b"MCP OFX Mock Host")
+        props.set(_PROPS["kOfxImageEffectHostPropIsBackground"], "int", 0, 1)
+        props.set(_PROPS["kOfxImageEffectPropSupportsTiles"], "int", 0, 1)
+        props.set(_PROPS["kOfxImageEffectPropSupportsMultiResolution"], "int", 0, 1)
+        props.set(_PROPS["kOfxImageEffectPropTemporalClipAccess"], "int", 0, 1)
+        props.set(_PROPS["kOfxImageEffectPropSupportedContexts"], "string", 0, CONTEXTS[self.context]["value"].encode())
+        props.set(_PROPS["kOfxImageEffectPropSupportedPixelDepths"], "string", 0,
+                  BIT_DEPTHS[self.bit_depth]["value"].encode())
+        props.set(_PROPS["kOfxImageEffectPropSupportedComponents"], "string", 0,
+                  IMAGE_COMPONENTS[self.components]["value"].encode())
+
+    def _fetchSuite(self, host: Optional[int], name: Optional[bytes], version: int) -> Optional[int]:
+        with self._lock:
+            self.suite_calls["fetchSuite"] += 1
+        suite = self._suites.get((_decode(name), version))
+        return ctypes.addressof(suite) if suite is not None else None
+
+    # Property suite ------------------------------------------------------
+
+    def _props(self, handle: Optional[int]) -> _PropertySet:
+        return self._object(handle, _PropertySet)
+
+    def _propSetPointer(self, props, name, index, value):
+        self._props(props).set(_decode(name), "pointer", index, value or 0)
+
+    def _propSetString(self, props, name, index, value):
+        self._props(props).set(_decode(name), "string", index, value or b"")
+
+    def _propSetDouble(self, props, name, index, value):
+        self._props(props).set(_decode(name), "double", index, value)
+
+    def _propSetInt(self, props, name, index, value):
+        self._props(props).set(_decode(name), "int", index, value)
+
+    def _propSetPointerN(self, props, name, count, values):
+        self._props(props).set_values(_decode(name), "pointer", [_load(values, _p, i) or 0 for i in range(count)])
+
+    def _propSetStringN(self, props, name, count, values):
+        self._props(props).set_values(_decode(name), "string", [_load(values, _s, i) or b"" for i in range(count)])
+
+    def _propSetDoubleN(self, props, name, count, values):
+        self._props(props).set_values(_decode(name), "double", [_load(values, _d, i) for i in range(count)])
+
+    def _propSetIntN(self, props, name, count, values):
+        self._props(props).set_values(_decode(name), "int", [_load(values, _i, i) for i in range(count)])
+
+    def _propGetPointer(self, props, name, index, value):
+        _store(value, _p, self._props(props).get(_decode(name), "pointer", index))
+
+    def _propGetString(self, props, name, index, value):
+        _store(value, _p, ctypes.addressof(self._props(props).get(_decode(name), "string", index)))
+
+    def _propGetDouble(self, props, name, index, value):
+        _store(value, _d, self._props(props).get(_decode(name), "double", index))
+
+    def _propGetInt(self, props, name, index, value):
+        _store(value, _i, self._props(props).get(_decode(name), "int", index))
+
+    def _propGetPointerN(self, props, name, count, values):
+        for index in range(count):
+            self._propGetPointer(props, name, index, values + index * ctypes.sizeof(_p) if values else None)
+
+    def _propGetStringN(self, props, name, count, values):
+        for index in range(count):
+            self._propGetString(props, name, index, values + index * ctypes.sizeof(_p) if values else None)
+
+    def _propGetDoubleN(self, props, name, count, values):
+        for index in range(count):
+            self._propGetDouble(props, name, index, values + index * ctypes.sizeof(_d) if values else None)
+
+    def _propGetIntN(self, props, name, count, values):
+        for index in range(count):
+            self._propGetInt(props, name, index, values + index * ctypes.sizeof(_i) if values else None)
+
+    def _propReset(self, props, name):
+        current = self._props(props).props.get(_decode(name))
+        if current is None:
+            raise _StatusError("kOfxStatErrUnknown")
+        current[1].clear()
+
+    def _propGetDimension(self, props, name, count):
+        current = self._props(props).props.get(_decode(name))
+        if current is None:
+            raise _StatusError("kOfxStatErrUnknown")
+        _store(count, _i, len(current[1]))
+
+    # Image effect suite --------------------------------------------------
+
+    def _getPropertySet(self, effect, props):
+        _store(props, _p, self.handle(self._object(effect, _Effect).props))
+
+    def _getParamSet(self, effect, param_set):
+        _store(param_set, _p, self.handle(self._object(effect, _Effect)))
+
+    def _clipDefine(self, effect, name, props):
+        effect = self._object(effect, _Effect)
+        clip = effect.clips.setdefault(_decode(name), _Clip(_decode(name)))
+        if props:
+            _store(props, _p, self.handle(clip.props))
+
+    def _clipGetHandle(self, effect, name, clip, props):
+        found = self._object(effect, _Effect).clips.get(_decode(name))
+        if found is None:
+            raise _StatusError("kOfxStatErrBadHandle")
+        _store(clip, _p, self.handle(found))
+        if props:
+            _store(props, _p, self.handle(found.props))
+
+    def _clipGetPropertySet(self, clip, props):
+        _store(props, _p, self.handle(self._object(clip, _Clip).props))
+
+    def _clipGetImage(self, clip, time_, region, image):
+        clip = self._object(clip, _Clip)
+        if clip.buffer is None:
+            raise _StatusError("kOfxStatFailed")
+        bounds = [0, 0, self.width, self.height]
+        props = _PropertySet()
+        props.set(_PROPS["kOfxPropType"], "string", 0, TYPE_IDENTIFIERS["kOfxTypeImage"]["value"].encode())
+        props.set(_PROPS["kOfxImagePropData"], "pointer", 0, clip.buffer.address)
+        props.set(_PROPS["kOfxImagePropRowBytes"], "int", 0, clip.row_bytes)
+        props.set_values(_PROPS["kOfxImagePropBounds"], "int", bounds)
+        props.set_values(_PROPS["kOfxImagePropRegionOfDefinition"], "int", bounds)
+        for name in ("kOfxImageEffectPropPixelDepth", "kOfxImageEffectPropComponents",
+                     "kOfxImageEffectPropPreMultiplication"):
+            props.set(_PROPS[name], "string", 0, clip.props.get(_PROPS[name], "string", 0).value)
+        props.set(_PROPS["kOfxImagePropField"], "string", 0, FIELD_TYPES["kOfxImageFieldNone"]["value"].encode())
+        props.set(_PROPS["kOfxImagePropUniqueIdentifier"], "string", 0, f"{clip.name}@{time_:g}".encode())
+        props.set(_PROPS["kOfxImagePropPixelAspectRatio"], "double", 0, 1.0)
+        props.set_values(_PROPS["kOfxImageEffectPropRenderScale"], "double", [1.0, 1.0])
+        with self._lock:
+            self.bytes["image_bytes"] += clip.buffer.size
+        _store(image, _p, self.handle(props))
+
+    def _clipReleaseImage(self, image):
+        self._release(self._props(image))
+
+    def _clipGetRegionOfDefinition(self, clip, time_, bounds):
+        self._object(clip, _Clip)
+        _store(bounds, OfxRectD, OfxRectD(0.0, 0.0, float(self.width), float(self.height)))
+
+    def _abort(self, effect):
+        return 0
+
+    def _imageMemoryAlloc(self, effect, size, memory):
+        with self._lock:
+            self.bytes["memory_bytes"] += size
+        _store(memory, _p, self.handle(_Buffer(size)))
+
+    def _imageMemoryFree(self, memory):
+        self._release(self._object(memory, _Buffer))
+
+    def _imageMemoryLock(self, memory, data):
+        _store(data, _p, self._object(memory, _Buffer).address)
+
+    def _imageMemoryUnlock(self, memory):
+        self._object(memory, _Buffer)
+
+    # Parameter suite -----------------------------------------------------
+
+    def _paramDefine(self, param_set, param_type, name, props):
+        effect = self._object(param_set, _Effect)
+        if _decode(name) in effect.params:
+            raise _StatusError("kOfxStatErrExists")
+        param = _Param(_decode(param_type), _decode(name))
+        effect.params[param.name] = param
+        if props:
+            _store(props, _p, self.handle(param.props))
+
+    def _paramGetHandle(self, param_set, name, param, props):
+        found = self._object(param_set, _Effect).params.get(_decode(name))
+        if found is None:
+            raise _StatusError("kOfxStatErrUnknown")
+        _store(param, _p, self.handle(found))
+        if props:
+            _store(props, _p, self.handle(found.props))
+
+    def _paramSetGetPropertySet(self, param_set, props):
+        _store(props, _p, self.handle(self._object(param_set, _Effect).param_props))
+
+    def _paramGetPropertySet(self, param, props):
+        _store(props, _p, self.handle(self._object(param, _Param).props))
+
+    def _read_param(self, param, pointers):
+        param = self._object(param, _Param)
+        if param.is_string:
+            _store(pointers[0], _p, ctypes.addressof(param.string))
+            return
+        for index in range(param.dimension):
+            if param.is_integer:
+                _store(pointers[index], _i, int(param.values[index]))
+            else:
+                _store(pointers[index], _d, param.values[index])
+
+    def _write_param(self, param, pointers, doubles):
+        param = self._object(param, _Param)
+        if param.is_string:
+            param.string = ctypes.create_string_buffer(ctypes.string_at(pointers[0]) if pointers[0] else b"")
+            return
+        for index in range(param.dimension):
+            if param.is_integer:
+                param.values[index] = ctypes.c_int((pointers[index] or 0) & 0xFFFFFFFF).value
+            else:
+                param.values[index] = doubles[index]
+
+    def _paramGetValue(self, param, *pointers):
+        self._read_param(param, pointers)
+
+    def _paramGetValueAtTime(self, param, time_, *pointers):
+        self._read_param(param, pointers)
+
+    def _paramGetDerivative(self, param, time_, *pointers):
+        param = self._object(param, _Param)
+        for index in range(0 if param.is_string else param.dimension):
+            _store(pointers[index], _d, 0.0)
+
+    def _paramGetIntegral(self, param, time1, time2, *pointers):
+        param = self._object(param, _Param)
+        for index in range(0 if param.is_string else param.dimension):
+            _store(pointers[index], _d, param.values[index] * (time2 - time1))
+
+    def _paramSetValue(self, param, a, b, c, d, x, y, z, w):
+        self._write_param(param, (a, b, c, d), (x, y, z, w))
+
+    def _paramSetValueAtTime(self, param, time_, a, b, c, d, x, y, z, w):
+        self._write_param(param, (a, b, c, d), (x, y, z, w))
+
+    def _paramGetNumKeys(self, param, count):
+        self._object(param, _Param)
+        _store(count, ctypes.c_uint, 0)
+
+    def _paramGetKeyTime(self, param, nth_key, time_):
+        raise _StatusError("kOfxStatErrBadIndex")
+
+    def _paramGetKeyIndex(self, param, time_, direction, index):
+        raise _StatusError("kOfxStatFailed")
+
+    def _paramDeleteKey(self, param, time_):
+        raise _StatusError("kOfxStatErrBadIndex")
+
+    def _paramDeleteAllKeys(self, param):
+        self._object(param, _Param)
+
+    def _paramCopy(self, param_to, param_from, offset, frame_range):
+        self._object(param_to, _Param).values = list(self._object(param_from, _Param).values)
+
+    def _paramEditBegin(self, param_set, name):
+        self._object(param_set, _Effect)
+
+    def _paramEditEnd(self, param_set):
+        self._object(param_set, _Effect)
+
+    # Memory suite --------------------------------------------------------
+
+    def _memoryAlloc(self, handle, size, data):
+        buffer = _Buffer(size)
+        with self._lock:
+            self.bytes["memory_bytes"] += size
+            self._handles[buffer.address] = buffer
+        _store(data, _p, buffer.address)
+
+    def _memoryFree(self, data):
+        with self._lock:
+            buffer = self._handles.pop(data or 0, None)
+        if not isinstance(buffer, _Buffer):
+            raise _StatusError("kOfxStatErrBadHandle")
+
+    # Multithread suite ---------------------------------------------------
+
+    def _multiThread(self, function, count, argument):
+        function = _ThreadFunction(function)
+        count = max(1, count)
+
+        def run(index):
+            self._local.index = index
+            self._local.spawned = True
+            function(index, count, argument)
+
+        workers = [threading.Thread(target=run, args=(index,)) for index in range(1, count)]
+        for worker in workers:
+            worker.start()
+        saved = getattr(self._local, "index", 0), getattr(self._local, "spawned", False)
+        try:
+            run(0)
+        finally:
+            self._local.index, self._local.spawned = saved
+            for worker in workers:
+                worker.join()
+
+    def _multiThreadNumCPUs(self, count):
+        _store(count, ctypes.c_uint, self.threads)
+
+    def _multiThreadIndex(self, index):
+        _store(index, ctypes.c_uint, getattr(self._local, "index", 0))
+
+    def _multiThreadIsSpawnedThread(self):
+        return int(getattr(self._local, "spawned", False))
+
+    def _mutexCreate(self, mutex, lock_count):
+        _store(mutex, _p, self.handle(_Mutex(lock_count)))
+
+    def _mutexDestroy(self, mutex):
+        self._release(self._object(mutex, _Mutex))
+
+    def _mutexLock(self, mutex):
+        self._object(mutex, _Mutex).lock.acquire()
+
+    def _mutexUnLock(self, mutex):
+        self._object(mutex, _Mutex).lock.release()
+
+    def _mutexTryLock(self, mutex):
+        if not self._object(mutex, _Mutex).lock.acquire(blocking=False):
+            raise _StatusError("kOfxStatFailed")
+
+    # Effect instances ----------------------------------------------------
+
+    def create_instance(self) -> _Effect:
+        """Create an instance from the descriptor with synthetic clip images."""
+        instance = _Effect()
+        instance.props.set(_PROPS["kOfxImageEffectPropContext"], "string", 0, CONTEXTS[self.context]["value"].encode())
+        instance.props.set_values(_PROPS["kOfxImageEffectPropProjectSize"], "double",
+                                  [float(self.width), float(self.height)])
+        instance.props.set(_PROPS["kOfxImageEffectPropFrameRate"], "double", 0, 24.0)
+
+        output_name = STANDARD_CLIPS["kOfxImageEffectOutputClipName"]["value"]
+        depth = BIT_DEPTHS[self.bit_depth]["value"].encode()
+        components = IMAGE_COMPONENTS[self.components]["value"].encode()
+        premult = PREMULT_STATES["kOfxImagePreMultiplied" if self.num_components == 4 else "kOfxImageOpaque"]
+        for name in self.descriptor.clips:
+            clip = _Clip(name)
+            clip.props.set(_PROPS["kOfxImageEffectPropPixelDepth"], "string", 0, depth)
+            clip.props.set(_PROPS["kOfxImageEffectPropComponents"], "string", 0, components)
+            clip.props.set(_PROPS["kOfxImageEffectPropPreMultiplication"], "string", 0, premult["value"].encode())
+            clip.props.set(_PROPS["kOfxImageClipPropFieldOrder"], "string", 0,
+                           FIELD_TYPES["kOfxImageFieldNone"]["value"].encode())
+            clip.props.set(_PROPS["kOfxImageClipPropConnected"], "int", 0, 1)
+            clip.props.set(_PROPS["kOfxImagePropPixelAspectRatio"], "double", 0, 1.0)
+            clip.row_bytes = self.width * self.pixel_bytes
+            if name == output_name:
+                clip.buffer = _Buffer(clip.row_bytes * self.height, bytes([_OUTPUT_SENTINEL]))
+            else:
+                clip.buffer = _Buffer(clip.row_bytes * self.height, _SOURCE_SAMPLES[self.bit_depth])
+            instance.clips[name] = clip
+
+        for name, described in self.descriptor.params.items():
+            param = _Param(described.type, name)
+            for index in range(param.dimension):
+                try:
+                    param.values[index] = described.props.get(_PROPS["kOfxParamPropDefault"], "double", index)
+                except _StatusError:
+                    pass
+            value = self.param_values.get(name)
+            if value is not None:
+                values = value if isinstance(value, (list, tuple)) else [value]
+                param.values[:len(values)] = [float(v) for v in values[:param.dimension]]
+            instance.params[name] = param
+        self.instance = instance
+        return instance
+
+    def action_args(self, action: str, frames: int) -> tuple[_PropertySet, _PropertySet]:
+        """Build the inArgs/outArgs a host passes with an action."""
+        in_args, out_args = _PropertySet(), _PropertySet()
+        if action == "kOfxImageEffectActionDescribeInContext":
+            in_args.set(_PROPS["kOfxImageEffectPropContext"], "string", 0, CONTEXTS[self.context]["value"].encode())
+            return in_args, out_args
+        in_args.set(_PROPS["kOfxPropTime"], "double", 0, 0.0)
+        in_args.set_values(_PROPS["kOfxImageEffectPropRenderScale"], "double", [1.0, 1.0])
+        if action in ("kOfxImageEffectActionRender", "kOfxImageEffectActionIsIdentity"):
+            in_args.set(_PROPS["kOfxImageEffectPropFieldToRender"], "string", 0,
+                        FIELD_TYPES["kOfxImageFieldNone"]["value"].encode())
+            in_args.set_values(_PROPS["kOfxImageEffectPropRenderWindow"], "int", [0, 0, self.width, self.height])
+            in_args.set(_PROPS["kOfxImageEffectPropSequentialRenderStatus"], "int", 0, 1)
+            in_args.set(_PROPS["kOfxImageEffectPropInteractiveRenderStatus"], "int", 0, 0)
+        elif action in ("kOfxImageEffectActionBeginSequenceRender", "kOfxImageEffectActionEndSequenceRender"):
+            in_args.set_values(_PROPS["kOfxImageEffectPropFrameRange"], "double", [0.0, max(0.0, frames - 1.0)])
+            in_args.set(_PROPS["kOfxImageEffectPropFrameStep"], "double", 0, 1.0)
+            in_args.set(_PROPS["kOfxPropIsInteractive"], "int", 0, 0)
+            in_args.set(_PROPS["kOfxImageEffectPropSequentialRenderStatus"], "int", 0, 1)
+            in_args.set(_PROPS["kOfxImageEffectPropInteractiveRenderStatus"], "int", 0, 0)
+        elif action == "kOfxImageEffectActionGetRegionsOfInterest":
+            in_args.set_values(_PROPS["kOfxImageEffectPropRegionOfInterest"], "double",
+                               [0.0, 0.0, float(self.width), float(self.height)])
+        elif action in ("kOfxActionBeginInstanceChanged", "kOfxActionInstanceChanged",
+                        "kOfxActionEndInstanceChanged"):
+            in_args.set(_PROPS["kOfxPropChangeReason"], "string", 0,
+                        CHANGE_REASONS["kOfxChangeUserEdited"]["value"].encode())
+            if action == "kOfxActionInstanceChanged" and self.instance is not None:
+                names = list(self.instance.params) or [STANDARD_CLIPS["kOfxImageEffectSimpleSourceClipName"]["value"]]
+                kind = "kOfxTypeParameter" if self.instance.params else "kOfxTypeClip"
+                in_args.set(_PROPS["kOfxPropType"], "string", 0, TYPE_IDENTIFIERS[kind]["value"].encode())
+                in_args.set(_PROPS["kOfxPropName"], "string", 0, names[0].encode())
+        return in_args, out_args
+
+
+def _status_name(status: int) -> str:
+    return _STATUS_NAMES.get(status, str(status))
+
+
+def _profile(
+    plugin_path: str,
+    context: str,
+    plugin_index: int,
+    width: int,
+    height: int,
+    bit_depth: str,
+    components: str,
+    frames: int,
+    threads: int,
+    param_values: Optional[dict[str, Any]],
+) -> dict[str, Any]:
+    """Load the plugin in this process and profile its action sequence."""
+    library = ctypes.CDLL(plugin_path, mode=ctypes.RTLD_LOCAL)
+    library.OfxGetNumberOfPlugins.restype = ctypes.c_int
+    library.OfxGetPlugin.restype = ctypes.POINTER(OfxPlugin)
+    library.OfxGetPlugin.argtypes = [ctypes.c_int]
+    count = library.OfxGetNumberOfPlugins()
+    if not 0 <= plugin_index < count:
+        raise ValueError(f"Plugin index {plugin_index} out of range: the binary has {count} plugins")
+    plugin = library.OfxGetPlugin(plugin_index).contents
+
+    host = MockHost(context, width, height, bit_depth, components, threads, param_values)
+    plugin.setHost(ctypes.byref(host.host))
+    report: dict[str, Any] = {
+        "plugin": _decode(plugin.pluginIdentifier),
+        "version": f"{plugin.pluginVersionMajor}.{plugin.pluginVersionMinor}",
+        "context": context,
+        "format": {"width": width, "height": height, "bit_depth": bit_depth, "components": components},
+        "threads": host.threads,
+        "buffers": "numpy" if np is not None else "bytearray",
+        "actions": [],
+    }
+
+    # Action strings live as long as the host, like the constants of a real
+    # host; plugins may cache action pointers
+    action_names = {name: ctypes.create_string_buffer(value.encode()) for name, value in _ACTIONS.items()}
+    output_name = STANDARD_CLIPS["kOfxImageEffectOutputClipName"]["value"]
+    for action in get_action_sequence(context.replace("kOfxImageEffectContext", "").lower()):
+        calls = frames if action == "kOfxImageEffectActionRender" else 1
+        if action == "kOfxActionCreateInstance":
+            host.create_instance()
+        effect = host.instance
+        if action in ("kOfxActionDescribe", "kOfxImageEffectActionDescribeInContext"):
+            effect = host.descriptor
+        handle = None if action in ("kOfxActionLoad", "kOfxActionUnload") else effect
+        if handle is None and action not in ("kOfxActionLoad", "kOfxActionUnload"):
+            continue
+
+        host.suite_calls = Counter()
+        host.bytes = Counter()
+        statuses = Counter()
+        elapsed = 0.0
+        for frame in range(calls):
+            in_args, out_args = host.action_args(action, frames)
+            in_args.set(_PROPS["kOfxPropTime"], "double", 0, float(frame))
+            output = effect.clips.get(output_name) if action == "kOfxImageEffectActionRender" else None
+            if output is not None:
+                output.buffer.fill(bytes([_OUTPUT_SENTINEL]))
+            start = time.perf_counter()
+            status = plugin.mainEntry(
+                ctypes.cast(action_names[action], _s),
+                host.handle(handle) if handle is not None else None,
+                host.handle(in_args) if action not in ("kOfxActionLoad", "kOfxActionUnload") else None,
+                host.handle(out_args) if action not in ("kOfxActionLoad", "kOfxActionUnload") else None,
+            )
+            elapsed += time.perf_counter() - start
+            statuses[_status_name(status)] += 1
+            if output is not None:
+                host.bytes["bytes_written"] += output.buffer.count_not_equal(_OUTPUT_SENTINEL)
+            host._release(in_args)
+            host._release(out_args)
+
+        entry = {
+            "action": action,
+            "status": statuses.most_common(1)[0][0] if len(statuses) == 1 else dict(statuses),
+            "calls": calls,
+            "wall_ms": round(elapsed * 1e3, 3),
+            "suite_calls": dict(sorted(host.suite_calls.items())),
+            "suite_call_total": sum(host.suite_calls.values()),
+        }
+        if calls > 1:
+            entry["mean_ms"] = round(elapsed * 1e3 / calls, 3)
+            entry["suite_calls_per_call"] = round(entry["suite_call_total"] / calls, 1)
+        entry.update({name: value for name, value in sorted(host.bytes.items())})
+        report["actions"].append(entry)
+        if action == "kOfxActionDestroyInstance":
+            host.instance = None
+
+    if host.errors:
+        report["errors"] = host.errors
+    return report
+
+
+def profile_plugin(
+    plugin_path: str,
+    context: str = "kOfxImageEffectContextFilter",
+    plugin_index: int = 0,
+    width: int = 640,
+    height: int = 360,
+    bit_depth: str = "kOfxBitDepthFloat",
+    components: str = "kOfxImageComponentRGBA",
+    frames: int = 10,
+    threads: int = 1,
+    param_values: Optional[dict[str, Any]] = None,
+    isolated: bool = True,
+) -> dict[str, Any]:
+    """
+    Run a compiled plugin in the mock host and profile each action.
+
+    The plugin is driven through the context's action sequence (see
+    get_action_sequence); Render is called once per frame. Each action entry
+    reports its status, wall time, the count of every suite function called,
+    image bytes handed to the plugin, memory allocated through the host and,
+    for Render, the bytes written to the output image.
+
+    Args:
+        plugin_path: Path to the compiled plugin binary (.ofx/.so)
+        context: Context the plugin is instantiated in
+        plugin_index: Index of the plugin in the binary
+        width: Frame width in pixels
+        height: Frame height in pixels
+        bit_depth: Pixel depth constant of the synthetic images
+        components: Pixel components constant of the synthetic images
+        frames: Number of frames rendered
+        threads: CPU count reported to the plugin by multiThreadNumCPUs
+        param_values: Optional parameter values overriding the defaults,
+            keyed by parameter name (lists for multi-dimensional params)
+        isolated: Profile in a spawned worker process (default) so that a
+            crashing plugin does not take down the caller
+
+    Returns:
+        Profile report with per-action entries.
+
+    Raises:
+        ValueError: If the arguments are invalid or the plugin cannot be loaded
+            or crashes.
+    """
+    if context not in CONTEXTS:
+        raise ValueError(f"Unknown context '{context}'. Available: {list(CONTEXTS)}")
+    if bit_depth not in _SOURCE_SAMPLES:
+        raise ValueError(f"Unsupported bit depth '{bit_depth}'. Available: {list(_SOURCE_SAMPLES)}")
+    if not IMAGE_COMPONENTS.get(components, {}).get("num_components"):
+        supported = [name for name, info in IMAGE_COMPONENTS.items() if info.get("num_components")]
+        raise ValueError(f"Unsupported components '{components}'. Available: {supported}")
+    if int(width) <= 0 or int(height) <= 0 or int(frames) < 0:
+        raise ValueError("Frame size must be positive and the frame count must not be negative")
+
+    arguments = (plugin_path, context, int(plugin_index), int(width), int(height), bit_depth, components,
+                 int(frames), int(threads), param_values)
+    try:
+        if not isolated:
+            return _profile(*arguments)
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+            return executor.submit(_profile, *arguments).result()
+    except OSError as e:
+        raise ValueError(f"Cannot load plugin '{plugin_path}': {e}") from None
+    except AttributeError as e:
+        raise ValueError(f"'{plugin_path}' does not export the OFX entry points: {e}") from None
+    except BrokenProcessPool:
+        raise ValueError(f"Plugin '{plugin_path}' crashed while being profiled") from None
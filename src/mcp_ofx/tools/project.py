@@ -0,0 +1,491 @@
+"""
+Generation of complete plugin projects on disk.
+
+A project holds the plugin source, the benchmark host, a Makefile with
+optimization profiles (release, LTO, native, debug and a PGO workflow) and
+an include directory for the OpenFX headers. The build produces a Linux
+``.ofx.bundle``. Rendering is deterministic, so regenerating a project from
+the same arguments gives byte-identical files.
+
+Projects are written incrementally: a manifest records the content hash and
+stat of every generated file, and only files whose content changed are
+rewritten, so build tools do not recompile untouched sources.
+
+A bundle project builds several plugins into one binary: each plugin is its
+own translation unit, the suites are fetched by a shared host module and the
+exported OfxGetPlugin indexes a table of all of them. Large bundles render
+their plugins in a process pool started in the background by the first one.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .codegen import generate_bench_host, generate_plugin_skeleton
+from .templates import get_template, get_template_dir, set_template_dir
+
+_INCLUDE_README = """\
+# OpenFX headers
+
+Put the OpenFX headers (`ofxCore.h`, `ofxImageEffect.h`, ...) in this
+directory, run `make headers` to fetch them from the OpenFX repository, or
+point the build at an existing copy with `make OFX_INCLUDE=/path/to/openfx/include`.
+"""
+
+MANIFEST_NAME = ".mcp_ofx_manifest.json"
+MANIFEST_VERSION = 1
+
+_GITIGNORE = f"""\
+build/
+{MANIFEST_NAME}
+"""
+
+# Worker threads for hashing and writing project files
+_MAX_WRITERS = 8
+
+# A plugin renders in about 0.6 ms in-process; handing it to a warm worker
+# costs about 0.25 ms in pickling plus 5 ms per call, and starting a worker
+# about 0.3 s. The pool only pays for large bundles on machines with several
+# cores: from 64 plugins on 4 workers it saves about a fifth.
+_PARALLEL_MIN_PLUGINS = 64
+_PARALLEL_MIN_WORKERS = 4
+_MAX_RENDER_WORKERS = 8
+
+# Worker processes rendering bundle plugins, started in the background by the
+# first large bundle and kept for later ones; used once every worker is up
+_RENDER_POOL: Optional[ProcessPoolExecutor] = None
+_RENDER_POOL_STARTED: list[Future] = []
+_RENDER_POOL_LOCK = threading.Lock()
+
+
+def _bundle_name(plugin_name: str, plugin_id: str) -> str:
+    """Derive the bundle/binary name (e.g. 'MyBlur') from the plugin name or id."""
+    words = re.findall(r"[A-Za-z0-9]+", plugin_name) or re.findall(r"[A-Za-z0-9]+", plugin_id.rsplit(".", 1)[-1])
+    name = "".join(word[:1].upper() + word[1:] for word in words)
+    if not name:
+        raise ValueError("The plugin name or id must contain letters or digits")
+    return name
+
+
+def _render_makefile(description: str, name: str, sources: list[str], plugin_count: int) -> str:
+    """Render the project Makefile building the given sources into one bundle."""
+    return get_template("plugin_makefile").render({
+        "description": description,
+        "bundle_name": name,
+        "sources": " \\\n\t".join(sources),
+        "plugin_indices": " ".join(str(index) for index in range(plugin_count)),
+    })
+
+
+def render_plugin_project(
+    plugin_name: str,
+    plugin_id: str,
+    bench_width: int = 1920,
+    bench_height: int = 1080,
+    bench_frames: int = 100,
+    **plugin_options: Any,
+) -> dict[str, str]:
+    """
+    Render the files of a plugin project.
+
+    Args:
+        plugin_name: Human-readable plugin name
+        plugin_id: Unique plugin identifier
+        bench_width: Default frame width of the benchmark host
+        bench_height: Default frame height of the benchmark host
+        bench_frames: Default number of frames rendered by the benchmark host
+        **plugin_options: Other generate_plugin_skeleton arguments (context,
+            params, footprint, ...)
+
+    Returns:
+        Mapping of project-relative paths to file contents, sorted by path.
+
+    Raises:
+        ValueError: If the plugin or benchmark host arguments are invalid.
+    """
+    name = _bundle_name(plugin_name, plugin_id)
+    context = plugin_options.get("context", "kOfxImageEffectContextFilter")
+    files = {
+        ".gitignore": _GITIGNORE,
+        "Makefile": _render_makefile(f"{plugin_name} ({plugin_id})", name, [f"src/{name}.c"], 1),
+        "bench/bench_host.c": generate_bench_host(
+            context=context, width=bench_width, height=bench_height, frames=bench_frames,
+        ),
+        "include/README.md": _INCLUDE_README,
+        f"src/{name}.c": generate_plugin_skeleton(plugin_name, plugin_id, **plugin_options),
+    }
+    return dict(sorted(files.items()))
+
+
+def _render_bundle_plugin(template_dir: Optional[str], spec: dict) -> str:
+    """Render one plugin of a bundle; also the entry point of pool workers."""
+    if get_template_dir() != template_dir:
+        set_template_dir(template_dir)
+    try:
+        return generate_plugin_skeleton(**spec)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Plugin '{spec['plugin_id']}': {e}") from None
+
+
+def _render_workers() -> int:
+    """Number of worker processes used to render bundle plugins."""
+    return min(os.cpu_count() or 1, _MAX_RENDER_WORKERS)
+
+
+def _start_render_worker(template_dir: Optional[str]) -> None:
+    """Import the code generator and compile its templates in a new worker."""
+    if get_template_dir() != template_dir:
+        set_template_dir(template_dir)
+    get_template("plugin_skeleton")
+    get_template("footprint")
+
+
+def _start_render_pool() -> None:
+    """
+    Start the bundle rendering pool in the background, if it would be used.
+
+    Returns immediately; bundles render in-process until every worker is up.
+    """
+    global _RENDER_POOL
+    workers = _render_workers()
+    if workers < _PARALLEL_MIN_WORKERS:
+        return
+    with _RENDER_POOL_LOCK:
+        if _RENDER_POOL is not None:
+            return
+        # Spawned workers do not inherit the server's threads or locks
+        _RENDER_POOL = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        # Workers are spawned on demand; one task each starts them all
+        _RENDER_POOL_STARTED[:] = [
+            _RENDER_POOL.submit(_start_render_worker, get_template_dir()) for _ in range(workers)
+        ]
+
+
+def _ready_render_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the bundle rendering pool if every worker has started, else None."""
+    with _RENDER_POOL_LOCK:
+        if _RENDER_POOL is None or not all(future.done() for future in _RENDER_POOL_STARTED):
+            return None
+        return _RENDER_POOL
+
+
+def _drop_render_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a broken pool so the next bundle starts a new one."""
+    global _RENDER_POOL
+    with _RENDER_POOL_LOCK:
+        if _RENDER_POOL is pool:
+            _RENDER_POOL = None
+            _RENDER_POOL_STARTED.clear()
+    pool.shutdown(wait=False)
+
+
+def _render_bundle_plugins(specs: list[dict]) -> list[str]:
+    """
+    Render the plugins of a bundle.
+
+    The first large bundle on a machine with enough cores starts the process
+    pool; once all its workers are up, large bundles are split into one chunk
+    per worker. Until then, and for smaller bundles, plugins render
+    in-process, so no call waits for workers to start. If the pool breaks (e.g. a worker was killed), it is dropped
+    and the plugins are rendered in-process.
+    """
+    template_dir = get_template_dir()
+    pool = None
+    if len(specs) >= _PARALLEL_MIN_PLUGINS:
+        _start_render_pool()
+        pool = _ready_render_pool()
+    if pool is not None:
+        chunksize = -(-len(specs) // _render_workers())
+        try:
+            return list(pool.map(_render_bundle_plugin, [template_dir] * len(specs), specs, chunksize=chunksize))
+        except BrokenProcessPool:
+            _drop_render_pool(pool)
+    return [_render_bundle_plugin(template_dir, spec) for spec in specs]
+
+
+def render_bundle_project(
+    bundle_name: str,
+    plugins: list[dict],
+    bench_context: Optional[str] = None,
+    bench_width: int = 1920,
+    bench_height: int = 1080,
+    bench_frames: int = 100,
+) -> dict[str, str]:
+    """
+    Render the files of a project building several plugins into one binary.
+
+    Each plugin gets its own translation unit, in which the suite pointers
+    and setHost come from the shared ofx_host module. ofx_bundle.c exports
+    OfxGetNumberOfPlugins and OfxGetPlugin(nth), with plugins in list order.
+
+    Args:
+        bundle_name: Name of the bundle and its binary (e.g. 'MyEffects')
+        plugins: Plugin specs, each with plugin_name, plugin_id and the other
+            generate_plugin_skeleton arguments (context, params, ...)
+        bench_context: Context the benchmark host instantiates plugins in
+            (default: the first plugin's context)
+        bench_width: Default frame width of the benchmark host
+        bench_height: Default frame height of the benchmark host
+        bench_frames: Default number of frames rendered by the benchmark host
+
+    Returns:
+        Mapping of project-relative paths to file contents, sorted by path.
+
+    Raises:
+        ValueError: If there are no plugins, two plugins share an id or a
+            name, or any plugin or benchmark host argument is invalid.
+    """
+    if not re.search(r"[A-Za-z0-9]", bundle_name):
+        raise ValueError("The bundle name must contain letters or digits")
+    name = _bundle_name(bundle_name, "")
+    if not plugins:
+        raise ValueError("A bundle needs at least one plugin")
+
+    specs = []
+    names: dict[str, str] = {}
+    for plugin in plugins:
+        if not plugin.get("plugin_name") or not plugin.get("plugin_id"):
+            raise ValueError("Every bundle plugin needs a plugin_name and a plugin_id")
+        plugin_id = plugin["plugin_id"]
+        plugin_name = _bundle_name(plugin["plugin_name"], plugin_id)
+        if plugin_id in names.values():
+            raise ValueError(f"Duplicate plugin id '{plugin_id}' in bundle")
+        if plugin_name in names:
+            raise ValueError(f"Plugins '{names[plugin_name]}' and '{plugin_id}' have the same name '{plugin_name}'")
+        names[plugin_name] = plugin_id
+        specs.append({**plugin, "bundle_symbol": f"g{plugin_name}Plugin"})
+
+    sources = [f"src/{plugin_name}.c" for plugin_name in names]
+    files = dict(zip(sources, _render_bundle_plugins(specs)))
+    bench_context = bench_context or plugins[0].get("context") or "kOfxImageEffectContextFilter"
+    files.update({
+        ".gitignore": _GITIGNORE,
+        "Makefile": _render_makefile(
+            f"{bundle_name} bundle ({len(specs)} plugins)", name,
+            sources + ["src/ofx_bundle.c", "src/ofx_host.c"], len(specs),
+        ),
+        "bench/bench_host.c": generate_bench_host(
+            context=bench_context, width=bench_width, height=bench_height, frames=bench_frames,
+        ),
+        "include/README.md": _INCLUDE_README,
+        "src/ofx_host.h": get_template("bundle_host_header").render({"bundle_name": bundle_name}),
+        "src/ofx_host.c": get_template("bundle_host").render({"bundle_name": bundle_name}),
+        "src/ofx_bundle.c": get_template("bundle_table").render({
+            "bundle_name": bundle_name,
+            "plugin_declarations": [
+                f"extern OFX_HOST_HIDDEN OfxPlugin {spec['bundle_symbol']};  // {spec['plugin_id']}"
+                for spec in specs
+            ],
+            "plugin_entries": [f"    &{spec['bundle_symbol']}," for spec in specs],
+        }),
+    })
+    return dict(sorted(files.items()))
+
+
+def _digest(data: bytes) -> str:
+    """Get the SHA-256 hex digest of file content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _stat_key(path: Path) -> Optional[list[int]]:
+    """Get the (size, mtime) of a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _disk_digest(path: Path, recorded: Optional[dict]) -> Optional[str]:
+    """
+    Get the content hash of a file on disk.
+
+    The manifest hash is trusted while the file's size and mtime still match
+    the recorded ones; otherwise the file is read and hashed.
+    """
+    stat = _stat_key(path)
+    if stat is None:
+        return None
+    if recorded is not None and recorded.get("stat") == stat:
+        return recorded["sha256"]
+    return _digest(path.read_bytes())
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace a file's content so readers never see a partial write."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666  # Narrowed by the umask
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+
+
+def _is_project_file(root: Path, path: str) -> bool:
+    """Whether a project-relative path resolves to a file inside root."""
+    target = (root / path).resolve()
+    return target != root and target.is_relative_to(root)
+
+
+def _load_manifest(root: Path) -> dict[str, dict]:
+    """
+    Read the manifest of a previously generated project.
+
+    Entries that are malformed or resolve outside the project directory
+    (absolute paths, '..') are ignored, so they are never rewritten or removed.
+    """
+    try:
+        manifest = json.loads((root / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    files = manifest.get("files")
+    if not isinstance(files, dict):
+        return {}
+    return {
+        path: record
+        for path, record in files.items()
+        if isinstance(record, dict) and isinstance(record.get("sha256"), str) and _is_project_file(root, path)
+    }
+
+
+def write_project_files(output_dir: Union[str, Path], files: dict[str, str]) -> dict[str, Any]:
+    """
+    Write rendered project files, touching only those whose content changed.
+
+    Files are hashed and written from a thread pool. Files recorded in the
+    manifest of a previous generation that are no longer rendered are
+    removed if they are still unmodified; files edited since are kept.
+
+    Args:
+        output_dir: Project directory (created if missing)
+        files: Mapping of project-relative paths to file contents
+
+    Returns:
+        The project directory and the written, unchanged and removed paths.
+    """
+    root = Path(output_dir).expanduser().resolve()
+    root.mkdir(parents=True, exist_ok=True)
+    previous = _load_manifest(root)
+    contents = {path: content.encode("utf-8") for path, content in files.items()}
+
+    def update(path: str) -> tuple[str, bool]:
+        data = contents[path]
+        digest = _digest(data)
+        target = root / path
+        if _disk_digest(target, previous.get(path)) == digest:
+            return path, False
+        _write_atomic(target, data)
+        return path, True
+
+    def remove(path: str) -> Optional[str]:
+        target = root / path
+        recorded = previous[path]
+        if _disk_digest(target, recorded) != recorded.get("sha256"):
+            return None
+        target.unlink()
+        return path
+
+    stale = sorted(path for path in previous if path not in contents)
+    with ThreadPoolExecutor(max_workers=max(1, min(_MAX_WRITERS, len(contents) + len(stale)))) as pool:
+        updated = list(pool.map(update, sorted(contents)))
+        removed = [path for path in pool.map(remove, stale) if path is not None]
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "files": {
+            path: {"sha256": _digest(contents[path]), "stat": _stat_key(root / path)}
+            for path in sorted(contents)
+        },
+    }
+    manifest_text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    manifest_path = root / MANIFEST_NAME
+    if not manifest_path.exists() or manifest_path.read_text(encoding="utf-8") != manifest_text:
+        _write_atomic(manifest_path, manifest_text.encode("utf-8"))
+
+    return {
+        "output_dir": str(root),
+        "written": [path for path, written in updated if written],
+        "unchanged": [path for path, written in updated if not written],
+        "removed": removed,
+    }
+
+
+def generate_plugin_project(
+    output_dir: Union[str, Path],
+    plugin_name: str,
+    plugin_id: str,
+    **options: Any,
+) -> dict[str, Any]:
+    """
+    Write a plugin project to a directory.
+
+    Only files whose rendered content differs from the copy on disk are
+    written, so regenerating after a small change leaves the build cache
+    valid for everything else.
+
+    Args:
+        output_dir: Project directory (created if missing)
+        plugin_name: Human-readable plugin name
+        plugin_id: Unique plugin identifier
+        **options: Other render_plugin_project arguments
+
+    Returns:
+        The project directory, bundle path and the written, unchanged and
+        removed files.
+
+    Raises:
+        ValueError: If the arguments are invalid.
+    """
+    files = render_plugin_project(plugin_name, plugin_id, **options)
+    result = write_project_files(output_dir, files)
+    result["bundle"] = f"build/release/{_bundle_name(plugin_name, plugin_id)}.ofx.bundle"
+    return result
+
+
+def generate_bundle_project(
+    output_dir: Union[str, Path],
+    bundle_name: str,
+    plugins: list[dict],
+    **options: Any,
+) -> dict[str, Any]:
+    """
+    Write a multi-plugin bundle project to a directory.
+
+    Like generate_plugin_project, only files whose content changed are
+    written, so editing one plugin's spec recompiles only that plugin.
+
+    Args:
+        output_dir: Project directory (created if missing)
+        bundle_name: Name of the bundle and its binary
+        plugins: Plugin specs (see render_bundle_project)
+        **options: Other render_bundle_project arguments
+
+    Returns:
+        The project directory, bundle path, plugin count and the written,
+        unchanged and removed files.
+
+    Raises:
+        ValueError: If the arguments are invalid.
+    """
+    files = render_bundle_project(bundle_name, plugins, **options)
+    result = write_project_files(output_dir, files)
+    result["bundle"] = f"build/release/{_bundle_name(bundle_name, '')}.ofx.bundle"
+    result["plugins"] = len(plugins)
+    return result
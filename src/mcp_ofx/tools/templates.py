@@ -0,0 +1,183 @@
+"""
+Minimal precompiled template engine for code generation.
+
+Templates are plain text with ``${slot}`` placeholders (``$$`` is a literal
+``$``). Each template is parsed once into a list of literal/slot segments and
+rendered by appending to a single output buffer.
+
+Built-in templates live in the package ``templates`` directory. A user
+template directory (``MCP_OFX_TEMPLATE_DIR`` or ``set_template_dir``) can
+override any of them by file name; overridden templates are recompiled only
+when their modification time changes.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Any, Mapping, Optional, Union
+
+_SLOT_RE = re.compile(r"\$\{(\w+)\}|\$\$")
+
+TEMPLATE_SUFFIX = ".tmpl"
+BUILTIN_TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+class Template:
+    """A template compiled into literal and slot segments."""
+
+    def __init__(self, source: str, name: str = "<string>", revision: Any = None):
+        self.name = name
+        self.revision = revision
+        self._segments = self._compile(source)
+
+    @staticmethod
+    def _compile(source: str) -> list[tuple[str, Optional[str]]]:
+        """Split source into (literal, slot name or None) segments."""
+        segments: list[tuple[str, Optional[str]]] = []
+        literal: list[str] = []
+        position = 0
+        for match in _SLOT_RE.finditer(source):
+            literal.append(source[position:match.start()])
+            position = match.end()
+            if match.group(1) is None:
+                literal.append("$")
+                continue
+            segments.append(("".join(literal), match.group(1)))
+            literal = []
+        literal.append(source[position:])
+        segments.append(("".join(literal), None))
+        return segments
+
+    @property
+    def slots(self) -> list[str]:
+        """Names of the slots in this template, in order."""
+        return [slot for _, slot in self._segments if slot is not None]
+
+    def render_into(self, buffer: list[str], context: Mapping[str, Any]) -> None:
+        """
+        Render the template by appending to buffer.
+
+        Slot values may be strings, nested Templates (rendered with the same
+        context) or lists of lines (written newline-separated).
+
+        Args:
+            buffer: Output buffer to append text fragments to
+            context: Mapping of slot names to values
+
+        Raises:
+            ValueError: If context has no value for one of the template's slots
+        """
+        append = buffer.append
+        for literal, slot in self._segments:
+            if literal:
+                append(literal)
+            if slot is None:
+                continue
+            try:
+                value = context[slot]
+            except KeyError:
+                raise ValueError(f"Template '{self.name}' has no value for slot '{slot}'") from None
+            if isinstance(value, str):
+                append(value)
+            elif isinstance(value, Template):
+                value.render_into(buffer, context)
+            else:
+                first = True
+                for line in value:
+                    if not first:
+                        append("\n")
+                    append(line)
+                    first = False
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        """Render the template to a string."""
+        buffer: list[str] = []
+        self.render_into(buffer, context)
+        return "".join(buffer)
+
+
+class TemplateLoader:
+    """
+    Loads and caches compiled templates.
+
+    Built-in templates are compiled once. Templates found in the override
+    directory take precedence and are recompiled when their mtime changes.
+    """
+
+    def __init__(self, builtin_dir: Path = BUILTIN_TEMPLATE_DIR, override_dir: Optional[Union[str, Path]] = None):
+        self.builtin_dir = Path(builtin_dir)
+        self.override_dir = Path(override_dir) if override_dir else None
+        self._builtin: dict[str, Template] = {}
+        self._overrides: dict[str, Template] = {}
+
+    def set_override_dir(self, override_dir: Optional[Union[str, Path]]) -> None:
+        """Set (or clear, with None) the user template directory."""
+        self.override_dir = Path(override_dir) if override_dir else None
+        self._overrides.clear()
+
+    def _override_stamp(self, name: str) -> Optional[tuple[Path, int, int]]:
+        """Return (path, mtime, size) of an override template, or None."""
+        if self.override_dir is None:
+            return None
+        path = self.override_dir / f"{name}{TEMPLATE_SUFFIX}"
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def get(self, name: str) -> Template:
+        """
+        Get a compiled template by name.
+
+        Args:
+            name: Template name (file name without the .tmpl suffix)
+
+        Returns:
+            The compiled Template.
+        """
+        stamp = self._override_stamp(name)
+        if stamp is not None:
+            cached = self._overrides.get(name)
+            if cached is not None and cached.revision == stamp[1:]:
+                return cached
+            template = Template(stamp[0].read_text(encoding="utf-8"), name, stamp[1:])
+            self._overrides[name] = template
+            return template
+
+        template = self._builtin.get(name)
+        if template is None:
+            path = self.builtin_dir / f"{name}{TEMPLATE_SUFFIX}"
+            template = Template(path.read_text(encoding="utf-8"), name, "builtin")
+            self._builtin[name] = template
+        return template
+
+    def revision(self, names: tuple[str, ...]) -> tuple:
+        """Return a value that changes whenever any of the named templates changes."""
+        if self.override_dir is None:
+            return ()
+        return tuple(stamp[1:] if stamp else None for stamp in map(self._override_stamp, names))
+
+
+_LOADER = TemplateLoader(override_dir=os.environ.get("MCP_OFX_TEMPLATE_DIR"))
+
+
+def get_template(name: str) -> Template:
+    """Get a compiled template from the default loader."""
+    return _LOADER.get(name)
+
+
+def get_template_revision(names: tuple[str, ...]) -> tuple:
+    """Get the revision stamp of the named templates in the default loader."""
+    return _LOADER.revision(names)
+
+
+def get_template_dir() -> Optional[str]:
+    """Get the directory whose templates override the built-in ones, if any."""
+    override_dir = _LOADER.override_dir
+    return str(override_dir) if override_dir else None
+
+
+def set_template_dir(override_dir: Optional[Union[str, Path]]) -> None:
+    """Set the directory whose templates override the built-in ones."""
+    _LOADER.set_override_dir(override_dir)
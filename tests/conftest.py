@@ -0,0 +1,31 @@
+"""Shared fixtures."""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+# Generated C is compiled when OFX_INCLUDE_DIR points at the OFX headers
+OFX_INCLUDE_DIR = os.environ.get("OFX_INCLUDE_DIR")
+CC = shutil.which(os.environ.get("CC", "cc"))
+
+WARNING_FLAGS = ["-Wall", "-Wextra", "-Wno-unused-parameter", "-Werror"]
+
+
+@pytest.fixture
+def compile_c(tmp_path):
+    """Compile generated C source warning-free, skipping without a compiler or OFX headers."""
+    if not OFX_INCLUDE_DIR or CC is None:
+        pytest.skip("set OFX_INCLUDE_DIR (and CC) to compile generated code")
+
+    def compile_source(source, *flags, name="generated.c", output=None):
+        path = tmp_path / name
+        path.write_text(source, encoding="utf-8")
+        command = [CC, "-std=c99", *WARNING_FLAGS, f"-I{OFX_INCLUDE_DIR}", *flags, str(path)]
+        command += ["-o", str(output)] if output else ["-c", "-o", os.devnull]
+        result = subprocess.run(command, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        return output
+
+    return compile_source
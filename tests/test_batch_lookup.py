@@ -0,0 +1,16 @@
+"""Tests for batch lookup."""
+
+from mcp_ofx.tools.lookup import batch_lookup
+
+
+def test_batch_lookup():
+    result = batch_lookup(["StatOK", "kOfxStatFaild", "StatOK"])
+    assert list(result["found"]) == ["StatOK"]
+    assert result["found"]["StatOK"]["name"] == "kOfxStatOK"
+    assert result["missing"] == {"kOfxStatFaild": ["kOfxStatFailed"]}
+
+
+def test_batch_lookup_categories():
+    result = batch_lookup(["kOfxStatOK"], categories=["contexts"])
+    assert result["found"] == {}
+    assert "kOfxStatOK" in result["missing"]
@@ -0,0 +1,46 @@
+"""Tests for the bounded LRU cache."""
+
+from mcp_ofx.tools.cache import LRUCache
+
+
+def test_hits_and_misses():
+    cache = LRUCache(max_entries=4)
+    assert cache.get("a", lambda: "one") == "one"
+    assert cache.get("a", lambda: "two") == "one"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 1, 1, 3)
+
+
+def test_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.get("a", lambda: "a")
+    cache.get("b", lambda: "b")
+    cache.get("a", lambda: "a")
+    cache.get("c", lambda: "c")
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("a", lambda: "miss") == "a"
+    assert cache.get("b", lambda: "miss") == "miss"
+
+
+def test_byte_limit():
+    cache = LRUCache(max_entries=10, max_bytes=8)
+    cache.get("a", lambda: "12345")
+    cache.get("b", lambda: "12345")
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == 5
+    # Text larger than the whole cache is returned but not stored
+    assert cache.get("c", lambda: "x" * 9) == "x" * 9
+    assert cache.stats()["entries"] == 1
+
+
+def test_resize_and_clear():
+    cache = LRUCache(max_entries=3)
+    for key in "abc":
+        cache.get(key, lambda: key)
+    cache.resize(max_entries=1)
+    assert cache.stats()["entries"] == 1
+    cache.clear()
+    assert cache.stats() == {
+        "hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0,
+        "max_entries": 1, "max_bytes": cache.max_bytes,
+    }
@@ -0,0 +1,207 @@
+"""Tests for the generated plugin skeleton."""
+
+import re
+import subprocess
+
+import pytest
+
+from mcp_ofx.data import CORE_ACTIONS, IMAGE_EFFECT_ACTIONS
+from mcp_ofx.tools.codegen import _fnv1a, generate_bench_host, generate_plugin_skeleton
+
+TRANSITION = "kOfxImageEffectContextTransition"
+
+
+def skeleton(**options):
+    return generate_plugin_skeleton("Test", "com.example.test", **options)
+
+
+def test_default_skeleton_compiles(compile_c):
+    compile_c(skeleton())
+
+
+def test_identity_checks():
+    code = skeleton(params=[{"name": "amount", "type": "kOfxParamTypeDouble", "identity": 0}])
+    assert "if (values.amountValue == 0.0) {" in code
+    assert "clipName = kOfxImageEffectSimpleSourceClipName;" in code
+    assert "return kOfxStatReplyDefault;" in skeleton()
+
+
+def test_transition_defines_the_clips_it_passes_through():
+    code = skeleton(context=TRANSITION, params=[{"name": "amount", "type": "kOfxParamTypeDouble", "identity": 0}])
+    assert "defineSourceClip(effect, kOfxImageEffectTransitionSourceFromClipName);" in code
+    assert "defineSourceClip(effect, kOfxImageEffectTransitionSourceToClipName);" in code
+    assert "kOfxParamTypeDouble, kOfxImageEffectTransitionParamName" in code
+    assert "kOfxImageEffectTransitionSourceFromClipName, &instance->sourceClip" in code
+    assert "kOfxImageEffectTransitionSourceToClipName, &instance->sourceToClip" in code
+    assert "defineSourceClip(effect, kOfxImageEffectSimpleSourceClipName)" not in code
+
+
+@pytest.mark.parametrize("context", ["kOfxImageEffectContextFilter", TRANSITION])
+def test_contexts_compile(compile_c, context):
+    compile_c(skeleton(context=context, params=[{"name": "amount", "type": "kOfxParamTypeDouble", "identity": 0}]))
+
+
+def test_frame_cache_keys_every_temporal_tap(compile_c):
+    code = skeleton(frame_cache_mb=8, temporal_radius=2)
+    assert "#define FRAME_CACHE_MB 8" in code
+    assert "char sourceIds[TEMPORAL_TAPS][FRAME_CACHE_ID_LENGTH];" in code
+    compile_c(code)
+
+
+def test_ring_frames_must_cover_the_source_window(compile_c):
+    params = [{"name": "size", "type": "kOfxParamTypeDouble"}]
+    code = skeleton(params=params, temporal_radius=1, footprint={"type": "radius", "param": "size"})
+    assert "boundsCover(&frame->bounds, window)" in code
+    assert "acquireSourceFrames(instance, time, renderScale, &sourceWindow, frames);" in code
+    assert "sourceWindow.x1 = floorToInt((renderWindow.x1 / renderScale[0] - footprint.radius[0]" in code
+    assert "getFootprint(instance, time, &footprint);\n        if (footprint.scale" in code
+    compile_c(code)
+
+    # Without a footprint the source window is the render window
+    assert "getFootprint(instance, time, &footprint);\n        if" not in skeleton(temporal_radius=1)
+
+
+def test_render_splits_the_window_across_threads():
+    code = skeleton()
+    assert "gThreadSuite->multiThreadNumCPUs(&nThreads);" in code
+    assert "if (nThreads > maxBands) nThreads = maxBands;" in code
+    # A host without the MultiThread suite renders on the calling thread
+    assert "gThreadSuite->multiThread(renderThread, nThreads, &args) != kOfxStatOK) {\n                renderThread(0, 1, &args);" in code
+
+
+def test_row_processors_cover_every_supported_format():
+    code = skeleton()
+    for depth in ("Byte", "Short", "Half", "Float"):
+        for components in ("RGBA", "RGB", "Alpha"):
+            assert f"processRows{depth}{components}" in code
+    assert "args.process = selectRowProcessor(pixelDepth, components, proxy, premultiplied, &args.pixelBytes);" in code
+
+
+def test_param_values_are_cached_until_changed():
+    code = skeleton(params=[{"name": "amount", "type": "kOfxParamTypeDouble"}])
+    assert "    double amountValue;\n} ParamValues;" in code
+    assert "paramGetValueAtTime(instance->amountParam, time, &values->amountValue);" in code
+    assert "if (!instance->paramCacheValid || instance->paramCacheTime != time) {" in code
+    changed = code[code.index("static OfxStatus instanceChanged("):]
+    assert "invalidateParamValues(instance);" in changed[:changed.index("\n}\n")]
+
+
+def test_fnv1a_matches_the_reference_vectors():
+    assert _fnv1a("") == 0x811C9DC5
+    assert _fnv1a("a") == 0xE40C292C
+    assert _fnv1a("foobar") == 0xBF9CF968
+
+
+def test_every_action_has_a_hash_case_and_a_dispatch_case():
+    code = skeleton()
+    actions = {**CORE_ACTIONS, **IMAGE_EFFECT_ACTIONS}
+    cases = dict(re.findall(r"case (0x[0-9A-F]{8})u:\n        if \(strcmp\(action, (\w+)\) == 0\)", code))
+    assert sorted(cases.values()) == sorted(actions)
+    for value, action in cases.items():
+        assert int(value, 16) == _fnv1a(actions[action]["value"])
+    assert "    case ACTION_RENDER:\n        return render(effect, inArgs);" in code
+    assert "    case ACTION_GET_TIME_DOMAIN:\n" in code
+
+
+def test_dispatch_benchmark_compiles(compile_c):
+    compile_c(skeleton(), "-DPLUGIN_DISPATCH_BENCHMARK")
+    compile_c(skeleton(), "-DPLUGIN_CACHE_ACTION_POINTERS=0")
+
+
+def test_footprint_handlers_are_dispatched():
+    params = [{"name": "size", "type": "kOfxParamTypeDouble"}]
+    code = skeleton(params=params, footprint={"type": "radius", "param": "size"})
+    assert "return getRegionOfDefinition(effect, inArgs, outArgs);" in code
+    assert "return getRegionsOfInterest(effect, inArgs, outArgs);" in code
+    assert "roi.x1 = (region.x1 - footprint.radius[0] - footprint.translate[0]) / footprint.scale;" in code
+    # Without a footprint the host defaults apply
+    assert "getRegionsOfInterest" not in skeleton(params=params)
+
+
+@pytest.mark.parametrize("footprint", [
+    "blur",
+    {"type": "radius", "param": "missing"},
+    {"type": "transform"},
+    {"type": "transform", "translate": "size"},
+])
+def test_invalid_footprints(footprint):
+    with pytest.raises(ValueError):
+        skeleton(params=[{"name": "size", "type": "kOfxParamTypeDouble"}], footprint=footprint)
+
+
+def test_transform_footprint_compiles(compile_c):
+    params = [
+        {"name": "offset", "type": "kOfxParamTypeDouble2D"},
+        {"name": "zoom", "type": "kOfxParamTypeDouble"},
+    ]
+    compile_c(skeleton(params=params, footprint={"type": "transform", "translate": "offset", "scale": "zoom"}))
+
+
+def test_scratch_arena_is_sized_per_thread(compile_c):
+    code = skeleton(scratch_bytes_per_thread=1000)
+    assert "#define SCRATCH_BYTES_PER_THREAD 1000" in code
+    assert "args.scratch = acquireScratch(instance, nThreads, &privateScratch);" in code
+    assert "#define SCRATCH_BYTES_PER_THREAD 0" in skeleton(scratch_bytes_per_thread=-5)
+    compile_c(code)
+
+
+def test_abort_polling_interval():
+    assert "#define ABORT_CHECK_ROWS 64" in skeleton()
+    code = skeleton(abort_check_rows=8)
+    assert "#define ABORT_CHECK_ROWS 8" in code
+    assert "if (ABORT_CHECK_ROWS > 0 && gEffectSuite->abort(args->effect)) {" in code
+    # Aborted renders are not cached and drop their source frames
+    assert "if (cacheable && status == kOfxStatOK && !aborted) {" in code
+    assert "releaseSourceFrames(instance, frames, aborted);" in code
+    assert "#define ABORT_CHECK_ROWS 0" in skeleton(abort_check_rows=0)
+
+
+def test_spatial_params_are_scaled_to_pixels(compile_c):
+    params = [
+        {"name": "size", "type": "kOfxParamTypeDouble", "spatial": True},
+        {"name": "center", "type": "kOfxParamTypeDouble2D", "spatial": "position"},
+    ]
+    code = skeleton(params=params, proxy_scale_threshold=0.5)
+    assert "kOfxParamPropDoubleType, 0, kOfxParamDoubleTypeX);" in code
+    assert "kOfxParamPropDoubleType, 0, kOfxParamDoubleTypeXYAbsolute);" in code
+    assert "    args.params.sizeValue *= pixelScale[0];" in code
+    assert "    args.params.centerValue[1] *= pixelScale[1];" in code
+    assert "#define PROXY_SCALE_THRESHOLD 0.5" in code
+    assert "pixelScale" not in skeleton(params=[{"name": "amount", "type": "kOfxParamTypeDouble"}])
+    compile_c(code)
+
+
+@pytest.mark.parametrize("param", [
+    {"name": "count", "type": "kOfxParamTypeInteger", "spatial": True},
+    {"name": "size", "type": "kOfxParamTypeDouble", "spatial": "width"},
+])
+def test_invalid_spatial_params(param):
+    with pytest.raises(ValueError):
+        skeleton(params=[param])
+
+
+def test_premultiplied_and_field_renders():
+    code = skeleton()
+    # Only RGBA has an unpremultiplying variant
+    assert "{ processRowsByteRGBA, processRowsPremultByteRGBA }" in code
+    assert "processRowsPremultByteRGB," not in code
+    assert "strcmp(premultiplication, kOfxImagePreMultiplied) == 0;" in code
+    assert "kOfxImageClipPropFieldExtraction, 0, kOfxImageFieldBoth);" in code
+    assert "args.rowStep = 2;\n            args.fieldParity = 1;" in code
+    # Field renders only touch half the rows, so they bypass the frame cache
+    assert "args.rowStep == 1 &&" in code
+
+
+def test_bench_host_runs_a_plugin(compile_c, tmp_path):
+    plugin = compile_c(skeleton(), "-std=gnu99", "-fPIC", "-shared", output=tmp_path / "Test.ofx")
+    host = compile_c(generate_bench_host(width=64, height=32, frames=2), "-std=gnu99", "-ldl", "-lpthread",
+                     name="bench_host.c", output=tmp_path / "bench_host")
+    result = subprocess.run([str(host), str(plugin), "-n", "3"], capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Render: 3 frames, 64x32" in result.stdout
+
+
+@pytest.mark.parametrize("arguments", [{"width": 0}, {"frames": -1}, {"bit_depth": "kOfxBitDepthNone"}])
+def test_invalid_bench_host_arguments(arguments):
+    with pytest.raises(ValueError):
+        generate_bench_host(**arguments)
@@ -0,0 +1,35 @@
+"""Tests for the code generation cache."""
+
+import pytest
+
+from mcp_ofx.tools import codegen
+
+
+@pytest.fixture(autouse=True)
+def empty_codegen_cache():
+    codegen.clear_codegen_cache()
+    yield
+    codegen.clear_codegen_cache()
+
+
+def test_cache_key_ignores_argument_order():
+    assert codegen._cache_key("k", a=1, b={"x": 1, "y": 2}) == codegen._cache_key("k", b={"y": 2, "x": 1}, a=1)
+    assert codegen._cache_key("k", a=1) != codegen._cache_key("j", a=1)
+
+
+def test_equivalent_params_share_a_cache_entry():
+    first = codegen.generate_plugin_skeleton(
+        "Blur", "com.example.blur", params=[{"name": "size", "type": "kOfxParamTypeDouble", "label": None}]
+    )
+    second = codegen.generate_plugin_skeleton(
+        "Blur", "com.example.blur", params=[{"type": "kOfxParamTypeDouble", "name": "size"}]
+    )
+    assert first == second
+    stats = codegen.get_codegen_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_different_arguments_miss():
+    codegen.generate_parameter_code("gain", "kOfxParamTypeDouble")
+    codegen.generate_parameter_code("gain", "kOfxParamTypeDouble", default=2.0)
+    assert codegen.get_codegen_cache_stats()["misses"] == 2
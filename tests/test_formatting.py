@@ -0,0 +1,62 @@
+"""Tests for output formats and field projection."""
+
+import json
+
+import pytest
+
+from mcp_ofx.tools.formatting import format_response, project
+
+RECORDS = [
+    {"name": "kOfxStatOK", "value": 0, "description": "All was fine", "header": "ofxCore.h"},
+    {"name": "kOfxStatFailed", "value": 1, "description": "", "header": "ofxCore.h"},
+]
+
+
+def test_pretty_and_compact():
+    assert json.loads(format_response(RECORDS)) == RECORDS
+    compact = format_response(RECORDS, "compact")
+    assert " " not in compact.replace("All was fine", "")
+    assert json.loads(compact) == RECORDS
+
+
+def test_minimal_keeps_default_fields_and_drops_empty_values():
+    assert json.loads(format_response(RECORDS, "minimal")) == [
+        {"name": "kOfxStatOK", "value": 0, "description": "All was fine"},
+        {"name": "kOfxStatFailed", "value": 1},
+    ]
+
+
+def test_minimal_keeps_records_without_default_fields_whole():
+    report = {"action": "Render", "wall_ms": 1.5}
+    assert json.loads(format_response(report, "minimal")) == report
+
+
+def test_fields_projection():
+    assert json.loads(format_response(RECORDS, "compact", fields=["name", "header"])) == [
+        {"name": "kOfxStatOK", "header": "ofxCore.h"},
+        {"name": "kOfxStatFailed", "header": "ofxCore.h"},
+    ]
+
+
+def test_unknown_fields_never_widen_the_projection():
+    assert json.loads(format_response(RECORDS, "compact", fields=["nope"])) == [
+        {"name": "kOfxStatOK"},
+        {"name": "kOfxStatFailed"},
+    ]
+    assert project({"value": 1}, ("nope",)) == {}
+
+
+def test_name_keyed_records():
+    found = {"StatOK": RECORDS[0]}
+    assert project(found, ("value",)) == {"StatOK": {"value": 0}}
+
+
+def test_records_key():
+    result = {"found": {"StatOK": RECORDS[0]}, "missing": {"x": ["y"]}}
+    projected = json.loads(format_response(result, "compact", fields=["name"], records_key="found"))
+    assert projected == {"found": {"StatOK": {"name": "kOfxStatOK"}}, "missing": {"x": ["y"]}}
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        format_response(RECORDS, "yaml")
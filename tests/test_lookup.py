@@ -0,0 +1,35 @@
+"""Tests for exact and alias name lookup."""
+
+import pytest
+
+from mcp_ofx.tools.index import find_definition, get_name_collisions
+from mcp_ofx.tools.lookup import lookup_definition
+
+
+def test_exact_name():
+    record = lookup_definition("kOfxStatOK")
+    assert record["name"] == "kOfxStatOK"
+    assert record["category"] == "status_codes"
+
+
+@pytest.mark.parametrize("alias", ["StatOK", "OfxStatOK", "ofxstatok", "  statok "])
+def test_prefix_stripped_aliases(alias):
+    assert lookup_definition(alias)["name"] == "kOfxStatOK"
+
+
+def test_raw_string_value():
+    assert lookup_definition("OfxImageEffectActionRender")["name"] == "kOfxImageEffectActionRender"
+
+
+def test_records_are_read_only():
+    record = find_definition("kOfxStatOK")
+    with pytest.raises(TypeError):
+        record["name"] = "changed"
+
+
+def test_unknown_name():
+    assert lookup_definition("kOfxNoSuchThing") is None
+
+
+def test_no_alias_collisions():
+    assert get_name_collisions() == {}
@@ -0,0 +1,55 @@
+"""Tests for the ctypes mock host."""
+
+import pytest
+
+from mcp_ofx.tools.codegen import generate_plugin_skeleton
+from mcp_ofx.tools.profiler import profile_plugin
+
+
+@pytest.fixture
+def plugin(compile_c, tmp_path):
+    params = [{"name": "amount", "type": "kOfxParamTypeDouble", "default": 0.5}]
+    source = generate_plugin_skeleton("Test", "com.example.test", params=params)
+    return str(compile_c(source, "-std=gnu99", "-fPIC", "-shared", output=tmp_path / "Test.ofx"))
+
+
+def actions(report):
+    return {entry["action"]: entry for entry in report["actions"]}
+
+
+@pytest.mark.parametrize("isolated", [False, True])
+def test_profile_renders_every_frame(plugin, isolated):
+    report = profile_plugin(plugin, width=32, height=16, frames=3, threads=2, isolated=isolated)
+    assert report["plugin"] == "com.example.test"
+    assert "errors" not in report
+    render = actions(report)["kOfxImageEffectActionRender"]
+    assert (render["status"], render["calls"]) == ("kOfxStatOK", 3)
+    assert render["bytes_written"] == 3 * 32 * 16 * 4 * 4
+    assert render["suite_calls_per_call"] > 0
+
+
+def test_param_values_override_defaults(plugin):
+    report = profile_plugin(plugin, width=8, height=8, frames=1, param_values={"amount": 1.0}, isolated=False)
+    assert actions(report)["kOfxImageEffectActionRender"]["status"] == "kOfxStatOK"
+
+
+def test_plugin_index_out_of_range(plugin):
+    with pytest.raises(ValueError, match="out of range"):
+        profile_plugin(plugin, plugin_index=1, isolated=False)
+
+
+def test_missing_binary(tmp_path):
+    with pytest.raises(ValueError, match="Cannot load plugin"):
+        profile_plugin(str(tmp_path / "missing.ofx"), isolated=False)
+
+
+@pytest.mark.parametrize("arguments", [
+    {"context": "kOfxImageEffectContextNone"},
+    {"bit_depth": "kOfxBitDepthNone"},
+    {"components": "kOfxImageComponentNone"},
+    {"width": 0},
+    {"frames": -1},
+])
+def test_invalid_arguments(tmp_path, arguments):
+    with pytest.raises(ValueError):
+        profile_plugin(str(tmp_path / "missing.ofx"), **arguments)
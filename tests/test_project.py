@@ -0,0 +1,139 @@
+"""Tests for incremental project generation."""
+
+import hashlib
+import json
+from concurrent.futures import wait
+
+import pytest
+
+from mcp_ofx.tools import project
+from mcp_ofx.tools.profiler import profile_plugin
+from mcp_ofx.tools.project import MANIFEST_NAME, generate_plugin_project, render_bundle_project, write_project_files
+from mcp_ofx.tools.templates import get_template_dir
+
+
+def test_first_write_creates_files_and_manifest(tmp_path):
+    result = write_project_files(tmp_path, {"a.c": "a", "src/b.h": "b"})
+    assert result["written"] == ["a.c", "src/b.h"]
+    assert result["unchanged"] == [] and result["removed"] == []
+    assert (tmp_path / "src" / "b.h").read_text() == "b"
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert sorted(manifest["files"]) == ["a.c", "src/b.h"]
+
+
+def test_rewrite_touches_only_changed_files(tmp_path):
+    write_project_files(tmp_path, {"a.c": "a", "b.c": "b"})
+    mtime = (tmp_path / "a.c").stat().st_mtime_ns
+    result = write_project_files(tmp_path, {"a.c": "a", "b.c": "changed"})
+    assert result["written"] == ["b.c"]
+    assert result["unchanged"] == ["a.c"]
+    assert (tmp_path / "a.c").stat().st_mtime_ns == mtime
+    assert (tmp_path / "b.c").read_text() == "changed"
+
+
+def test_files_edited_on_disk_are_rewritten(tmp_path):
+    write_project_files(tmp_path, {"a.c": "a"})
+    (tmp_path / "a.c").write_text("edited by hand")
+    assert write_project_files(tmp_path, {"a.c": "a"})["written"] == ["a.c"]
+    assert (tmp_path / "a.c").read_text() == "a"
+
+
+def test_stale_files_removed_unless_edited(tmp_path):
+    write_project_files(tmp_path, {"a.c": "a", "old.c": "old", "kept.c": "kept"})
+    (tmp_path / "kept.c").write_text("edited by hand")
+    result = write_project_files(tmp_path, {"a.c": "a"})
+    assert result["removed"] == ["old.c"]
+    assert not (tmp_path / "old.c").exists()
+    assert (tmp_path / "kept.c").read_text() == "edited by hand"
+
+
+def test_corrupt_manifest_rewrites_everything(tmp_path):
+    write_project_files(tmp_path, {"a.c": "a"})
+    (tmp_path / MANIFEST_NAME).write_text("not json")
+    result = write_project_files(tmp_path, {"a.c": "a"})
+    assert result["written"] + result["unchanged"] == ["a.c"]
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text())["files"]["a.c"]
+
+
+def test_regenerating_a_plugin_project(tmp_path):
+    first = generate_plugin_project(tmp_path, "Blur", "com.example.blur")
+    assert first["written"] and not first["unchanged"]
+    second = generate_plugin_project(tmp_path, "Blur", "com.example.blur")
+    assert second["written"] == []
+    assert second["unchanged"] == sorted(first["written"])
+
+
+def test_manifest_entries_outside_the_project_are_ignored(tmp_path):
+    project = tmp_path / "project"
+    outside = tmp_path / "outside.c"
+    outside.write_text("keep")
+    write_project_files(project, {"a.c": "a"})
+
+    manifest_path = project / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text())
+    record = {"sha256": hashlib.sha256(b"keep").hexdigest(), "stat": None}
+    manifest["files"]["../outside.c"] = record
+    manifest["files"][str(outside)] = record
+    manifest["files"]["bad.c"] = "not a record"
+    manifest_path.write_text(json.dumps(manifest))
+
+    result = write_project_files(project, {"a.c": "a"})
+    assert result["removed"] == []
+    assert outside.read_text() == "keep"
+    assert sorted(json.loads(manifest_path.read_text())["files"]) == ["a.c"]
+
+
+def bundle_plugins(count):
+    return [{"plugin_name": f"Effect{i}", "plugin_id": f"com.example.effect{i}"} for i in range(count)]
+
+
+def test_bundle_lists_plugins_in_order():
+    files = render_bundle_project("Effects", bundle_plugins(2))
+    table = files["src/ofx_bundle.c"]
+    assert table.index("&gEffect0Plugin,") < table.index("&gEffect1Plugin,")
+    assert "extern OFX_HOST_HIDDEN OfxPlugin gEffect1Plugin;  // com.example.effect1" in table
+    assert {"src/Effect0.c", "src/Effect1.c", "src/ofx_host.c", "src/ofx_host.h"} <= set(files)
+
+
+def test_bundle_rejects_duplicate_ids():
+    with pytest.raises(ValueError, match="Duplicate plugin id"):
+        render_bundle_project("Effects", bundle_plugins(1) * 2)
+
+
+def test_small_bundles_do_not_start_the_pool(monkeypatch):
+    monkeypatch.setattr(project, "_render_workers", lambda: 8)
+    assert project._RENDER_POOL is None
+    render_bundle_project("Effects", bundle_plugins(3))
+    assert project._RENDER_POOL is None
+
+
+def test_bundles_render_in_process_until_the_pool_is_up(monkeypatch):
+    monkeypatch.setattr(project, "_render_workers", lambda: 2)
+    monkeypatch.setattr(project, "_PARALLEL_MIN_WORKERS", 2)
+    monkeypatch.setattr(project, "_PARALLEL_MIN_PLUGINS", 2)
+    specs = [{**plugin, "bundle_symbol": f"g{plugin['plugin_name']}Plugin"} for plugin in bundle_plugins(4)]
+    expected = [project._render_bundle_plugin(get_template_dir(), spec) for spec in specs]
+    try:
+        # The first call starts the pool without waiting for it
+        assert project._render_bundle_plugins(specs) == expected
+        pool = project._RENDER_POOL
+        assert pool is not None
+        wait(project._RENDER_POOL_STARTED)
+        assert project._ready_render_pool() is pool
+        assert project._render_bundle_plugins(specs) == expected
+    finally:
+        if project._RENDER_POOL is not None:
+            project._drop_render_pool(project._RENDER_POOL)
+
+
+def test_bundle_builds_one_binary(compile_c, tmp_path):
+    files = render_bundle_project("Effects", bundle_plugins(2))
+    write_project_files(tmp_path / "bundle", files)
+    src = tmp_path / "bundle" / "src"
+    sources = [str(src / name) for name in ("Effect0.c", "Effect1.c", "ofx_host.c")]
+    binary = compile_c(files["src/ofx_bundle.c"], "-std=gnu99", "-fPIC", "-shared", f"-I{src}", *sources,
+                       name="ofx_bundle.c", output=tmp_path / "Effects.ofx")
+    for index in range(2):
+        report = profile_plugin(str(binary), plugin_index=index, width=8, height=8, frames=1, isolated=False)
+        assert report["plugin"] == f"com.example.effect{index}"
+        assert "errors" not in report
@@ -0,0 +1,67 @@
+"""Tests for BM25 search ranking and paging."""
+
+import pytest
+
+from mcp_ofx.tools.index import search_index
+from mcp_ofx.tools.lookup import search_definitions
+
+
+def names(results):
+    return [record["name"] for record in results]
+
+
+def test_render_ranks_render_action_first():
+    assert names(search_definitions("render", limit=1)) == ["kOfxImageEffectActionRender"]
+
+
+def test_scores_are_descending():
+    scores = [score for score, _ in search_index("pixel depth")]
+    assert scores
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_prefix_expansion_keeps_recall():
+    # The Render action only mentions 'pixels'
+    assert "kOfxImageEffectActionRender" in names(search_definitions("pixel"))
+
+
+def test_short_words_match_as_substrings():
+    assert search_definitions("2d")
+    assert "kOfxParamTypeDouble2D" in names(search_definitions("2d"))
+
+
+def test_category_filter():
+    results = search_definitions("clip", category="standard_clips")
+    assert results
+    assert all(record["category"] == "standard_clips" for record in results)
+
+
+def test_paging_is_a_window_of_the_full_ranking():
+    full = names(search_definitions("render"))
+    assert names(search_definitions("render", limit=3)) == full[:3]
+    assert names(search_definitions("render", limit=2, offset=1)) == full[1:3]
+    assert search_definitions("render", offset=len(full)) == []
+
+
+@pytest.mark.parametrize("query, name", [
+    ("StatOK", "kOfxStatOK"),
+    ("kOfxImageEffectActionRender", "kOfxImageEffectActionRender"),
+    ("OfxImageEffectActionRender", "kOfxImageEffectActionRender"),
+])
+def test_named_definition_ranks_first(query, name):
+    assert names(search_definitions(query, limit=1)) == [name]
+
+
+def test_ofx_alone_matches_as_substring():
+    assert len(search_definitions("OFX")) > 100
+
+
+def test_empty_and_stopword_queries():
+    assert search_definitions("") == []
+    assert search_definitions("the of") == []
+
+
+@pytest.mark.parametrize("limit, offset", [(0, 0), (-1, 0), (5, -1)])
+def test_invalid_paging(limit, offset):
+    with pytest.raises(ValueError):
+        search_definitions("render", limit=limit, offset=offset)
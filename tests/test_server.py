@@ -0,0 +1,63 @@
+"""Tests for the MCP tool handlers."""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from mcp_ofx import server  # noqa: E402
+
+
+def call(name, **arguments):
+    return asyncio.run(server.call_tool(name, arguments))[0].text
+
+
+def test_search():
+    results = json.loads(call("ofx_search", query="render", limit=1))
+    assert [record["name"] for record in results] == ["kOfxImageEffectActionRender"]
+
+
+@pytest.mark.parametrize("paging", [{"limit": "3"}, {"offset": 1.5}, {"limit": True}])
+def test_search_rejects_non_integer_paging(paging):
+    assert "must be an integer" in call("ofx_search", query="render", **paging)
+
+
+def test_search_rejects_invalid_paging():
+    assert "limit" in call("ofx_search", query="render", limit=0)
+
+
+def test_static_responses_are_cached():
+    server._RESPONSES.clear()
+    first = call("ofx_lookup", name="kOfxStatOK")
+    assert call("ofx_lookup", name="StatOK") == first
+    stats = server._RESPONSES.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    # The format is part of the key
+    assert call("ofx_lookup", name="kOfxStatOK", format="compact") != first
+    assert server._RESPONSES.stats()["misses"] == 2
+
+
+def test_fields_projection():
+    result = json.loads(call("ofx_lookup", name="kOfxStatOK", fields=["value"]))
+    assert result == {"value": 0}
+
+
+@pytest.mark.parametrize("fields", ["value", [1], {"value": True}])
+def test_fields_must_be_a_list_of_names(fields):
+    assert call("ofx_lookup", name="kOfxStatOK", fields=fields) == "'fields' must be a list of field names"
+
+
+def test_unknown_format():
+    assert call("ofx_lookup", name="kOfxStatOK", format="yaml").startswith("Unknown format")
+
+
+def test_batch_lookup():
+    result = json.loads(call("ofx_batch_lookup", names=["StatOK", "kOfxStatFaild"], fields=["name"]))
+    assert result == {"found": {"StatOK": {"name": "kOfxStatOK"}}, "missing": {"kOfxStatFaild": ["kOfxStatFailed"]}}
+
+
+@pytest.mark.parametrize("arguments", [{"names": "StatOK"}, {"names": [1]}, {"names": ["StatOK"], "categories": "status_codes"}])
+def test_batch_lookup_rejects_non_lists(arguments):
+    assert "must be a list of strings" in call("ofx_batch_lookup", **arguments)
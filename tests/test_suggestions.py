@@ -0,0 +1,15 @@
+"""Tests for "did you mean" suggestions."""
+
+from mcp_ofx.tools.index import suggest_names
+from mcp_ofx.tools.lookup import suggest_definitions
+
+
+def test_suggestions_for_typos():
+    assert suggest_definitions("kOfxStatErrBadHandel")[0] == "kOfxStatErrBadHandle"
+    assert suggest_definitions("kOfxImageEfectActionRendr") == ["kOfxImageEffectActionRender"]
+
+
+def test_suggestions_respect_limit_and_distance():
+    assert len(suggest_names("kOfxStatErrBadHandel", limit=1)) == 1
+    assert suggest_names("zzzzqqq") == []
+    assert suggest_names("") == []
@@ -0,0 +1,59 @@
+"""Tests for the template engine and user template overrides."""
+
+import os
+
+import pytest
+
+from mcp_ofx.tools import codegen, templates
+from mcp_ofx.tools.templates import Template
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    previous = templates.get_template_dir()
+    templates.set_template_dir(tmp_path)
+    codegen.clear_codegen_cache()
+    yield tmp_path
+    templates.set_template_dir(previous)
+    codegen.clear_codegen_cache()
+
+
+def write_template(path, text, mtime_ns):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_slots_and_literal_dollar():
+    template = Template("int ${name} = $$${value};")
+    assert template.slots == ["name", "value"]
+    assert template.render({"name": "x", "value": "1"}) == "int x = $1;"
+
+
+def test_nested_templates_and_lines():
+    inner = Template("<${name}>")
+    outer = Template("${inner}\n${lines}")
+    assert outer.render({"inner": inner, "name": "a", "lines": ["b", "c"]}) == "<a>\nb\nc"
+
+
+def test_missing_slot_is_a_value_error():
+    with pytest.raises(ValueError, match="slot 'missing'"):
+        Template("${missing}", "broken").render({})
+
+
+def test_override_is_reloaded_when_it_changes(template_dir):
+    path = template_dir / "parameter.tmpl"
+    write_template(path, "first ${param_name}\n", 1_000_000_000)
+    assert codegen.generate_parameter_code("gain", "kOfxParamTypeDouble") == "first gain\n"
+    assert codegen.generate_parameter_code("gain", "kOfxParamTypeDouble") == "first gain\n"
+
+    write_template(path, "second ${param_name}\n", 2_000_000_000)
+    assert codegen.generate_parameter_code("gain", "kOfxParamTypeDouble") == "second gain\n"
+
+    path.unlink()
+    assert "kOfxParamTypeDouble" in codegen.generate_parameter_code("gain", "kOfxParamTypeDouble")
+
+
+def test_override_with_unknown_slot(template_dir):
+    write_template(template_dir / "parameter.tmpl", "${nope}\n", 1_000_000_000)
+    with pytest.raises(ValueError, match="parameter"):
+        codegen.generate_parameter_code("gain", "kOfxParamTypeDouble")